@@ -355,7 +355,25 @@ def show_main_dashboard():
         if st.button("영업 업무 시작", use_container_width=True, key="btn_step3"):
             st.switch_page("pages/sale_1.py")
 
-    # ------------------- [4. 하단 버전 정보] -------------------
+    # ------------------- [4. 영업 파이프라인 요약] -------------------
+    # 오퍼 원장의 집계 테이블만 읽음 (발송 이력 전체를 다시 집계하지 않음)
+    try:
+        from modules.sales.offer_ledger import get_offer_ledger
+        metrics = get_offer_ledger().metrics(st.session_state['user_id'])
+    except Exception:
+        metrics = None
+
+    if metrics and metrics["total"]:
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.markdown("#### 영업 파이프라인")
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("발송 오퍼", f"{metrics['funnel']['Sent']:,}건")
+        m2.metric("열람 전환율", f"{metrics['view_rate']:.1f}%")
+        m3.metric("수주 전환율", f"{metrics['accept_rate']:.1f}%")
+        stale = metrics["ageing"]["30일 초과"]["n"]
+        m4.metric("30일 초과 미회신", f"{stale:,}건")
+
+    # ------------------- [5. 하단 버전 정보] -------------------
     st.markdown("<br><br><br>", unsafe_allow_html=True)
     st.markdown("""
     <div style='text-align:center; color:#CBD5E1; font-size:0.8rem;'>
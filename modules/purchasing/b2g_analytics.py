@@ -0,0 +1,219 @@
+"""
+조달청(B2G) 납품 단가 분석 모듈
+- procurement_price.csv를 한 번만 로드하여 타입이 지정된 컬럼 테이블로 보관
+- 제품명/규격 인덱스 + 퍼지 매칭으로 품목 검색
+- 중앙값, P25~P75, 물량가중 평균단가, 월별 추이 (벡터 연산)
+"""
+
+import os
+import re
+import difflib
+import pandas as pd
+import streamlit as st
+
+# 경로 설정
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+
+PROCUREMENT_CSV = os.path.join(root_dir, 'data', 'purchasing', 'procurement_price.csv')
+
+# CSV 컬럼명 -> 내부 컬럼명
+COLUMN_MAP = {
+    "업체명": "supplier",
+    "제품명": "product",
+    "규격": "spec",
+    "납품수량": "qty",
+    "납품단가": "unit_price",
+    "납품금액": "amount",
+    "납품요구결재일자": "approved_at",
+}
+
+
+def _normalize(text):
+    """공백/특수문자 제거 + 소문자 (퍼지 매칭용)"""
+    return re.sub(r"[\s\W_]+", "", str(text)).lower()
+
+
+class ProcurementPriceIndex:
+    """
+    조달청 납품 단가 분석 엔진
+    - 제품명/규격 MultiIndex 테이블
+    - 조회는 모두 groupby/quantile 벡터 연산으로 처리 (LLM 호출 없음)
+    """
+
+    def __init__(self, csv_path=PROCUREMENT_CSV):
+        self.csv_path = csv_path
+        self.table = self._load(csv_path)
+
+        # 퍼지 매칭용 정규화 제품명 사전 (정규화명 -> 원본 제품명 리스트)
+        self._name_lookup = {}
+        for name in self.table.index.get_level_values("product").unique():
+            self._name_lookup.setdefault(_normalize(name), []).append(name)
+        self._norm_names = list(self._name_lookup.keys())
+
+    @property
+    def available(self):
+        return not self.table.empty
+
+    def _load(self, csv_path):
+        if not os.path.exists(csv_path):
+            return self._empty_table()
+
+        df = pd.read_csv(
+            csv_path,
+            encoding="utf-8-sig",
+            usecols=list(COLUMN_MAP.keys()),
+            dtype={
+                "업체명": "category",
+                "제품명": "category",
+                "규격": "category",
+                "납품수량": "float64",
+                "납품단가": "float64",
+                "납품금액": "float64",
+                "납품요구결재일자": "string",
+            },
+        ).rename(columns=COLUMN_MAP)
+
+        df["approved_at"] = pd.to_datetime(df["approved_at"], format="%Y%m%d", errors="coerce")
+        df = df.dropna(subset=["unit_price", "qty"])
+        return df.set_index(["product", "spec"]).sort_index()
+
+    @staticmethod
+    def _empty_table():
+        index = pd.MultiIndex.from_arrays([[], []], names=["product", "spec"])
+        return pd.DataFrame(
+            {
+                "supplier": pd.Series(dtype="category"),
+                "qty": pd.Series(dtype="float64"),
+                "unit_price": pd.Series(dtype="float64"),
+                "amount": pd.Series(dtype="float64"),
+                "approved_at": pd.Series(dtype="datetime64[ns]"),
+            },
+            index=index,
+        )
+
+    # ---------------------------------------------------------------------
+    # 검색
+    # ---------------------------------------------------------------------
+    def match_products(self, queries, limit=5, cutoff=0.6):
+        """
+        검색어(들)와 가장 유사한 조달 제품명 반환
+        1) 정규화 문자열 포함 관계 2) difflib 유사도 순으로 매칭
+        """
+        if isinstance(queries, str):
+            queries = [queries]
+
+        matched = []
+        for q in queries:
+            nq = _normalize(q)
+            if not nq:
+                continue
+
+            hits = [n for n in self._norm_names if nq in n or n in nq]
+            hits += difflib.get_close_matches(nq, self._norm_names, n=limit, cutoff=cutoff)
+
+            for n in hits:
+                for name in self._name_lookup[n]:
+                    if name not in matched:
+                        matched.append(name)
+
+        return matched[:limit]
+
+    def select(self, products=None, spec=None):
+        """제품명(리스트)/규격으로 인덱스 슬라이스"""
+        if self.table.empty:
+            return self.table
+
+        table = self.table
+        if products:
+            table = table[table.index.get_level_values("product").isin(products)]
+        if spec:
+            table = table[table.index.get_level_values("spec") == spec]
+        return table
+
+    # ---------------------------------------------------------------------
+    # 통계
+    # ---------------------------------------------------------------------
+    @staticmethod
+    def price_stats(table):
+        """중앙값 / P25~P75 / 물량가중 평균단가"""
+        if table.empty:
+            return None
+
+        q = table["unit_price"].quantile([0.25, 0.5, 0.75]).to_numpy()
+        total_qty = table["qty"].sum()
+        weighted = (table["unit_price"] * table["qty"]).sum() / total_qty if total_qty > 0 else q[1]
+
+        return {
+            "median": float(q[1]),
+            "p25": float(q[0]),
+            "p75": float(q[2]),
+            "weighted_avg": float(weighted),
+            "total_qty": float(total_qty),
+            "total_amount": float(table["amount"].sum()),
+            "contracts": int(len(table)),
+            "suppliers": int(table["supplier"].nunique()),
+        }
+
+    @staticmethod
+    def spec_breakdown(table):
+        """제품명 x 규격별 단가 요약 테이블"""
+        if table.empty:
+            return pd.DataFrame()
+
+        weighted_amount = table["unit_price"] * table["qty"]
+        grouped = table.assign(_w=weighted_amount).groupby(level=["product", "spec"], observed=True)
+        summary = grouped.agg(
+            contracts=("unit_price", "size"),
+            median=("unit_price", "median"),
+            qty=("qty", "sum"),
+            _w=("_w", "sum"),
+        )
+        summary["weighted_avg"] = summary["_w"] / summary["qty"]
+        return summary.drop(columns="_w").sort_values("qty", ascending=False)
+
+    @staticmethod
+    def price_trend(table, freq="M"):
+        """납품요구결재일자 기준 기간별 (기본: 월별) 단가 추이"""
+        if table.empty:
+            return pd.DataFrame()
+
+        bucket = table["approved_at"].dt.to_period(freq).dt.to_timestamp()
+        frame = pd.DataFrame({
+            "bucket": bucket.to_numpy(),
+            "unit_price": table["unit_price"].to_numpy(),
+            "qty": table["qty"].to_numpy(),
+            "weighted": (table["unit_price"] * table["qty"]).to_numpy(),
+        })
+        trend = frame.groupby("bucket").agg(
+            median=("unit_price", "median"),
+            qty=("qty", "sum"),
+            weighted=("weighted", "sum"),
+        )
+        trend["weighted_avg"] = trend["weighted"] / trend["qty"]
+        return trend.drop(columns="weighted")
+
+    def analyze(self, queries, spec=None):
+        """
+        품목 검색 + 통계 일괄 계산 (B2G 카드용)
+
+        Returns:
+            dict: matched / available / stats / trend / breakdown
+                  매칭 품목이 없으면 stats=None (관련 없는 품목의 단가를 섞지 않음)
+        """
+        matched = self.match_products(queries)
+        table = self.select(matched, spec) if matched else self._empty_table()
+
+        return {
+            "matched": matched,
+            "available": self.available,
+            "stats": self.price_stats(table),
+            "trend": self.price_trend(table),
+            "breakdown": self.spec_breakdown(table),
+        }
+
+
+@st.cache_resource
+def get_procurement_index():
+    """프로세스 전체에서 공유되는 조달 단가 인덱스 (최초 1회 로드)"""
+    return ProcurementPriceIndex()
@@ -1,6 +1,7 @@
 import streamlit as st
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from openai import OpenAI
 
 # 경로 설정
@@ -62,6 +63,83 @@ def generate_draft(supplier_name, my_info, item_info, extra_options=[]):
     except Exception as e:
         return f"작성 중 오류 발생: {e}"
 
+# =========================================================================
+# [Bulk] 전체 공급사 일괄 초안 생성
+# =========================================================================
+SUPPLIER_PLACEHOLDER = "{{SUPPLIER_NAME}}"
+MAX_WORKERS = 5
+
+
+def draft_cache_key(supplier_name, my_info, item_info, extra_options):
+    """초안 캐시 키: (공급사, 발신자, 품목, 옵션)"""
+    return (supplier_name, my_info['company'], my_info['name'], item_info, tuple(extra_options))
+
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def generate_template(my_company, my_name, item_info, extra_options=()):
+    """
+    수신자만 비워둔 공통 본문 1회 생성
+    - 공급사명 자리에 SUPPLIER_PLACEHOLDER를 넣어 로컬에서 치환
+    - 동일 (발신자, 품목, 옵션) 조합은 세션 간 캐시 재사용
+    """
+    draft = generate_draft(SUPPLIER_PLACEHOLDER, {"company": my_company, "name": my_name}, item_info, list(extra_options))
+    if SUPPLIER_PLACEHOLDER not in draft:
+        # 오류 메시지 또는 치환 불가 -> 캐시하지 않고 호출 측에서 개별 생성
+        raise ValueError(draft)
+    return draft
+
+
+def is_draft_error(draft):
+    """generate_draft 오류 메시지 여부 (캐시 제외 대상)"""
+    return draft.startswith(("⚠️", "작성 중 오류"))
+
+
+def personalize(template, supplier_name):
+    """공통 본문에 공급사명 치환"""
+    return template.replace(SUPPLIER_PLACEHOLDER, supplier_name)
+
+
+def generate_drafts_bulk(supplier_names, my_info, item_info, extra_options=(), personalized=False, max_workers=MAX_WORKERS):
+    """
+    여러 공급사 초안 생성 (완료 순서대로 yield)
+
+    Args:
+        personalized: False면 공통 본문 1회 생성 후 로컬 치환,
+                      True면 공급사별 개별 GPT 호출을 병렬 실행
+
+    Yields:
+        (supplier_name, draft)
+    """
+    if not personalized:
+        try:
+            template = generate_template(my_info['company'], my_info['name'], item_info, tuple(extra_options))
+        except ValueError:
+            template = None
+        if template:
+            for name in supplier_names:
+                yield name, personalize(template, name)
+            return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(generate_draft, name, my_info, item_info, list(extra_options)): name
+            for name in supplier_names
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def render_draft(draft_area, idx, comp_name, draft):
+    key = f"draft_{idx}"
+    # key가 고정된 위젯은 value 변경을 무시하므로 새 초안일 때만 상태를 교체 (수정 내용은 유지)
+    if st.session_state.get(f"{key}_source") != draft:
+        st.session_state[key] = draft
+        st.session_state[f"{key}_source"] = draft
+    with draft_area.container():
+        st.success(f"To: {comp_name}")
+        st.text_area(f"메일 내용 ({comp_name})", height=300, key=key)
+
+
 # =========================================================================
 # [Main Function] 외부 호출용
 # =========================================================================
@@ -107,7 +185,26 @@ def run_inquiry_maker():
 
     st.markdown("---")
 
-    # 3. 공급사 리스트 출력 및 생성 버튼
+    my_info = {"company": my_company, "name": my_name}
+
+    # 생성된 초안은 (공급사, 발신자, 품목, 옵션) 단위로 세션에 보관
+    if 'inquiry_drafts' not in st.session_state:
+        st.session_state['inquiry_drafts'] = {}
+    drafts = st.session_state['inquiry_drafts']
+
+    # 2. 일괄 생성 (Draft All)
+    b1, b2 = st.columns([3, 1])
+    with b1:
+        personalized = st.toggle(
+            "업체별 맞춤 작성 (업체마다 개별 생성, 병렬 처리)",
+            value=False,
+            help="끄면 공통 본문을 1회만 생성하고 업체명만 치환합니다."
+        )
+    with b2:
+        draft_all = st.button("전체 초안 생성", type="primary", use_container_width=True)
+
+    # 3. 공급사 리스트 출력 및 생성 버튼 (같은 이름의 공급사가 있을 수 있으므로 행 번호 기준)
+    draft_areas = {}
     for idx, row in df_suppliers.iterrows():
         comp_name = row.get('기업명', '업체명 미상')
         email = row.get('이메일', '정보 없음')
@@ -118,6 +215,8 @@ def run_inquiry_maker():
             with c1:
                 st.write(f"**{comp_name}** ({email})")
                 draft_area = st.empty() # 결과가 들어갈 파란색 네모 위치
+                draft_areas[idx] = (comp_name, draft_area)
+                draft = drafts.get(draft_cache_key(comp_name, my_info, detail_item, selected_options))
 
             with c2:
                 if st.button(f"초안 생성", key=f"btn_{idx}"):
@@ -125,13 +224,40 @@ def run_inquiry_maker():
                          st.error("API 키 오류: secrets 설정을 확인하세요.")
                     else:
                         with st.spinner("AI가 비즈니스 메일을 작성 중입니다..."):
-                            my_info = {"company": my_company, "name": my_name}
-
                             # [수정 4] generate_draft 함수에 selected_options 리스트 전달
                             draft = generate_draft(comp_name, my_info, detail_item, selected_options)
+                            if not is_draft_error(draft):
+                                drafts[draft_cache_key(comp_name, my_info, detail_item, selected_options)] = draft
 
-                            with draft_area.container():
-                                st.success(f"To: {comp_name}")
-                                st.text_area(f"메일 내용 ({comp_name})", value=draft, height=300)
+            # 같은 실행에서 한 행을 두 번 그리지 않도록 캐시/새 초안 중 하나만 표시
+            if draft:
+                render_draft(draft_area, idx, comp_name, draft)
             st.divider()
 
+    if draft_all:
+        if not get_openai_client():
+            st.error("API 키 오류: secrets 설정을 확인하세요.")
+            return
+
+        # 캐시에 없는 공급사만 생성 (이름이 같은 행은 1회 생성 후 모두 표시)
+        pending_rows = [
+            idx for idx, (name, _) in draft_areas.items()
+            if draft_cache_key(name, my_info, detail_item, selected_options) not in drafts
+        ]
+        pending = list(dict.fromkeys(draft_areas[idx][0] for idx in pending_rows))
+        if not pending:
+            st.info("모든 공급사의 초안이 이미 생성되어 있습니다.")
+            return
+
+        progress = st.progress(0.0, text=f"초안 생성 중... (0/{len(pending)})")
+        for done, (name, draft) in enumerate(
+            generate_drafts_bulk(pending, my_info, detail_item, selected_options, personalized=personalized), start=1
+        ):
+            if not is_draft_error(draft):
+                drafts[draft_cache_key(name, my_info, detail_item, selected_options)] = draft
+            for idx in pending_rows:
+                if draft_areas[idx][0] == name:
+                    render_draft(draft_areas[idx][1], idx, name, draft)
+            progress.progress(done / len(pending), text=f"초안 생성 중... ({done}/{len(pending)})")
+        progress.empty()
+        st.success(f"✅ {len(pending)}개 공급사 초안 생성 완료!")
@@ -0,0 +1,368 @@
+"""
+헤드리스 소싱 파이프라인
+- 상품 발굴 → 공급사 추출 → 리스크 평가 → 견적 의뢰서 작성을 Streamlit 없이 실행
+- Python API (SourcingPipeline) + CLI 제공
+- 상품 단위 워커 풀 병렬 처리, 단계별 체크포인트로 중단 후 재개 가능
+
+CLI 예시:
+    python -m modules.purchasing.pipeline products.csv --out runs/2026-10-19 --workers 4
+
+입력 CSV 컬럼: product(또는 품목), country(또는 국가)
+"""
+
+import os
+import sys
+import re
+import json
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pandas as pd
+
+# 경로 설정
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from config import get_env
+from modules.purchasing.b2g_analytics import ProcurementPriceIndex
+from modules.purchasing.supplier_scoring import screen_suppliers, SupplierScorer
+from modules.purchasing.supplier_names import canonical_name
+from modules.purchasing.supplier_store import get_supplier_store
+from modules.purchasing.inquiry_maker import generate_drafts_bulk, is_draft_error
+
+# 관세청 API 미연결 시 화면 구성을 위한 기본 HS 데이터
+DEMO_HS_INFO = [
+    {"hs_code": "2202.99", "kor_name": "기타 혼합음료", "tax_rate": "8%"},
+    {"hs_code": "3004.90", "kor_name": "의약품 (참고용)", "tax_rate": "0% (FTA)"}
+]
+
+
+# =========================================================================
+# [Core Steps] UI(item_searcher 등)와 파이프라인이 공유하는 단계 함수
+# =========================================================================
+def analyze_market(tavily_client, client, product_name, target_country):
+    """Tavily 검색 + GPT로 현지 B2C 가격/목표 매입가 분석"""
+    search_query = f"{target_country} {product_name} online price market share"
+    search_result = tavily_client.search(query=search_query, search_depth="advanced")
+    context = "\n".join([r['content'] for r in search_result['results'][:3]])
+
+    # B2G 단가는 조달청 데이터에서 직접 계산하므로 제외
+    prompt = f"""
+    당신은 Sourcing 전문가입니다. '{target_country}'의 '{product_name}' 시장 가격을 분석하세요.
+    [Context] {context}
+
+    반드시 아래 JSON 포맷으로만 응답하세요.
+    {{
+        "b2c_price": "현지 온라인 평균가 (예: $2.00 USD)",
+        "b2c_krw": "위 금액의 한화 환산 (예: 약 2,600원)",
+        "target_price": "역산한 목표 매입가 (예: 1,200원)",
+        "analysis_summary": "시장 분석 요약 (2줄)"
+    }}
+    """
+    response = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[{"role": "user", "content": prompt}],
+        response_format={"type": "json_object"}
+    )
+    return json.loads(response.choices[0].message.content)
+
+
+def lookup_hs_codes(product_name, agent=None):
+    """
+    자연어 품목명 -> 표준 키워드 변환 후 관세청 HS코드 조회
+
+    Returns:
+        (refined_keywords, hs_info_list)
+    """
+    from modules.purchasing.ai_agent import PurchasingAgent
+    from modules.purchasing.customs_api import get_hs_code
+
+    agent = agent or PurchasingAgent()
+    refined_keywords = agent.refine_search_term(product_name) or []
+
+    target_keyword = refined_keywords[0] if refined_keywords else product_name
+    raw_hs_data = get_hs_code(target_keyword)
+
+    # API 데이터가 없거나 오류 응답(dict)이면 데모 데이터로 대체
+    hs_info_list = raw_hs_data if isinstance(raw_hs_data, list) and raw_hs_data else DEMO_HS_INFO
+    return refined_keywords, hs_info_list
+
+
+def extract_suppliers(tavily_client, client, product_name, target_count=30, exclude=None, recheck=None):
+    """
+    멀티 쿼리 검색 + GPT로 국내 공급사 후보 추출 (회사명/주력제품/특이사항)
+
+    Args:
+        exclude: 이미 확보한 업체명 (결과에서 제외 -> 부족분만 추출)
+        recheck: 재확인 대상 업체명 (검색 결과에 여전히 있으면 포함)
+    """
+    # 한국어/영어/제조/도매 등 검색 범위를 넓힘
+    queries = [
+        f"대한민국 {product_name} 제조사 제조업체 리스트",
+        f"South Korea {product_name} manufacturers suppliers list",
+        f"{product_name} 도매 업체 b2b 전문기업",
+        f"K-food {product_name} exporters South Korea"
+    ]
+
+    extra_rules = ""
+    if exclude:
+        extra_rules += f"    - 제외 대상 (이미 확보): {', '.join(exclude)}\n"
+    if recheck:
+        extra_rules += f"    - 재확인 대상 (검색 결과에 있으면 반드시 포함): {', '.join(recheck)}\n"
+
+    full_search_context = ""
+    for q in queries:
+        res = tavily_client.search(query=q, search_depth="advanced", max_results=15)
+        full_search_context += "\n".join([r['content'] for r in res['results']]) + "\n"
+
+    gen_prompt = f"""
+    당신은 Sourcing Agent입니다. 아래 제공된 [검색 결과]에서 대한민국 내의 '{product_name}' 관련 실존 기업들을 최대한 많이 추출하세요.
+
+    [검색 결과]
+    {full_search_context}
+
+    [지시 사항]
+    - 목표 수량: {target_count}개 (검색 결과 내에 존재하는 모든 관련 업체를 누락 없이 포함)
+{extra_rules}    - 중복 제거: 이름이 같은 회사는 하나로 통합
+    - 신뢰성: 실존 기업 우선. 제조업체뿐 아니라 주요 도매상도 포함 가능.
+    - 출력 형식: 반드시 아래 JSON Array 형식만 출력. (코드 블록 없이 텍스트만)
+
+    형식: [
+      {{"회사명": "기업A", "주력제품": "품목", "특이사항": "특장점(HACCP, 수출경험 등)"}},
+      ...
+    ]
+    """
+
+    resp = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[{"role": "user", "content": gen_prompt}]
+    )
+
+    raw_text = resp.choices[0].message.content.strip()
+    if "```" in raw_text:
+        raw_text = re.sub(r"```json|```", "", raw_text).strip()
+    match = re.search(r"\[.*\]", raw_text, re.DOTALL)
+    if not match:
+        raise ValueError("데이터 파싱 실패 (결과 형식이 올바르지 않습니다)")
+
+    return pd.DataFrame(json.loads(match.group(0)))
+
+
+def collect_suppliers(store, tavily_client, client, product_name, target_count=30):
+    """
+    공급사 DB 우선 조회 + 부족분/만료 항목만 재검색
+
+    Returns:
+        tuple: (공급사 후보 DataFrame, 새로 추출한 업체 수 - 검색을 생략했으면 None)
+    """
+    plan = store.refresh_plan(product_name, target_count)
+    fresh = plan["fresh"]
+    if not plan["needs_fetch"]:
+        return fresh, None
+
+    df_new = extract_suppliers(
+        tavily_client, client, product_name,
+        target_count=plan["shortfall"] + len(plan["stale"]),
+        exclude=fresh["회사명"].tolist(),
+        recheck=plan["stale"],
+    )
+    store.upsert_profiles(df_new, product_name)
+    store.mark_searched(product_name, len(df_new))
+
+    # 신규/재확인 결과 우선, 기존 유효 항목과 병합 (정규화 회사명 기준 중복 제거)
+    merged = pd.concat([df_new, fresh], ignore_index=True)
+    merged = merged[merged["회사명"].notna()]
+    merged = merged.loc[~merged["회사명"].map(canonical_name).duplicated()].reset_index(drop=True)
+    return merged, len(df_new)
+
+
+# =========================================================================
+# [Pipeline] 배치 실행기
+# =========================================================================
+def _slug(text):
+    return re.sub(r"[^\w가-힣-]+", "_", str(text)).strip("_") or "item"
+
+
+class SourcingPipeline:
+    """
+    상품 리스트 일괄 소싱 실행기
+
+    체크포인트 구조:
+        {out_dir}/{product}__{country}/{stage}.json
+    이미 존재하는 단계는 건너뛰므로 같은 out_dir로 다시 실행하면 이어서 진행됩니다.
+    """
+
+    def __init__(self, out_dir, my_info=None, top_n=5, workers=4, screening_workers=5, log=print):
+        from tavily import TavilyClient
+        from openai import OpenAI
+
+        tavily_key = get_env("TAVILY_API_KEY")
+        openai_key = get_env("OPENAI_API_KEY")
+        if not tavily_key or not openai_key:
+            raise RuntimeError("TAVILY_API_KEY 또는 OPENAI_API_KEY를 확인하세요.")
+
+        self.tavily_client = TavilyClient(api_key=tavily_key)
+        self.client = OpenAI(api_key=openai_key)
+        self.scorer = SupplierScorer(openai_key, tavily_key)
+        self.b2g_index = ProcurementPriceIndex()
+        self.store = get_supplier_store()
+
+        self.out_dir = out_dir
+        self.my_info = my_info or {"company": "넥스트레이드(주)", "name": "김무역 팀장"}
+        self.top_n = top_n
+        self.workers = workers
+        self.screening_workers = screening_workers
+        self.log = log
+        self._log_lock = threading.Lock()
+
+    # --- 체크포인트 -------------------------------------------------------
+    def _job_dir(self, product, country):
+        path = os.path.join(self.out_dir, f"{_slug(product)}__{_slug(country)}")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def _checkpoint(self, job_dir, stage, build):
+        """단계 결과가 있으면 로드, 없으면 build() 실행 후 원자적으로 저장"""
+        path = os.path.join(job_dir, f"{stage}.json")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return json.load(f), True
+
+        result = build()
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2, default=str)
+        os.replace(tmp_path, path)
+        return result, False
+
+    def _emit(self, msg):
+        with self._log_lock:
+            self.log(msg)
+
+    # --- 단계 실행 --------------------------------------------------------
+    def run_product(self, product, country):
+        """상품 1개에 대해 4단계 실행 (단계별 체크포인트)"""
+        job_dir = self._job_dir(product, country)
+
+        def build_market():
+            market = analyze_market(self.tavily_client, self.client, product, country)
+            keywords, hs_info = lookup_hs_codes(product)
+            b2g = self.b2g_index.analyze([product] + list(keywords))
+            return {
+                "market_data": market,
+                "refined_keywords": keywords,
+                "hs_info": hs_info,
+                "b2g": {"matched": b2g["matched"], "stats": b2g["stats"]},
+            }
+
+        def build_suppliers():
+            # UI와 동일하게 공급사 DB 우선 조회 (부족분/만료 항목만 재검색)
+            df, _ = collect_suppliers(self.store, self.tavily_client, self.client, product)
+            return df.to_dict("records")
+
+        def build_screening():
+            companies = [s.get("회사명") for s in suppliers]
+            outcome = screen_suppliers(companies, product, scorer=self.scorer,
+                                       max_workers=self.screening_workers)
+            if not outcome["results"]:
+                raise RuntimeError(f"리스크 평가 실패: {outcome['errors']}")
+            # 일부 실패는 errors에 기록하고 성공한 결과로 진행
+            return outcome
+
+        def build_inquiry():
+            top = screening["results"][:self.top_n]
+            drafts = dict(generate_drafts_bulk([s["기업명"] for s in top], self.my_info, product))
+            # 오류 문구가 초안으로 저장되면 재실행 시 건너뛰므로 체크포인트 전에 실패 처리
+            failed = [s["기업명"] for s in top
+                      if not drafts.get(s["기업명"]) or is_draft_error(drafts[s["기업명"]])]
+            if failed:
+                raise RuntimeError(f"의뢰서 초안 생성 실패: {', '.join(failed)}")
+            return [{**s, "draft": drafts.get(s["기업명"], "")} for s in top]
+
+        _, resumed = self._checkpoint(job_dir, "market", build_market)
+        self._emit(f"[{product}/{country}] market {'(resume)' if resumed else 'done'}")
+
+        suppliers, resumed = self._checkpoint(job_dir, "suppliers", build_suppliers)
+        self._emit(f"[{product}/{country}] suppliers: {len(suppliers)} {'(resume)' if resumed else ''}")
+
+        screening, resumed = self._checkpoint(job_dir, "screening", build_screening)
+        self._emit(f"[{product}/{country}] screening: {len(screening['results'])} scored, "
+                   f"{len(screening['errors'])} failed {'(resume)' if resumed else ''}")
+
+        inquiries, resumed = self._checkpoint(job_dir, "inquiry", build_inquiry)
+        self._emit(f"[{product}/{country}] inquiry: {len(inquiries)} drafts {'(resume)' if resumed else ''}")
+
+        return {"product": product, "country": country, "dir": job_dir, "inquiries": len(inquiries)}
+
+    def run(self, jobs):
+        """
+        (product, country) 리스트를 워커 풀로 병렬 실행
+
+        Returns:
+            DataFrame: 상품별 처리 결과 (status/error 포함), out_dir/summary.csv에도 저장
+        """
+        os.makedirs(self.out_dir, exist_ok=True)
+        rows = []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self.run_product, p, c): (p, c) for p, c in jobs}
+            for future in as_completed(futures):
+                product, country = futures[future]
+                try:
+                    rows.append({**future.result(), "status": "ok", "error": ""})
+                except Exception as e:
+                    self._emit(f"[{product}/{country}] ❌ {e}")
+                    rows.append({"product": product, "country": country, "status": "failed", "error": str(e)})
+
+        summary = pd.DataFrame(rows)
+        summary.to_csv(os.path.join(self.out_dir, "summary.csv"), index=False, encoding="utf-8-sig")
+        return summary
+
+
+def load_jobs(csv_path, default_country="몽골"):
+    """입력 CSV -> (product, country) 리스트 (중복 제거)"""
+    df = pd.read_csv(csv_path, encoding="utf-8-sig")
+    df.columns = df.columns.str.strip().str.lower()
+    product_col = "product" if "product" in df.columns else "품목"
+    country_col = "country" if "country" in df.columns else ("국가" if "국가" in df.columns else None)
+
+    # 빈 칸(NaN)은 문자열 변환 전에 제거 (pandas 버전에 따라 astype(str)이 NaN을 유지함)
+    keep_cols = [product_col] + ([country_col] if country_col else [])
+    df = df.dropna(subset=keep_cols)
+    products = df[product_col].astype(str).str.strip()
+    countries = df[country_col].astype(str).str.strip() if country_col else pd.Series(default_country, index=df.index)
+    jobs = [(p, c) for p, c in zip(products, countries) if p and c]
+    return list(dict.fromkeys(jobs))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TradeNex 헤드리스 소싱 파이프라인")
+    parser.add_argument("csv", help="상품 CSV (product, country 컬럼)")
+    parser.add_argument("--out", default=os.path.join(root_dir, "runs", "sourcing"), help="체크포인트/결과 폴더")
+    parser.add_argument("--workers", type=int, default=4, help="동시 처리 상품 수")
+    parser.add_argument("--top", type=int, default=5, help="견적 의뢰 대상 공급사 수")
+    parser.add_argument("--country", default="몽골", help="country 컬럼이 없을 때 기본 국가")
+    parser.add_argument("--company", default="넥스트레이드(주)", help="발신 회사명")
+    parser.add_argument("--sender", default="김무역 팀장", help="발신 담당자명")
+    args = parser.parse_args(argv)
+
+    jobs = load_jobs(args.csv, args.country)
+    try:
+        pipeline = SourcingPipeline(
+            args.out,
+            my_info={"company": args.company, "name": args.sender},
+            top_n=args.top,
+            workers=args.workers,
+        )
+    except RuntimeError as e:
+        print(f"🚨 {e}")
+        return 2
+    summary = pipeline.run(jobs)
+    failed = (summary["status"] != "ok").sum() if not summary.empty else 0
+    print(f"완료: {len(summary) - failed}/{len(summary)} 성공 → {args.out}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
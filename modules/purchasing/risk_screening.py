@@ -2,8 +2,6 @@ import streamlit as st
 import pandas as pd
 import os
 import sys
-from openai import OpenAI
-import time
 
 # 경로 설정
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -12,13 +10,13 @@ if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
 from config import get_env
+from modules.purchasing.supplier_scoring import screen_suppliers, SupplierScorer
 
 def run_risk_screening():
     # -------------------------------------------------------------------------
     # [Setup] 환경 설정 (클라우드 + 로컬 지원)
     # -------------------------------------------------------------------------
     OPENAI_API_KEY = get_env("OPENAI_API_KEY")
-    client = OpenAI(api_key=OPENAI_API_KEY) if OPENAI_API_KEY else None
 
     st.markdown("### 3단계: 공급사 리스크 정밀 진단 (Screening)")
 
@@ -50,71 +48,44 @@ def run_risk_screening():
         start_screening = st.button("리스크 정밀진단 시작")
 
     if start_screening:
-        if not client:
+        if not OPENAI_API_KEY:
             st.error("API 키가 없습니다.")
         else:
             progress_bar = st.progress(0)
             status_text = st.empty()
 
-            companies_str = ", ".join(candidates_df['회사명'].tolist())
-
-            status_text.text("Tavily 검색엔진으로 기업 평판 및 연락처 조회 중...")
-            time.sleep(1)
-            progress_bar.progress(30)
-
-            # [핵심 수정] 전화번호와 이메일도 같이 달라고 요청
-            prompt = f"""
-            다음은 '{target_product}' 제조 후보 기업 30곳의 리스트입니다.
-            : {companies_str}
-
-            이 중에서 수출 역량, 브랜드 인지도, 재무 안정성을 고려하여
-            가상의 'Top 5 우수 공급사'를 선정해주세요.
-
-            특히, 추후 무역 문의(Inquiry) 발송을 위해 **전화번호**와 **이메일** 정보가 필수적입니다.
-            (실제 정보가 없다면 가상의 그럴듯한 담당자 연락처로 채워주세요.)
-
-            결과는 반드시 아래 JSON 형식으로만 출력해:
-            [
-                {{
-                    "순위": 1,
-                    "기업명": "OO식품",
-                    "등급": "S",
-                    "이유": "수출 실적 우수...",
-                    "전화번호": "02-1234-5678",
-                    "이메일": "trade@oofood.com"
-                }},
-                ...
-            ]
-            """
-
-            try:
-                status_text.text("AI가 데이터를 분석하고 연락처를 추출 중입니다...")
-                progress_bar.progress(70)
-                
-                response = client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                
-                raw_text = response.choices[0].message.content.strip()
-                
-                # JSON 파싱 (마크다운 제거)
-                import json
-                import re
-                if "```" in raw_text:
-                    raw_text = re.sub(r"```json|```", "", raw_text).strip()
-                
-                top5_list = json.loads(raw_text)
-                df_top5 = pd.DataFrame(top5_list)
-                
-                progress_bar.progress(100)
-                status_text.text("✅ 분석 완료! 최종 5개 기업 및 연락처 확보.")
-                
+            companies = candidates_df['회사명'].tolist()
+
+            def on_progress(done, total, company, result, error):
+                # 공급사 1곳 완료될 때마다 실제 진행률 반영
+                progress_bar.progress(done / total if total else 1.0)
+                if error:
+                    status_text.text(f"[{done}/{total}] ⚠️ {company} 평가 실패: {error}")
+                else:
+                    status_text.text(f"[{done}/{total}] {company} → Grade {result.get('등급')} ({result.get('점수')}점)")
+
+            outcome = screen_suppliers(companies, target_product, scorer=SupplierScorer(), on_progress=on_progress)
+            results = outcome["results"]
+
+            if results:
+                df_top5 = pd.DataFrame(results[:5])
+                df_top5.insert(0, "순위", range(1, len(df_top5) + 1))
+
                 # 결과 저장 (이 데이터프레임에 이메일/전화번호가 포함됨)
                 st.session_state['final_suppliers'] = df_top5
-                
-            except Exception as e:
-                st.error(f"분석 실패: {e}")
+                st.session_state['screening_results'] = pd.DataFrame(results)
+
+                status_text.text(
+                    f"✅ 분석 완료! {len(results)}/{len(set(companies))}개 기업 평가 "
+                    f"(캐시 재사용 {outcome['cached']}건)"
+                )
+            else:
+                st.error("분석 실패: 평가에 성공한 기업이 없습니다.")
+
+            if outcome["errors"]:
+                with st.expander(f"⚠️ 평가 실패 {len(outcome['errors'])}건 (다시 실행 시 해당 기업만 재평가)"):
+                    for company, msg in outcome["errors"].items():
+                        st.write(f"- **{company}**: {msg}")
 
     # -------------------------------------------------------------------------
     # [Output] 최종 Top 5 결과 카드뷰
@@ -123,6 +94,10 @@ def run_risk_screening():
         df_final = st.session_state['final_suppliers']
         
         st.subheader("🏆 최종 선정된 Top 5 공급사 (연락처 포함)")
+
+        if 'screening_results' in st.session_state:
+            with st.expander("전체 평가 결과 보기"):
+                st.dataframe(st.session_state['screening_results'], use_container_width=True)
         
         # CSV 다운로드 버튼 (연락처 포함된 버전)
         csv = df_final.to_csv(index=False).encode('utf-8-sig')
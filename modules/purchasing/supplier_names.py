@@ -0,0 +1,16 @@
+"""
+공급사/품목 이름 정규화 (supplier_store, supplier_scoring 공용)
+"""
+
+import re
+
+
+def canonical_name(company):
+    """회사명 정규화: (주)/주식회사/공백 제거 후 소문자"""
+    name = re.sub(r"\(주\)|㈜|주식회사|\(유\)|co\.,?\s*ltd\.?|inc\.?|corp\.?", "", str(company), flags=re.IGNORECASE)
+    return re.sub(r"\s+", "", name).lower()
+
+
+def normalize_category(category):
+    """검색 품목명 -> 카테고리 키"""
+    return " ".join(str(category).split()).lower()
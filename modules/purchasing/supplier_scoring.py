@@ -0,0 +1,212 @@
+"""
+공급사 리스크 스코어링 파이프라인
+- 공급사별 독립 평가 (Tavily 검색 근거 + GPT 채점)
+- 동시 실행 수 제한 (ThreadPoolExecutor)
+- 회사 단위 캐시: 이전에 평가한 회사는 다시 호출하지 않음
+- 일부 실패 시에도 성공한 결과는 유지
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from openai import OpenAI
+import streamlit as st
+
+# 경로 설정
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from config import get_env
+from modules.purchasing.supplier_names import canonical_name, normalize_category
+from modules.purchasing.supplier_store import get_supplier_store, SCORE_TTL
+
+try:
+    from tavily import TavilyClient
+    HAS_TAVILY = True
+except ImportError:
+    HAS_TAVILY = False
+
+MAX_WORKERS = 5
+NOT_FOUND = "정보 없음"
+
+
+class ScoreCache:
+    """
+    회사 단위 평가 결과 캐시 (스레드 안전, 프로세스 공유)
+    - 메모리 항목도 저장소와 같은 유효기간(SCORE_TTL)이 지나면 만료
+    - store가 주어지면 메모리 미스 시 영구 저장소(SupplierStore)를 조회하고 write-through
+    """
+
+    def __init__(self, store=None, ttl=SCORE_TTL):
+        self._lock = threading.Lock()
+        self._data = {}
+        self.store = store
+        self.ttl = ttl
+
+    def _key(self, company, product):
+        return (canonical_name(company), normalize_category(product))
+
+    def get(self, company, product):
+        key = self._key(company, product)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and time.time() - entry[0] > self.ttl:
+                del self._data[key]
+                entry = None
+        if entry is not None:
+            return entry[1]
+
+        if self.store is None:
+            return None
+        hit = self.store.get_score(company, product, max_age=self.ttl)
+        if hit:
+            # 저장소의 평가 시각 기준으로 만료 (메모리에 올린 시점부터 다시 세지 않음)
+            verified = hit.pop("score_verified", None) or time.time()
+            with self._lock:
+                self._data[key] = (verified, hit)
+        return hit
+
+    def put(self, company, product, result):
+        with self._lock:
+            self._data[self._key(company, product)] = (time.time(), result)
+        if self.store is not None:
+            self.store.put_score(company, product, result)
+
+
+@st.cache_resource
+def get_score_cache():
+    """세션 간 공유되는 스코어 캐시 (공급사 DB 연동)"""
+    return ScoreCache(store=get_supplier_store())
+
+
+def parse_score(value):
+    """모델 출력 점수 -> 0~100 정수 ("85점", "85/100" 등 숫자 외 문자 허용, 없으면 0)"""
+    if isinstance(value, (int, float)):
+        return max(0, min(100, int(value)))
+    match = re.search(r"\d+", str(value or ""))
+    return max(0, min(100, int(match.group()))) if match else 0
+
+
+class SupplierScorer:
+    """공급사 1곳을 평가하는 채점기 (스레드에서 호출 가능)"""
+
+    def __init__(self, openai_key=None, tavily_key=None):
+        openai_key = openai_key or get_env("OPENAI_API_KEY")
+        tavily_key = tavily_key or get_env("TAVILY_API_KEY")
+
+        self.client = OpenAI(api_key=openai_key) if openai_key else None
+        self.search = TavilyClient(api_key=tavily_key) if (HAS_TAVILY and tavily_key) else None
+
+    def _search_context(self, company, product):
+        """회사 평판/연락처 검색 (Tavily 없으면 빈 문자열)"""
+        if not self.search:
+            return ""
+        res = self.search.search(query=f"{company} {product} 회사 연락처 수출", max_results=5)
+        return "\n".join(r.get('content', '') for r in res.get('results', []))
+
+    def score(self, company, product):
+        """
+        공급사 1곳 평가
+
+        Returns:
+            dict: 기업명, 점수(0~100), 등급(S/A/B/C), 이유, 전화번호, 이메일
+        """
+        if not self.client:
+            raise RuntimeError("OPENAI_API_KEY가 없습니다.")
+
+        context = self._search_context(company, product)
+
+        prompt = f"""
+        당신은 공급사 리스크 심사역입니다. '{product}' 공급 후보 '{company}'를 평가하세요.
+
+        [검색 결과]
+        {context or "(검색 결과 없음)"}
+
+        [평가 기준] 수출 역량, 브랜드 인지도, 재무 안정성, 인증 보유 여부
+        [연락처 규칙] 전화번호/이메일은 위 검색 결과에 실제로 등장한 값만 사용하고,
+        없으면 반드시 "{NOT_FOUND}"로 표기할 것. 절대 지어내지 말 것.
+
+        반드시 아래 JSON 형식으로만 출력:
+        {{"점수": 0-100 정수, "등급": "S/A/B/C", "이유": "한 문장", "전화번호": "...", "이메일": "..."}}
+        """
+
+        response = self.client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": prompt}],
+            response_format={"type": "json_object"},
+            temperature=0.2,
+        )
+        result = json.loads(response.choices[0].message.content)
+
+        return {
+            "기업명": company,
+            "점수": parse_score(result.get("점수")),
+            "등급": result.get("등급", "C"),
+            "이유": result.get("이유", ""),
+            "전화번호": result.get("전화번호") or NOT_FOUND,
+            "이메일": result.get("이메일") or NOT_FOUND,
+        }
+
+
+def screen_suppliers(companies, product, scorer=None, cache=None, max_workers=MAX_WORKERS, on_progress=None):
+    """
+    공급사 리스트 병렬 평가
+
+    Args:
+        companies: 회사명 리스트
+        product: 대상 품목
+        on_progress: 콜백 (done, total, company, result_or_None, error_or_None)
+                     호출 스레드에서 실행되므로 Streamlit 위젯 갱신 가능
+
+    Returns:
+        dict: {"results": [...], "errors": {회사명: 메시지}, "cached": 캐시 적중 수}
+    """
+    scorer = scorer or SupplierScorer()
+    cache = cache or get_score_cache()
+
+    # 중복 제거 (입력 순서 유지)
+    unique = list(dict.fromkeys(c for c in companies if c and str(c).strip()))
+    total = len(unique)
+
+    results, errors = [], {}
+    done = 0
+
+    # 1) 캐시 적중분은 바로 반영 - 새로운 회사만 비용 발생
+    pending = []
+    for company in unique:
+        cached = cache.get(company, product)
+        if cached:
+            results.append(cached)
+            done += 1
+            if on_progress:
+                on_progress(done, total, company, cached, None)
+        else:
+            pending.append(company)
+    cached_count = done
+
+    # 2) 나머지는 동시 실행 수를 제한하여 병렬 평가
+    if pending:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(scorer.score, c, product): c for c in pending}
+            for future in as_completed(futures):
+                company = futures[future]
+                done += 1
+                try:
+                    result = future.result()
+                    cache.put(company, product, result)
+                    results.append(result)
+                    if on_progress:
+                        on_progress(done, total, company, result, None)
+                except Exception as e:
+                    errors[company] = str(e)
+                    if on_progress:
+                        on_progress(done, total, company, None, e)
+
+    results.sort(key=lambda r: r.get("점수", 0), reverse=True)
+    return {"results": results, "errors": errors, "cached": cached_count}
@@ -0,0 +1,211 @@
+"""
+공급사 지식 베이스 (SQLite)
+- 공급사 프로필 / 리스크 등급 / 연락처를 로컬 DB에 영구 저장
+- canonical_name, category, grade 인덱스
+- last_verified 타임스탬프 기준으로 오래된 항목만 재조회 (incremental refresh)
+- 카테고리별 마지막 검색 시각을 기록해 부족분/만료 항목 재검색 간격을 제한
+"""
+
+import os
+import sys
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+import pandas as pd
+import streamlit as st
+
+# 경로 설정
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from modules.purchasing.supplier_names import canonical_name, normalize_category
+
+SUPPLIER_DB = os.path.join(root_dir, 'data', 'purchasing', 'suppliers.db')
+
+# 이 기간이 지나면 재검증 대상 (초)
+PROFILE_TTL = 30 * 24 * 3600
+SCORE_TTL = 14 * 24 * 3600
+# 유효 항목이 목표보다 적거나 만료 항목이 있어도 이 간격 안에는 다시 검색하지 않음
+RESEARCH_INTERVAL = 7 * 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS suppliers (
+    canonical_name   TEXT NOT NULL,
+    category         TEXT NOT NULL,
+    name             TEXT NOT NULL,
+    main_product     TEXT DEFAULT '',
+    notes            TEXT DEFAULT '',
+    grade            TEXT,
+    score            INTEGER,
+    reason           TEXT,
+    phone            TEXT,
+    email            TEXT,
+    profile_verified REAL,
+    score_verified   REAL,
+    PRIMARY KEY (canonical_name, category)
+);
+CREATE INDEX IF NOT EXISTS idx_suppliers_name ON suppliers (canonical_name);
+CREATE INDEX IF NOT EXISTS idx_suppliers_category ON suppliers (category, profile_verified);
+CREATE INDEX IF NOT EXISTS idx_suppliers_grade ON suppliers (category, grade, score);
+CREATE TABLE IF NOT EXISTS search_log (
+    category    TEXT PRIMARY KEY,
+    searched_at REAL NOT NULL,
+    found       INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class SupplierStore:
+    """SQLite 기반 공급사 저장소 (스레드별 커넥션)"""
+
+    def __init__(self, db_path=SUPPLIER_DB):
+        self.db_path = db_path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        with conn:
+            yield conn
+
+    # ---------------------------------------------------------------------
+    # 프로필 (공급사 리스트 추출 결과)
+    # ---------------------------------------------------------------------
+    def upsert_profiles(self, df_candidates, category):
+        """공급사 후보(회사명/주력제품/특이사항) 저장 - 등급 정보는 유지"""
+        cat = normalize_category(category)
+        now = time.time()
+        rows = [
+            (canonical_name(r.get('회사명', '')), cat, r.get('회사명', ''),
+             r.get('주력제품', ''), r.get('특이사항', ''), now)
+            for r in df_candidates.to_dict('records') if r.get('회사명')
+        ]
+        with self._conn() as conn:
+            conn.executemany("""
+                INSERT INTO suppliers (canonical_name, category, name, main_product, notes, profile_verified)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (canonical_name, category) DO UPDATE SET
+                    name = excluded.name,
+                    main_product = excluded.main_product,
+                    notes = excluded.notes,
+                    profile_verified = excluded.profile_verified
+            """, rows)
+        return len(rows)
+
+    def fresh_candidates(self, category, max_age=PROFILE_TTL):
+        """유효기간 내 공급사 후보를 item_searcher와 동일한 컬럼으로 반환"""
+        cutoff = time.time() - max_age
+        with self._conn() as conn:
+            rows = conn.execute("""
+                SELECT name AS 회사명, main_product AS 주력제품, notes AS 특이사항
+                FROM suppliers
+                WHERE category = ? AND profile_verified >= ?
+                ORDER BY name
+            """, (normalize_category(category), cutoff)).fetchall()
+        return pd.DataFrame([dict(r) for r in rows], columns=["회사명", "주력제품", "특이사항"])
+
+    def stale_names(self, category, max_age=PROFILE_TTL):
+        """유효기간이 지난 공급사 후보 회사명 (재확인 대상)"""
+        with self._conn() as conn:
+            rows = conn.execute("""
+                SELECT name FROM suppliers
+                WHERE category = ? AND profile_verified < ?
+                ORDER BY name
+            """, (normalize_category(category), time.time() - max_age)).fetchall()
+        return [r["name"] for r in rows]
+
+    def refresh_plan(self, category, target, max_age=PROFILE_TTL, interval=RESEARCH_INTERVAL):
+        """
+        공급사 리스트 재검색 계획
+
+        Returns:
+            dict: fresh(유효 후보 DataFrame), stale(재확인 대상 회사명), shortfall(목표 대비 부족 수),
+                  needs_fetch(검색 필요 여부 - 최근 interval 안에 검색했으면 부족/만료가 있어도 False)
+        """
+        fresh = self.fresh_candidates(category, max_age)
+        stale = self.stale_names(category, max_age)
+        shortfall = max(int(target) - len(fresh), 0)
+        with self._conn() as conn:
+            row = conn.execute("SELECT searched_at FROM search_log WHERE category = ?",
+                               (normalize_category(category),)).fetchone()
+        searched_recently = row is not None and time.time() - row["searched_at"] < interval
+        return {
+            "fresh": fresh,
+            "stale": stale,
+            "shortfall": shortfall,
+            "needs_fetch": bool(stale or shortfall) and not searched_recently,
+        }
+
+    def mark_searched(self, category, found):
+        """카테고리 검색 완료 기록"""
+        with self._conn() as conn:
+            conn.execute("""
+                INSERT INTO search_log (category, searched_at, found) VALUES (?, ?, ?)
+                ON CONFLICT (category) DO UPDATE SET searched_at = excluded.searched_at, found = excluded.found
+            """, (normalize_category(category), time.time(), int(found)))
+
+    # ---------------------------------------------------------------------
+    # 리스크 평가 결과 (supplier_scoring.ScoreCache 의 영구 저장소)
+    # ---------------------------------------------------------------------
+    def get_score(self, company, category, max_age=SCORE_TTL):
+        """유효기간 내 평가 결과 (없거나 오래되면 None)"""
+        with self._conn() as conn:
+            row = conn.execute("""
+                SELECT name, score, grade, reason, phone, email, score_verified
+                FROM suppliers
+                WHERE canonical_name = ? AND category = ? AND score_verified >= ?
+            """, (canonical_name(company), normalize_category(category), time.time() - max_age)).fetchone()
+        if not row:
+            return None
+        return {
+            "기업명": row["name"], "점수": row["score"], "등급": row["grade"],
+            "이유": row["reason"], "전화번호": row["phone"], "이메일": row["email"],
+            "score_verified": row["score_verified"],
+        }
+
+    def put_score(self, company, category, result):
+        with self._conn() as conn:
+            conn.execute("""
+                INSERT INTO suppliers (canonical_name, category, name, grade, score, reason, phone, email, score_verified)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (canonical_name, category) DO UPDATE SET
+                    grade = excluded.grade,
+                    score = excluded.score,
+                    reason = excluded.reason,
+                    phone = excluded.phone,
+                    email = excluded.email,
+                    score_verified = excluded.score_verified
+            """, (canonical_name(company), normalize_category(category), company,
+                  result.get("등급"), result.get("점수"), result.get("이유"),
+                  result.get("전화번호"), result.get("이메일"), time.time()))
+
+    def top_suppliers(self, category, grades=("S", "A"), limit=20):
+        """카테고리 내 등급별 상위 공급사 (grade 인덱스 사용)"""
+        placeholders = ",".join("?" * len(grades))
+        with self._conn() as conn:
+            rows = conn.execute(f"""
+                SELECT name AS 기업명, grade AS 등급, score AS 점수, reason AS 이유,
+                       phone AS 전화번호, email AS 이메일, score_verified
+                FROM suppliers
+                WHERE category = ? AND grade IN ({placeholders})
+                ORDER BY score DESC
+                LIMIT ?
+            """, (normalize_category(category), *grades, limit)).fetchall()
+        return pd.DataFrame([dict(r) for r in rows])
+
+
+@st.cache_resource
+def get_supplier_store():
+    """프로세스 전체에서 공유되는 공급사 저장소"""
+    return SupplierStore()
@@ -0,0 +1,101 @@
+"""
+오퍼시트 산출물 캐시 (콘텐츠 주소 기반)
+- 키: (form_data, items, labels, TEMPLATE_VERSION)의 sha256 -> 입력이 같으면 세션과 무관하게 공유
+- 디스크 저장 (data/sales/artifacts/<키 앞 2자리>/<키>.<확장자>)
+- 전체 용량 상한 초과 시 가장 오래 사용되지 않은 파일부터 삭제 (LRU, 파일 mtime 기준)
+"""
+
+import os
+import sys
+import json
+import hashlib
+import threading
+import streamlit as st
+
+# 경로 설정
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from modules.sales.doc_maker import TEMPLATE_VERSION
+
+ARTIFACT_DIR = os.path.join(root_dir, "data", "sales", "artifacts")
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+
+
+def artifact_key(form_data: dict, items: list, labels: dict = None) -> str:
+    """오퍼시트 입력 전체의 콘텐츠 해시"""
+    raw = json.dumps([TEMPLATE_VERSION, form_data, items, labels], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ArtifactCache:
+    """디스크 기반 LRU 산출물 캐시 (프로세스 내 스레드 안전)"""
+
+    def __init__(self, root=ARTIFACT_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._total = sum(os.path.getsize(p) for p in self._files())
+
+    def _path(self, key, ext):
+        return os.path.join(self.root, key[:2], f"{key}.{ext}")
+
+    def _files(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if not name.endswith(".tmp"):
+                    yield os.path.join(dirpath, name)
+
+    def get(self, key, ext):
+        """저장된 산출물 (없으면 None), 조회 시 사용 시각 갱신"""
+        path = self._path(key, ext)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    def put(self, key, ext, data: bytes):
+        path = self._path(key, ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        with self._lock:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self._total += len(data) - old_size
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """용량 상한의 90%까지 오래된 파일부터 삭제"""
+        entries = []
+        for path in self._files():
+            try:
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+            except OSError:
+                continue
+        entries.sort()
+        self._total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if self._total <= target:
+                break
+            try:
+                os.remove(path)
+                self._total -= size
+            except OSError:
+                continue
+
+
+@st.cache_resource
+def get_artifact_cache():
+    """세션 간 공유되는 산출물 캐시"""
+    return ArtifactCache()
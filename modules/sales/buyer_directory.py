@@ -0,0 +1,215 @@
+"""
+바이어 디렉터리 (인덱스 기반 검색)
+- global_buyers.csv를 1회 로드하여 프로세스 전체에서 공유
+- 국가(한글/영문 별칭), 업종, 키워드(한글 2-gram + 영문 단어) 역색인
+- 검색: 국가 필터 + 품목 TF-IDF 점수(한 번의 벡터 연산)로 정렬, 페이지 단위 top-k 반환
+- 문서별 단어 가중치(1 + log tf)와 길이 정규화 값은 미리 계산, idf는 검색 시점에 계산
+  -> add_buyers로 추가된 바이어도 재색인 없이 바로 반영
+"""
+
+import os
+import re
+import sys
+import math
+from collections import Counter
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# 경로 설정
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+BUYERS_FILE = os.path.join(root_dir, "data", "sales", "global_buyers.csv")
+
+# 국가 별칭 -> 정규 키
+COUNTRY_ALIASES = {
+    "mongolia": ["몽골", "mongolia", "mongol"],
+    "vietnam": ["베트남", "vietnam", "viet nam"],
+    "japan": ["일본", "japan"],
+    "china": ["중국", "china", "prc"],
+    "usa": ["미국", "usa", "us", "united states", "america"],
+    "brazil": ["브라질", "brazil", "brasil"],
+    "germany": ["독일", "germany", "deutschland"],
+    "uk": ["영국", "uk", "united kingdom", "britain", "england"],
+    "thailand": ["태국", "thailand"],
+    "indonesia": ["인도네시아", "indonesia"],
+    "malaysia": ["말레이시아", "malaysia"],
+    "philippines": ["필리핀", "philippines"],
+    "india": ["인도", "india"],
+    "russia": ["러시아", "russia"],
+    "kazakhstan": ["카자흐스탄", "kazakhstan"],
+    "uzbekistan": ["우즈베키스탄", "uzbekistan"],
+    "saudi arabia": ["사우디아라비아", "사우디", "saudi arabia", "saudi", "ksa"],
+    "uae": ["아랍에미리트", "uae", "united arab emirates"],
+    "france": ["프랑스", "france"],
+    "spain": ["스페인", "spain"],
+    "italy": ["이탈리아", "italy"],
+    "turkey": ["튀르키예", "터키", "turkey", "türkiye"],
+    "canada": ["캐나다", "canada"],
+    "australia": ["호주", "australia"],
+    "mexico": ["멕시코", "mexico"],
+    "korea": ["한국", "대한민국", "korea", "south korea"],
+}
+_ALIAS_TO_COUNTRY = {
+    re.sub(r"\s+", "", alias.lower()): key
+    for key, aliases in COUNTRY_ALIASES.items() for alias in aliases
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+|[가-힣]+")
+
+
+def normalize_country(country):
+    """국가명 -> 정규 키 (별칭에 없으면 공백 제거 소문자)"""
+    norm = re.sub(r"\s+", "", str(country).lower())
+    return _ALIAS_TO_COUNTRY.get(norm, norm)
+
+
+def tokenize(text):
+    """영문/숫자는 단어, 한글은 2-gram (1글자 단어는 그대로)"""
+    tokens = []
+    for word in _TOKEN_RE.findall(str(text).lower()):
+        if word[0] >= "가":
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        elif len(word) > 1:
+            tokens.append(word)
+    return tokens
+
+
+def _to_buyer(row):
+    """디렉터리 행 -> 화면/오퍼 생성용 바이어 dict"""
+    return {
+        "id": row["id"], "Name": row["Name"], "Business": row["Business"],
+        "Founded": row["Founded"], "Revenue": row["Capital"] or "N/A", "Profit": "N/A",
+        "Desc": row["Description"], "Email": row["Email"], "Country": row["Country"],
+    }
+
+
+class BuyerDirectory:
+    """바이어 디렉터리 + 국가/업종/키워드 역색인 + TF-IDF 랭킹"""
+
+    COLUMNS = ["Country", "Name", "Business", "Capital", "Description", "Email"]
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = self._prepare(df).iloc[0:0]
+        self.by_country = {}
+        self.by_business = {}
+        self.postings = {}              # 단어 -> (행 번호 배열, 가중치 배열)
+        self.doc_norm = np.empty(0, dtype=np.float32)
+        self.add_buyers(df)
+
+    @classmethod
+    def _prepare(cls, df):
+        df = df.copy()
+        df.columns = df.columns.str.strip()
+        for col in cls.COLUMNS:
+            if col not in df.columns:
+                df[col] = ""
+        df[cls.COLUMNS] = df[cls.COLUMNS].fillna("").astype(str)
+        if "Founded" not in df.columns:
+            df["Founded"] = ""
+        return df
+
+    def __len__(self):
+        return len(self.df)
+
+    def add_buyers(self, df: pd.DataFrame):
+        """바이어 추가 (색인/문서 벡터 증분 갱신)"""
+        new = self._prepare(df)
+        start = len(self.df)
+        positions = np.arange(start, start + len(new), dtype=np.int64)
+        self.df = pd.concat([self.df, new], ignore_index=True) if start else new.reset_index(drop=True)
+
+        for index, keys in ((self.by_country, new["Country"].map(normalize_country)),
+                            (self.by_business, new["Business"].str.strip().str.lower())):
+            for key, rows in pd.Series(positions, index=keys.values).groupby(level=0):
+                index[key] = np.concatenate([index.get(key, np.empty(0, dtype=np.int64)), rows.values])
+
+        # 문서 벡터: 단어별 (1 + log tf), 길이 정규화는 가중치 제곱합의 제곱근
+        new_postings = {}
+        norms = np.ones(len(new), dtype=np.float32)
+        texts = (new["Business"] + " " + new["Description"]).tolist()
+        for i, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            if not counts:
+                continue
+            weights = {t: 1.0 + math.log(c) for t, c in counts.items()}
+            norms[i] = math.sqrt(sum(w * w for w in weights.values()))
+            doc_id = start + i
+            for term, w in weights.items():
+                ids, ws = new_postings.setdefault(term, ([], []))
+                ids.append(doc_id)
+                ws.append(w)
+
+        for term, (ids, ws) in new_postings.items():
+            ids, ws = np.asarray(ids, dtype=np.int64), np.asarray(ws, dtype=np.float32)
+            if term in self.postings:
+                old_ids, old_ws = self.postings[term]
+                ids, ws = np.concatenate([old_ids, ids]), np.concatenate([old_ws, ws])
+            self.postings[term] = (ids, ws)
+        self.doc_norm = np.concatenate([self.doc_norm, norms])
+        return len(new)
+
+    def candidates(self, country=None, business=None):
+        """국가/업종 필터에 해당하는 행 번호 (필터 없으면 전체)"""
+        ids = None
+        if country:
+            ids = self.by_country.get(normalize_country(country), np.empty(0, dtype=np.int64))
+        if business:
+            b_ids = self.by_business.get(business.strip().lower(), np.empty(0, dtype=np.int64))
+            ids = b_ids if ids is None else np.intersect1d(ids, b_ids, assume_unique=True)
+        return np.arange(len(self.df)) if ids is None else ids
+
+    def score(self, product, ids):
+        """후보 행별 품목 TF-IDF 유사도 (질의 단어의 posting만 순회, 전체 벡터 연산)"""
+        n_docs = len(self.df)
+        scores = np.zeros(n_docs, dtype=np.float32)
+        for term, q_tf in Counter(tokenize(product)).items():
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            doc_ids, weights = posting
+            idf = math.log((n_docs + 1) / (len(doc_ids) + 1)) + 1.0
+            scores[doc_ids] += weights * ((1.0 + math.log(q_tf)) * idf * idf)
+        return scores[ids] / self.doc_norm[ids]
+
+    def search(self, product, country=None, business=None, offset=0, limit=20):
+        """
+        품목/국가 기준 바이어 검색 (관련도 순, 동점은 디렉터리 순서)
+
+        Returns:
+            tuple: (바이어 dict 리스트 - "Score" 포함, 전체 후보 수)
+        """
+        ids = self.candidates(country, business)
+        total = len(ids)
+        if total == 0 or offset >= total:
+            return [], total
+
+        scores = self.score(product, ids)
+        end = min(offset + limit, total)
+        # 필요한 범위까지만 부분 정렬 (전체 정렬 없이 top-k)
+        if end < total:
+            top = np.argpartition(-scores, end - 1)[:end]
+        else:
+            top = np.arange(total)
+        order = top[np.lexsort((ids[top], -scores[top]))][offset:end]
+
+        rows = self.df.iloc[ids[order]].to_dict("records")
+        return [{**_to_buyer(r), "Score": round(float(sc), 3)} for r, sc in zip(rows, scores[order])], total
+
+
+def load_buyer_directory(path=BUYERS_FILE):
+    if not os.path.exists(path):
+        return BuyerDirectory(pd.DataFrame(columns=["id", "Country", "Name", "Business", "Founded", "Capital", "Description", "Email"]))
+    return BuyerDirectory(pd.read_csv(path))
+
+
+@st.cache_resource
+def get_buyer_directory():
+    """세션 간 공유되는 바이어 디렉터리 (최초 1회 로드/색인)"""
+    return load_buyer_directory()
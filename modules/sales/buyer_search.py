@@ -2,12 +2,17 @@
 바이어 검색 및 생성 모듈
 - 국가별 회사 스타일 정보 제공
 - 더미 바이어 데이터 생성
-- 실제 DB 및 더미 데이터 혼합 조회
+- 바이어 디렉터리 검색 (부족할 때만 더미 데이터로 보충)
 """
 
-import os
 import random
-import pandas as pd
+import uuid
+
+from modules.sales.buyer_directory import get_buyer_directory
+
+BUYER_PAGE_SIZE = 50
+MIN_BUYERS = 10
+DUMMY_BATCH = 5
 
 
 def get_country_style(country_name):
@@ -76,43 +81,17 @@ def generate_dummy_buyer(product, country, buyer_id=100):
     }
 
 
-def fetch_buyer_list(product, country):
-    """제품과 국가에 맞는 바이어 리스트 반환 (실제 DB + 더미 데이터)"""
-    results = []
-    norm_p = product.replace(" ", "").lower()
-    norm_c = country.replace(" ", "").lower()
-
-    target_keywords = ["건강", "기능", "보조", "식품", "샘물", "생수", "물", "음료",
-                       "자양", "수액", "비타민", "홍삼", "마시는", "화장품"]
-    is_mongol = "몽골" in norm_c or "mongol" in norm_c
-    is_target_prod = any(k in norm_p for k in target_keywords)
-
-    # 몽골 + 건강식품이면 실제 DB 로드
-    if is_mongol and is_target_prod:
-        try:
-            # 경로 설정
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            root_dir = os.path.dirname(os.path.dirname(current_dir))
-            buyers_file = os.path.join(root_dir, "data", "sales", "global_buyers.csv")
-
-            df = pd.read_csv(buyers_file)
-            df.columns = df.columns.str.strip()
-            for _, row in df.iterrows():
-                results.append({
-                    "id": row['id'], "Name": row['Name'], "Business": row['Business'],
-                    "Founded": row['Founded'], "Revenue": row.get('Capital', 'N/A'), "Profit": "N/A",
-                    "Desc": row['Description'], "Email": row['Email'], "Country": row['Country']
-                })
-        except:
-            pass
-
-    # 부족하면 더미 생성
-    current_count = len(results)
-    needed = 10 - current_count
+def fetch_buyer_list(product, country, offset=0, limit=BUYER_PAGE_SIZE):
+    """
+    제품과 국가에 맞는 바이어 리스트 반환 (바이어 디렉터리 색인 검색 + 더미 데이터)
+    - offset/limit: 관련도 순 결과의 페이지 범위 ("추가 검색" 시 다음 페이지)
+    - 디렉터리 결과가 부족할 때만 더미 바이어로 보충
+    """
+    results, _ = get_buyer_directory().search(product, country, offset=offset, limit=limit)
 
-    if needed > 0:
-        start_id = current_count + 100
-        for i in range(needed):
-            results.append(generate_dummy_buyer(product, country, start_id + i))
+    # 부족하면 더미 생성 (첫 조회는 최소 MIN_BUYERS개, 추가 검색은 DUMMY_BATCH개)
+    needed = (MIN_BUYERS - len(results)) if offset == 0 else (DUMMY_BATCH if not results else 0)
+    for _ in range(max(needed, 0)):
+        results.append(generate_dummy_buyer(product, country, f"D{uuid.uuid4().hex[:8]}"))
 
     return results
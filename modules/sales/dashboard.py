@@ -1,17 +1,21 @@
 """
 실시간 대시보드 데이터 조회 모듈
-- 환율 조회 (ExchangeRate-API + yfinance)
-- 뉴스 조회 (NewsAPI + 한글 번역)
-- 캔들스틱 차트 생성
+- 환율 조회 (ExchangeRate-API + yfinance 일봉 로컬 저장소)
+- 뉴스 조회 (NewsAPI + 한글 번역, 헤드라인 일괄 번역 + 번역 메모리 캐시)
+- 소스별 동시 조회 + 공유 캐시 (만료 시 이전 데이터 반환 후 백그라운드 갱신)
+- 캔들스틱 차트 생성 (배열 연산 + 시리즈/버전/기간 단위 Figure 캐시)
 """
 
 import os
 import sys
+import time
+import threading
 from datetime import date
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-import yfinance as yf
 import requests
 from deep_translator import GoogleTranslator
 
@@ -22,9 +26,32 @@ if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
 from config import get_env
+from modules.sales.translation_memory import get_translation_memory
+from modules.sales.market_series import get_market_store
 
 
-def fetch_exchange_rate():
+DASHBOARD_TTL = 600
+# 실패/지연된 소스가 있으면 TTL 대신 이 간격 후 다시 시도
+FAILURE_RETRY = 30
+# 캐시가 비어 있을 때(서버 기동 직후) 첫 페이지가 기다리는 최대 시간
+COLD_START_WAIT = 1.5
+# 소스별 응답 대기 한도 (초과 시 이전 값 유지)
+SOURCE_TIMEOUTS = {
+    "exchange_rate": 5,
+    "exchange_history": 10,
+    "oil_history": 10,
+    "news": 10,
+}
+
+
+# 헤드라인 번역 (번역 메모리 언어 키 / 1회 요청 최대 글자 수 / 장애 시 재시도 간격)
+HEADLINE_LANGUAGE = "ko:headline"
+HEADLINE_CHUNK_CHARS = 4500
+TRANSLATOR_COOLDOWN = 300
+_translator_down_until = 0.0
+
+
+def fetch_exchange_rate(timeout=5):
     """ExchangeRate-API를 통해 실시간 환율 가져오기"""
     api_key = get_env("EXCHANGE_RATE_KEY")
 
@@ -33,7 +60,7 @@ def fetch_exchange_rate():
 
     try:
         url = f"https://v6.exchangerate-api.com/v6/{api_key}/latest/USD"
-        response = requests.get(url, timeout=5)
+        response = requests.get(url, timeout=timeout)
         data = response.json()
 
         if data.get('result') == 'success':
@@ -45,8 +72,65 @@ def fetch_exchange_rate():
         return None, str(e)
 
 
-@st.cache_data(ttl=600)
-def fetch_news():
+def fetch_price_history(symbol, timeout=10, window="1M"):
+    """일봉 히스토리 (로컬 저장소에서 조회, 부족한 끝부분만 다운로드 / 데이터 없으면 None)"""
+    hist = get_market_store().series(symbol, window, timeout=timeout)
+    return None if hist.empty else hist
+
+
+def _request_translations(titles, translator):
+    """제목 여러 개를 줄바꿈으로 묶어 한 번에 번역 (요청 길이 한도 단위로 분할)"""
+    chunks, current, size = [], [], 0
+    for title in titles:
+        if current and size + len(title) + 1 > HEADLINE_CHUNK_CHARS:
+            chunks.append(current)
+            current, size = [], 0
+        current.append(title)
+        size += len(title) + 1
+    if current:
+        chunks.append(current)
+
+    translated = {}
+    for chunk in chunks:
+        lines = [line.strip() for line in (translator.translate("\n".join(chunk)) or "").split("\n")]
+        lines = [line for line in lines if line]
+        # 줄 수가 어긋나면 어느 제목의 번역인지 알 수 없으므로 해당 묶음은 원문 유지
+        if len(lines) == len(chunk):
+            translated.update(zip(chunk, lines))
+    return translated
+
+
+def translate_headlines(titles, memory=None, translator=None):
+    """
+    영문 헤드라인 -> 한글 (입력 순서 유지)
+    - 번역 메모리(영문 제목 해시 기준)에 있으면 재요청하지 않음
+    - 미스만 한 번의 요청으로 번역, 실패하면 원문 반환 후 잠시 번역기 호출 중단
+    """
+    global _translator_down_until
+    titles = [" ".join(str(t).split()) for t in titles]
+    memory = memory or get_translation_memory()
+    try:
+        cached = memory.get_many(titles, HEADLINE_LANGUAGE)
+    except Exception as e:
+        print(f"헤드라인 번역 캐시 조회 실패: {e}")
+        cached = {}
+
+    missing = [t for t in dict.fromkeys(titles) if t not in cached]
+    if missing and time.time() >= _translator_down_until:
+        try:
+            translated = _request_translations(missing, translator or GoogleTranslator(source='en', target='ko'))
+            if translated:
+                memory.put_many(translated, HEADLINE_LANGUAGE)
+            cached.update(translated)
+        except Exception as e:
+            # 번역기 장애 시 같은 지연이 반복되지 않도록 일정 시간 원문만 사용
+            _translator_down_until = time.time() + TRANSLATOR_COOLDOWN
+            print(f"헤드라인 번역 실패 (원문 사용): {e}")
+
+    return [cached.get(t, t) for t in titles]
+
+
+def fetch_news(timeout=5):
     """NewsAPI를 통해 실시간 무역/금융 뉴스 가져오기 (한글 번역)"""
     api_key = get_env("NEWS_API_KEY")
 
@@ -70,89 +154,184 @@ def fetch_news():
             "pageSize": 5
         }
 
-        response = requests.get(url, params=params, timeout=5)
+        response = requests.get(url, params=params, timeout=timeout)
         data = response.json()
 
         if data.get('status') == 'ok':
-            articles = []
-            translator = GoogleTranslator(source='en', target='ko')
-
-            for article in data.get('articles', [])[:5]:
-                title_en = article.get('title', 'No title')
-
-                # 영문 제목을 한글로 번역
-                try:
-                    title_ko = translator.translate(title_en)
-                except:
-                    title_ko = title_en  # 번역 실패시 원문 사용
-
-                articles.append({
-                    "title": title_ko,
-                    "source": article.get('source', {}).get('name', 'Unknown'),
-                    "date": article.get('publishedAt', '')[:10],
-                    "url": article.get('url', '#')
-                })
-            return articles
+            raw_articles = data.get('articles', [])[:5]
+            # 영문 제목을 한글로 번역 (캐시 우선, 미스만 1회 요청)
+            titles_ko = translate_headlines([a.get('title') or 'No title' for a in raw_articles])
+
+            return [{
+                "title": title_ko,
+                "source": article.get('source', {}).get('name', 'Unknown'),
+                "date": article.get('publishedAt', '')[:10],
+                "url": article.get('url', '#')
+            } for article, title_ko in zip(raw_articles, titles_ko)]
         else:
             return []
     except Exception as e:
-        st.warning(f"뉴스 로딩 실패: {e}")
+        # 백그라운드 스레드에서 실행되므로 화면 대신 로그로 남김
+        print(f"뉴스 로딩 실패: {e}")
         return []
 
 
-@st.cache_data(ttl=600)
-def fetch_dashboard_data():
-    """대시보드용 모든 데이터 통합 조회"""
+def default_sources():
+    """소스 이름 -> 조회 함수(timeout 인자) (실패 시 None 반환 또는 예외)"""
+    return {
+        "exchange_rate": lambda timeout: fetch_exchange_rate(timeout)[0],
+        "exchange_history": lambda timeout: fetch_price_history("KRW=X", timeout),
+        "oil_history": lambda timeout: fetch_price_history("CL=F", timeout),
+        "news": fetch_news,
+    }
+
+
+def _apply_history(section, hist):
+    section["history"] = hist
+    section["current"] = hist['Close'].iloc[-1]
+    if len(hist) > 1:
+        section["change"] = hist['Close'].iloc[-1] - hist['Close'].iloc[-2]
+        section["change_pct"] = (section["change"] / hist['Close'].iloc[-2]) * 100
+
+
+def build_dashboard_data(results: dict):
+    """소스별 조회 결과 -> 대시보드 데이터 (없는 소스는 기본값)"""
     data = {
         "exchange": {"current": 1460.1, "history": pd.DataFrame(), "change": 0, "change_pct": 0},
         "oil": {"current": 61.52, "history": pd.DataFrame(), "change": 0, "change_pct": 0},
         "news": []
     }
 
-    # 1. 환율 (ExchangeRate-API 우선, yfinance 백업)
-    rate, status = fetch_exchange_rate()
-    if rate:
-        data["exchange"]["current"] = rate
-
-    # yfinance로 환율 히스토리 가져오기
-    try:
-        ex_ticker = yf.Ticker("KRW=X")
-        ex_hist = ex_ticker.history(period="1mo")
-        if not ex_hist.empty:
-            data["exchange"]["history"] = ex_hist
-            data["exchange"]["current"] = ex_hist['Close'].iloc[-1]
-            if len(ex_hist) > 1:
-                data["exchange"]["change"] = ex_hist['Close'].iloc[-1] - ex_hist['Close'].iloc[-2]
-                data["exchange"]["change_pct"] = (data["exchange"]["change"] / ex_hist['Close'].iloc[-2]) * 100
-    except:
-        pass
+    # 1. 환율 (ExchangeRate-API 우선, yfinance 히스토리가 있으면 종가 사용)
+    if results.get("exchange_rate"):
+        data["exchange"]["current"] = results["exchange_rate"]
+    if results.get("exchange_history") is not None:
+        _apply_history(data["exchange"], results["exchange_history"])
 
     # 2. 유가 (yfinance)
-    try:
-        oil_ticker = yf.Ticker("CL=F")
-        oil_hist = oil_ticker.history(period="1mo")
-        if not oil_hist.empty:
-            data["oil"]["history"] = oil_hist
-            data["oil"]["current"] = oil_hist['Close'].iloc[-1]
-            if len(oil_hist) > 1:
-                data["oil"]["change"] = oil_hist['Close'].iloc[-1] - oil_hist['Close'].iloc[-2]
-                data["oil"]["change_pct"] = (data["oil"]["change"] / oil_hist['Close'].iloc[-2]) * 100
-    except:
-        pass
+    if results.get("oil_history") is not None:
+        _apply_history(data["oil"], results["oil_history"])
 
     # 3. 뉴스
-    data["news"] = fetch_news()
+    data["news"] = results.get("news") or []
 
     return data
 
 
-def draw_candlestick_chart(df):
-    """전통적인 캔들스틱 차트 (상승=빨강, 하락=파랑)"""
+class DashboardFeed:
+    """
+    대시보드 데이터 공유 캐시 (stale-while-revalidate)
+    - 소스별로 스레드 풀에서 동시에 조회, 소스마다 개별 timeout
+    - TTL이 지나면 이전 데이터를 그대로 반환하고 백그라운드에서 갱신
+    - 실패/지연된 소스는 마지막 성공 값을 유지하고 FAILURE_RETRY 후 다시 시도
+    """
+
+    def __init__(self, sources=None, ttl=DASHBOARD_TTL, timeouts=None, retry=FAILURE_RETRY):
+        self.sources = sources or default_sources()
+        self.timeouts = {**SOURCE_TIMEOUTS, **(timeouts or {})}
+        self.ttl = ttl
+        self.retry = retry
+        self.results = {}
+        self.refreshed_at = None     # 마지막으로 1개 이상 소스가 성공한 시각
+        self.next_refresh_at = 0.0
+        self._data = build_dashboard_data({})
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+        self._inflight = {}
+        self._executor = ThreadPoolExecutor(max_workers=len(self.sources), thread_name_prefix="dashboard")
+
+    @property
+    def is_stale(self):
+        return time.time() >= self.next_refresh_at
+
+    def get(self, max_wait=COLD_START_WAIT):
+        """현재 데이터 (만료 시 백그라운드 갱신, 캐시가 비었을 때만 최대 max_wait초 대기)"""
+        with self._lock:
+            thread = self._start_refresh() if self.is_stale else None
+            cold = not self.results
+        if cold and thread is not None:
+            thread.join(max_wait)
+        with self._lock:
+            return self._data
+
+    def _start_refresh(self):
+        if self._refresh_thread is None or not self._refresh_thread.is_alive():
+            self._refresh_thread = threading.Thread(target=self.refresh, daemon=True)
+            self._refresh_thread.start()
+        return self._refresh_thread
+
+    def _store(self, name, future):
+        """소스 1개 완료 시 즉시 반영 (늦게 도착한 결과도 반영)"""
+        try:
+            value = future.result()
+        except Exception as e:
+            print(f"대시보드 데이터 조회 실패 ({name}): {e}")
+            return
+        if value is None:
+            return
+        with self._lock:
+            self.results[name] = value
+            self._data = build_dashboard_data(self.results)
+
+    def refresh(self):
+        """모든 소스를 동시에 조회 (각 소스의 timeout까지만 대기)"""
+        started = time.time()
+        futures = {}
+        for name, fetch in self.sources.items():
+            # 이전 조회가 아직 끝나지 않은 소스는 중복 요청하지 않음
+            pending = self._inflight.get(name)
+            if pending is not None and not pending.done():
+                futures[name] = pending
+                continue
+            future = self._executor.submit(fetch, self.timeouts.get(name, 10))
+            future.add_done_callback(lambda f, name=name: self._store(name, f))
+            futures[name] = self._inflight[name] = future
+
+        succeeded = 0
+        for name, future in futures.items():
+            remaining = started + self.timeouts.get(name, 10) - time.time()
+            try:
+                if future.exception(timeout=max(remaining, 0)) is None and future.result() is not None:
+                    succeeded += 1
+            except FuturesTimeout:
+                print(f"대시보드 데이터 조회 지연 ({name}): 이전 값 유지")
+
+        # 전부 성공했을 때만 TTL 동안 유지, 하나라도 실패/지연이면 짧은 간격 후 재시도
+        now = time.time()
+        with self._lock:
+            if succeeded:
+                self.refreshed_at = now
+            self.next_refresh_at = now + (self.ttl if succeeded == len(futures) else self.retry)
+
+
+@st.cache_resource
+def get_dashboard_feed():
+    """세션 간 공유되는 대시보드 데이터 캐시"""
+    return DashboardFeed()
+
+
+def fetch_dashboard_data():
+    """대시보드용 모든 데이터 통합 조회 (업스트림 지연과 무관하게 즉시 반환)"""
+    return get_dashboard_feed().get()
+
+
+def _wick_xy(x, low, high):
+    """심지 선분을 None으로 구분한 단일 좌표열 (x, x, None, ...)"""
+    n = len(x)
+    xs = np.empty(n * 3, dtype=object)
+    ys = np.empty(n * 3, dtype=object)
+    xs[0::3], xs[1::3], xs[2::3] = x, x, None
+    ys[0::3], ys[1::3], ys[2::3] = low, high, None
+    return xs, ys
+
+
+def draw_candlestick_chart(df, window=30):
+    """전통적인 캔들스틱 차트 (상승=빨강, 하락=파랑, 봉 계산은 배열 연산)"""
     if df is None or df.empty:
         return go.Figure()
 
     # 최근 30일 데이터 사용 (14일 → 30일로 증가)
-    df_recent = df.tail(30) if len(df) > 30 else df
+    df_recent = df.tail(window) if len(df) > window else df
 
     # OHLC 데이터가 있는지 확인
     has_ohlc = all(col in df_recent.columns for col in ['Open', 'High', 'Low', 'Close'])
@@ -170,52 +349,51 @@ def draw_candlestick_chart(df):
     y_range = y_max - y_min
     y_padding = y_range * 0.15
 
-    fig = go.Figure()
+    x = df_recent.index
+    open_, high, low, close = (df_recent[col].to_numpy(dtype=float) for col in ['Open', 'High', 'Low', 'Close'])
+
+    # 상승/하락 판단
+    is_up = close >= open_
+    colors = np.where(is_up, '#EF4444', '#3B82F6')  # 빨강/파랑
 
-    # 각 캔들 그리기
-    for i, idx in enumerate(df_recent.index):
-        row = df_recent.loc[idx]
+    # 몸통 (Open-Close 박스), 너무 작으면 최소 높이 설정
+    body_y = np.minimum(open_, close)
+    body_height = np.maximum(np.abs(close - open_), y_range * 0.002)
 
-        # 상승/하락 판단
-        is_up = row['Close'] >= row['Open']
-        candle_color = '#EF4444' if is_up else '#3B82F6'  # 빨강/파랑
-        fill_opacity = 0.9
+    # 캔들 너비 계산 (시간 간격에 따라 자동 조정)
+    if len(df_recent) > 1:
+        time_diff = (x[1] - x[0]).total_seconds() / 3600 / 24
+        candle_width = pd.Timedelta(days=time_diff * 0.4)  # 0.6 → 0.4로 줄임
+    else:
+        candle_width = pd.Timedelta(hours=8)  # 12 → 8로 줄임
 
-        # 1. 심지 (High-Low 선)
+    fig = go.Figure()
+
+    # 1. 심지 (High-Low 선) - 색상별 트레이스 1개
+    for mask, color in ((is_up, '#EF4444'), (~is_up, '#3B82F6')):
+        if not mask.any():
+            continue
+        wick_x, wick_y = _wick_xy(x[mask], low[mask], high[mask])
         fig.add_trace(go.Scatter(
-            x=[idx, idx],
-            y=[row['Low'], row['High']],
+            x=wick_x,
+            y=wick_y,
             mode='lines',
-            line=dict(color=candle_color, width=1.5),
+            line=dict(color=color, width=1.5),
             showlegend=False,
             hoverinfo='skip'
         ))
 
-        # 2. 몸통 (Open-Close 박스)
-        body_height = abs(row['Close'] - row['Open'])
-        body_y = min(row['Open'], row['Close'])
-
-        # 몸통이 너무 작으면 최소 높이 설정
-        if body_height < y_range * 0.002:
-            body_height = y_range * 0.002
-
-        # 캔들 너비 계산 (시간 간격에 따라 자동 조정)
-        if len(df_recent) > 1:
-            time_diff = (df_recent.index[1] - df_recent.index[0]).total_seconds() / 3600 / 24
-            candle_width = pd.Timedelta(days=time_diff * 0.4)  # 0.6 → 0.4로 줄임
-        else:
-            candle_width = pd.Timedelta(hours=8)  # 12 → 8로 줄임
-
-        fig.add_shape(
-            type="rect",
-            x0=idx - candle_width,
-            x1=idx + candle_width,
-            y0=body_y,
-            y1=body_y + body_height,
-            fillcolor=candle_color,
-            line=dict(color=candle_color, width=1),
-            opacity=fill_opacity
-        )
+    # 2. 몸통 - 막대 트레이스 1개 (base부터 높이만큼)
+    fig.add_trace(go.Bar(
+        x=x,
+        y=body_height,
+        base=body_y,
+        width=candle_width.total_seconds() * 2 * 1000,  # 날짜 축 막대 너비 단위는 ms
+        marker=dict(color=colors, line=dict(color=colors, width=1)),
+        opacity=0.9,
+        showlegend=False,
+        hoverinfo='skip'
+    ))
 
     # 호버 정보를 위한 투명 포인트
     fig.add_trace(go.Scatter(
@@ -286,6 +464,27 @@ def draw_candlestick_chart(df):
     return fig
 
 
+def candlestick_chart(df, window=30):
+    """
+    캔들스틱 차트 (그려 둔 Figure의 사본 반환)
+    - 키: (시리즈, 데이터 버전, 기간) -> 새 봉이 들어와 버전이 바뀔 때만 다시 그림
+    - 시계열 저장소 데이터가 아니면 내용 해시를 버전으로 사용
+    """
+    if df is None or df.empty:
+        return go.Figure()
+    symbol = df.attrs.get("symbol", "")
+    version = df.attrs.get("version")
+    if version is None:
+        version = int(pd.util.hash_pandas_object(df, index=True).sum())
+    return _cached_candlestick(symbol, version, window, df)
+
+
+# cache_data는 호출마다 역직렬화한 사본을 돌려줌 -> 한 세션이 Figure를 수정해도 다른 세션에 영향 없음
+@st.cache_data(max_entries=16, show_spinner=False)
+def _cached_candlestick(symbol, version, window, _df):
+    return draw_candlestick_chart(_df, window)
+
+
 def generate_analysis(data_type, change_pct):
     """변화율에 따른 분석 코멘트"""
     if data_type == "exchange":
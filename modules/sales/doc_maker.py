@@ -1,51 +1,76 @@
 # modules/sales/doc_maker.py
 
 import io
+import re
+import json
+import zipfile
+from functools import lru_cache
+from xml.sax.saxutils import escape
 from docx import Document
 from docx.shared import Pt, Cm, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.enum.table import WD_TABLE_ALIGNMENT
 from docx.oxml.ns import nsdecls
 from docx.oxml import parse_xml
+from docx.oxml.ns import qn
+from docx.opc.oxml import serialize_part_xml
 
 # [Helper] 테이블 셀 배경색 지정 함수
 def set_cell_shading(cell, color):
     shading = parse_xml(f'<w:shd {nsdecls("w")} w:fill="{color}" w:val="clear"/>')
     cell._tc.get_or_add_tcPr().append(shading)
 
+# 기본 영어 라벨
+DEFAULT_LABELS = {
+    "offer_sheet": "OFFER SHEET",
+    "messrs": "Messrs:",
+    "offer_no": "Offer No.:",
+    "date": "Date:",
+    "origin": "Origin",
+    "shipment": "Shipment",
+    "loading_port": "Loading Port",
+    "destination": "Destination",
+    "payment": "Payment",
+    "packing": "Packing",
+    "insurance": "Insurance",
+    "validity": "Validity",
+    "no": "No.",
+    "description_of_goods": "Description of Goods",
+    "quantity": "Qty",
+    "unit_price": "Unit Price",
+    "amount": "Amount",
+    "total_amount": "TOTAL AMOUNT (FOB/CIF/CFR):",
+    "dispute_resolution": "Dispute Resolution",
+    "method": "Method:",
+    "governing_law": "Governing Law:",
+    "accepted_by_buyer": "ACCEPTED BY (Buyer) :",
+    "yours_faithfully": "Yours Faithfully,",
+    "authorized_signature": "Authorized Signature"
+}
+
+
 def create_offer_sheet(form_data: dict, items: list, signature_img=None, labels: dict = None) -> io.BytesIO:
-    """전문 오퍼시트 양식 생성 (다국어 지원)"""
-    
-    # 기본 영어 라벨
+    """
+    전문 오퍼시트 양식 생성 (다국어 지원)
+    - 서명 이미지가 없으면 라벨별로 컴파일된 템플릿에 값만 채움 (python-docx 결과와 동일한 XML)
+    - 서명 이미지가 있으면 python-docx로 직접 생성
+    """
     if labels is None:
-        labels = {
-            "offer_sheet": "OFFER SHEET",
-            "messrs": "Messrs:",
-            "offer_no": "Offer No.:",
-            "date": "Date:",
-            "origin": "Origin",
-            "shipment": "Shipment",
-            "loading_port": "Loading Port",
-            "destination": "Destination",
-            "payment": "Payment",
-            "packing": "Packing",
-            "insurance": "Insurance",
-            "validity": "Validity",
-            "no": "No.",
-            "description_of_goods": "Description of Goods",
-            "quantity": "Qty",
-            "unit_price": "Unit Price",
-            "amount": "Amount",
-            "total_amount": "TOTAL AMOUNT (FOB/CIF/CFR):",
-            "dispute_resolution": "Dispute Resolution",
-            "method": "Method:",
-            "dispute_resolution": "Dispute Resolution",
-            "governing_law": "Governing Law:",
-            "accepted_by_buyer": "ACCEPTED BY (Buyer) :",
-            "yours_faithfully": "Yours Faithfully,",
-            "authorized_signature": "Authorized Signature"
-        }
-    
+        labels = DEFAULT_LABELS
+    form_data, items = _prepare_values(form_data, items)
+
+    if signature_img is None:
+        return _compiled_template(_labels_key(labels)).render(form_data, items)
+
+    doc = _build_document(form_data, items, signature_img, labels)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def _build_document(form_data: dict, items: list, signature_img, labels: dict) -> Document:
+    """python-docx로 오퍼시트 문서 객체 생성 (템플릿 컴파일에도 사용)"""
     doc = Document()
     
     # 1. 페이지 설정 (A4)
@@ -216,8 +241,181 @@ def create_offer_sheet(form_data: dict, items: list, signature_img=None, labels:
             p_sign.add_run("__________________________\n" + labels["authorized_signature"])
     else:
         p_sign.add_run("__________________________\n" + labels["authorized_signature"])
-    
-    buffer = io.BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
-    return buffer
\ No newline at end of file
+
+    return doc
+
+# ═══════════════════════════════════════════════════════════════
+#  컴파일된 템플릿 (라벨 세트별 1회 생성, 이후 XML 문자열에 값만 채움)
+# ═══════════════════════════════════════════════════════════════
+
+# 레이아웃/스타일을 바꾸면 올릴 것 (artifact_cache 키에 포함)
+TEMPLATE_VERSION = 2
+
+# 결과 파일이 생성 시각과 무관하게 동일하도록 ZIP 항목 시각 고정
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+DOCUMENT_PART = "word/document.xml"
+
+_PLACEHOLDER = re.compile(r"\{\{([\w.]+)#(\d+)\}\}")
+_MARKER = "\ue000{}\ue001"  # 사용자 입력과 겹치지 않는 사설 영역 문자
+# lxml(python-docx)이 거부하는 문자 (탭/줄바꿈 제외 제어문자, 서로게이트, U+FFFE/U+FFFF)
+_XML_INVALID = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+
+def _prepare_values(form_data: dict, items: list):
+    """입력값 정리 (None -> 빈 칸, 숫자 -> 문자열), XML에 넣을 수 없는 문자는 python-docx와 같은 ValueError"""
+    def clean(record):
+        values = {}
+        for k, v in record.items():
+            v = "" if v is None else str(v)
+            if _XML_INVALID.search(v):
+                raise ValueError("All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters")
+            values[k] = v
+        return values
+    return clean(form_data), [clean(it) for it in items]
+
+
+class _Placeholders(dict):
+    """get() 호출 시 값 대신 {{키#기본값 번호}} 자리표시자를 돌려주는 컴파일용 입력"""
+
+    def __init__(self, defaults, prefix=""):
+        super().__init__()
+        self.defaults = defaults
+        self.prefix = prefix
+
+    def get(self, key, default=None):
+        # 키가 없을 때 python-docx 경로가 쓰는 기본값 ('Company Name' 등)을 기억해 둠
+        self.defaults.append("" if default is None else str(default))
+        return "{{" + self.prefix + key + "#" + str(len(self.defaults) - 1) + "}}"
+
+
+def _run_content(text):
+    """python-docx의 run.text 설정과 동일한 XML (탭 -> w:tab, 줄바꿈 -> w:br)"""
+    out = []
+    for token in re.split(r"([\t\r\n])", text):
+        if token == "\t":
+            out.append("<w:tab/>")
+        elif token in ("\r", "\n"):
+            out.append("<w:br/>")
+        elif token:
+            space = ' xml:space="preserve"' if len(token.strip()) < len(token) else ""
+            out.append(f"<w:t{space}>{escape(token)}</w:t>")
+    return "".join(out)
+
+
+class _Slot:
+    """자리표시자가 들어간 w:t (또는 w:t 하나뿐인 w:r) 위치"""
+
+    def __init__(self, template, whole_run, defaults):
+        self.template = template
+        self.whole_run = whole_run
+        self.defaults = defaults
+
+    def _fill(self, match, values):
+        key, idx = match.group(1), int(match.group(2))
+        return values[key] if key in values else self.defaults[idx]
+
+    def render(self, values):
+        content = _run_content(_PLACEHOLDER.sub(lambda m: self._fill(m, values), self.template))
+        if not self.whole_run:
+            return content
+        return f"<w:r>{content}</w:r>" if content else "<w:r/>"
+
+
+def _split_slots(xml, slots):
+    """마커 기준으로 XML을 [문자열 | _Slot] 조각 리스트로 분해"""
+    pieces, pos = [], 0
+    for marker, slot in slots:
+        idx = xml.index(marker, pos)
+        pieces.append(xml[pos:idx])
+        pieces.append(slot)
+        pos = idx + len(marker)
+    pieces.append(xml[pos:])
+    return pieces
+
+
+def _render_pieces(pieces, values):
+    return "".join(p if isinstance(p, str) else p.render(values) for p in pieces)
+
+
+class OfferTemplate:
+    """
+    라벨 세트 1개에 대해 컴파일된 오퍼시트 템플릿
+    - 레이아웃/스타일/표는 python-docx로 1회만 생성
+    - 값은 XML 문자열에 이스케이프하여 삽입, 품목 행은 행 템플릿을 복제
+    """
+
+    def __init__(self, labels: dict):
+        defaults = []
+        doc = _build_document(_Placeholders(defaults), [_Placeholders(defaults, "item.")], None, labels)
+
+        # 자리표시자가 있는 w:t를 고유 마커로 치환 (w:r에 w:t만 있으면 w:r 단위로 치환)
+        slots = []
+        for t in doc.element.body.iter(qn("w:t")):
+            if "{{" not in (t.text or ""):
+                continue
+            marker = _MARKER.format(len(slots))
+            run = t.getparent()
+            whole_run = len(run) == 1
+            slots.append((f"<w:r><w:t>{marker}</w:t></w:r>" if whole_run else f"<w:t>{marker}</w:t>",
+                          _Slot(t.text, whole_run, defaults)))
+            t.text = marker
+
+        xml = serialize_part_xml(doc.element).decode("utf-8")
+
+        # 품목 행(w:tr) 분리
+        item_idx = [i for i, (_, slot) in enumerate(slots) if "{{item." in slot.template]
+        row_start = xml.rfind("<w:tr>", 0, xml.index(slots[item_idx[0]][0]))
+        row_end = xml.index("</w:tr>", xml.index(slots[item_idx[-1]][0])) + len("</w:tr>")
+        head_slots = slots[:item_idx[0]]
+        row_slots = slots[item_idx[0]:item_idx[-1] + 1]
+        tail_slots = slots[item_idx[-1] + 1:]
+        self.head = _split_slots(xml[:row_start], head_slots)
+        self.row = _split_slots(xml[row_start:row_end], row_slots)
+        self.tail = _split_slots(xml[row_end:], tail_slots)
+
+        # 문서 본문 외 파트(스타일, 설정 등)는 1회만 압축해 두고 매번 document.xml만 추가
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        static = io.BytesIO()
+        with zipfile.ZipFile(buffer) as src, zipfile.ZipFile(static, "w") as dst:
+            for name in src.namelist():
+                if name != DOCUMENT_PART:
+                    dst.writestr(_zip_info(name), src.read(name))
+        self.static_zip = static.getvalue()
+
+    def render_xml(self, form_data: dict, items: list) -> bytes:
+        """document.xml 생성 (form_data/items는 _prepare_values로 정리된 문자열 값)"""
+        values = dict(form_data)
+        valid_items = [it for it in items if it.get("description")]
+        rows = []
+        for i, item in enumerate(valid_items):
+            row_values = {f"item.{k}": v for k, v in item.items()}
+            row_values["item.no"] = str(item.get("no", i + 1))
+            rows.append(_render_pieces(self.row, row_values))
+        xml = _render_pieces(self.head, values) + "".join(rows) + _render_pieces(self.tail, values)
+        return xml.encode("utf-8")
+
+    def render(self, form_data: dict, items: list) -> io.BytesIO:
+        buffer = io.BytesIO(self.static_zip)
+        with zipfile.ZipFile(buffer, "a") as zf:
+            zf.writestr(_zip_info(DOCUMENT_PART), self.render_xml(form_data, items))
+        buffer.seek(0)
+        return buffer
+
+
+def _zip_info(name):
+    """python-docx와 같은 압축 방식, 시각만 고정한 ZIP 항목"""
+    info = zipfile.ZipInfo(name, date_time=ZIP_DATE_TIME)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = 0o600 << 16
+    return info
+
+
+def _labels_key(labels: dict) -> str:
+    return json.dumps(labels, ensure_ascii=False, sort_keys=True)
+
+
+@lru_cache(maxsize=32)
+def _compiled_template(labels_key: str) -> OfferTemplate:
+    """라벨 세트(언어)별 템플릿 캐시"""
+    return OfferTemplate(json.loads(labels_key))
@@ -0,0 +1,179 @@
+"""
+오퍼시트 라벨 카탈로그
+- 오퍼시트 고정 라벨(약 30개)의 언어별 번역본을 로컬 JSON에 1회 저장
+- 앱 시작 시 로드, 없는 언어만 번역하여 추가 (일괄 warm-up 지원)
+- 번역 요청(translate_offer_shared)에는 라벨을 보내지 않고 동적 값만 전송
+
+일괄 warm-up:
+    python -m modules.sales.label_catalog            # COUNTRIES 전체 언어
+    python -m modules.sales.label_catalog Mongolian Japanese
+"""
+
+import os
+import sys
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import streamlit as st
+
+# 경로 설정
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from config import get_env
+
+CATALOG_PATH = os.path.join(root_dir, "data", "sales", "label_catalog.json")
+
+# 원문(영어) 라벨 - create_offer_sheet(labels=...) 키와 동일
+BASE_LABELS = {
+    "offer_sheet": "OFFER SHEET",
+    "messrs": "Messrs",
+    "offer_no": "Offer No.",
+    "date": "Date",
+    "origin": "Origin",
+    "shipment": "Shipment",
+    "loading_port": "Loading Port",
+    "destination": "Destination",
+    "payment": "Payment",
+    "packing": "Packing",
+    "insurance": "Insurance",
+    "inspection": "Inspection",
+    "validity": "Validity",
+    "no": "No.",
+    "description_of_goods": "Description of Goods",
+    "quantity": "Quantity",
+    "unit_price": "Unit Price",
+    "amount": "Amount",
+    "total_amount": "TOTAL AMOUNT (FOB/CIF/CFR)",
+    "claim": "Claim",
+    "force_majeure": "Force Majeure",
+    "arbitration": "Arbitration",
+    "governing_law": "Governing Law",
+    "accepted_by_buyer": "ACCEPTED BY (Buyer)",
+    "yours_faithfully": "Yours Faithfully",
+    "authorized_signature": "Authorized Signature",
+}
+
+
+class LabelCatalog:
+    """언어별 라벨 번역 저장소 (JSON 파일 기반)"""
+
+    def __init__(self, path=CATALOG_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.catalog = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.catalog, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def _is_complete(self, language):
+        labels = self.catalog.get(language)
+        return bool(labels) and all(k in labels for k in BASE_LABELS)
+
+    def missing(self, languages):
+        return [lang for lang in dict.fromkeys(languages) if lang and not self._is_complete(lang)]
+
+    def get(self, language, translate_missing=True):
+        """
+        언어별 라벨 반환
+        - 영어(None)는 None 반환 -> create_offer_sheet 기본 라벨 사용
+        - 카탈로그에 없으면 1회 번역 후 저장 (translate_missing=False면 None)
+        """
+        if not language:
+            return None
+        if not self._is_complete(language):
+            if not translate_missing:
+                return None
+            self.warm([language])
+        return self.catalog.get(language)
+
+    def warm(self, languages, max_workers=4):
+        """없는 언어만 병렬 번역하여 카탈로그에 추가 (언어당 GPT 1회)"""
+        pending = self.missing(languages)
+        if not pending:
+            return {}
+
+        errors = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(translate_labels, lang): lang for lang in pending}
+            for future in as_completed(futures):
+                lang = futures[future]
+                try:
+                    labels = future.result()
+                    with self._lock:
+                        self.catalog[lang] = labels
+                except Exception as e:
+                    errors[lang] = str(e)
+
+        if len(errors) < len(pending):
+            with self._lock:
+                self._save()
+        return errors
+
+
+def translate_labels(target_language):
+    """BASE_LABELS를 target_language로 번역 (누락 키는 영어 원문 유지)"""
+    api_key = get_env("OPENAI_API_KEY")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY가 설정되지 않았습니다.")
+
+    from openai import OpenAI
+    client = OpenAI(api_key=api_key)
+
+    prompt = f"""Translate the values of the following Offer Sheet labels from English to {target_language}.
+Keep trade terms (FOB, CIF, CFR) in English. Keep the keys unchanged.
+Return ONLY valid JSON with exactly the same keys.
+
+{json.dumps(BASE_LABELS, ensure_ascii=False, indent=2)}
+"""
+    response = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": "You are a professional translator. Return ONLY valid JSON."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.2,
+        response_format={"type": "json_object"},
+    )
+    translated = json.loads(response.choices[0].message.content)
+    return {k: translated.get(k) or v for k, v in BASE_LABELS.items()}
+
+
+@st.cache_resource
+def get_label_catalog():
+    """앱 전체에서 공유되는 라벨 카탈로그 (최초 1회 로드)"""
+    return LabelCatalog()
+
+
+def main(argv=None):
+    from modules.sales.translator import COUNTRIES
+
+    languages = (argv if argv is not None else sys.argv[1:]) or [
+        info["language"] for info in COUNTRIES.values() if info["language"]
+    ]
+    catalog = LabelCatalog()
+    errors = catalog.warm(languages)
+    done = len(languages) - len(errors)
+    print(f"라벨 카탈로그: {done}/{len(languages)}개 언어 준비 완료 → {catalog.path}")
+    for lang, msg in errors.items():
+        print(f"  ⚠️ {lang}: {msg}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
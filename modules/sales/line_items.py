@@ -0,0 +1,139 @@
+"""
+오퍼 품목 계산 엔진
+- 원가/판매가는 1/10,000 USD, 수량은 1/1,000 단위, 금액은 센트 단위 int64 배열로 계산 (부동소수 오차 없음)
+- 입력 문자열 파싱/검증/가격 산출/합계/이익을 품목 수천 개도 한 번의 벡터 연산으로 처리
+- 잘못된 행은 건너뛰지 않고 행 번호와 사유를 errors로 반환 (MAX_LINE_ITEMS 초과 행 포함)
+"""
+
+import numpy as np
+import pandas as pd
+
+PRICE_DIGITS = 4           # 단가 소수 자릿수 (0.0001 USD)
+QTY_DIGITS = 3             # 수량 소수 자릿수
+PRICE_SCALE = 10 ** PRICE_DIGITS
+QTY_SCALE = 10 ** QTY_DIGITS
+# 단가 x 수량 단위 -> 센트
+_TO_CENTS = PRICE_SCALE * QTY_SCALE // 100
+# int64 곱셈이 넘치지 않는 범위
+_MAX_PRODUCT = 2 ** 62
+
+MAX_LINE_ITEMS = 5000
+
+# 금액: 'USD 1,234.50', '$5', '5.125' / 수량: '1,000 PCS', '12.5 MT' (단위는 숫자 없는 접미어만 허용)
+_MONEY_RE = r"^(?:USD|US\$|\$)?\s*(?P<sign>[+-]?)(?P<int>\d*)(?:\.(?P<frac>\d*))?\s*$"
+_QTY_RE = r"^(?P<sign>[+-]?)(?P<int>\d*)(?:\.(?P<frac>\d*))?\s*(?:[^\d.\s][^\d]*)?$"
+
+
+def _as_text(values):
+    return pd.Series(list(values), dtype="object").fillna("").astype(str).str.replace(",", "", regex=False).str.strip()
+
+
+def parse_fixed(values, digits, pattern=_MONEY_RE):
+    """
+    입력 문자열 배열 -> 고정소수점 정수 배열 (소수 digits 자리, 다음 자리에서 반올림)
+
+    Returns:
+        tuple: (정수 배열, 빈 칸 여부, 형식 오류 여부, 음수 여부)
+    """
+    text = _as_text(values)
+    blank = (text == "").to_numpy()
+    parts = text.str.extract(pattern)
+    int_part = parts["int"].fillna("")
+    frac = parts["frac"].fillna("")
+    # 숫자가 하나도 없거나 정수부가 너무 길면 형식 오류
+    invalid = (parts["int"].isna() | ((int_part == "") & (frac == "")) | (int_part.str.len() > 12)).to_numpy() & ~blank
+
+    ok = ~(blank | invalid)
+    whole = pd.to_numeric(int_part.where(ok & (int_part != ""), "0")).to_numpy(dtype=np.int64)
+    kept = pd.to_numeric(frac.str[:digits].str.ljust(digits, "0").where(ok, "0")).to_numpy(dtype=np.int64)
+    round_up = (frac.str[digits:digits + 1] >= "5").to_numpy() & ok
+    units = whole * 10 ** digits + kept + round_up
+
+    negative = ((parts["sign"] == "-").to_numpy() & ok) & (units > 0)
+    units = np.where(ok & ~negative, units, 0)
+    return units, blank, invalid, negative
+
+
+def format_cents(cents):
+    """센트 배열 -> '1,234.56' 문자열 리스트"""
+    return [f"{c // 100:,}.{c % 100:02d}" for c in np.asarray(cents, dtype=np.int64).tolist()]
+
+
+def format_price(units):
+    """단가 배열 -> '1,234.56' (센트 이하 자리가 있으면 최대 4자리까지 표시)"""
+    result = []
+    for u in np.asarray(units, dtype=np.int64).tolist():
+        whole, frac = divmod(u, PRICE_SCALE)
+        frac_text = f"{frac:0{PRICE_DIGITS}d}".rstrip("0").ljust(2, "0")
+        result.append(f"{whole:,}.{frac_text}")
+    return result
+
+
+def price_line_items(descriptions, quantities, costs, margin_rate, unit_prices=None):
+    """
+    품목 일괄 검증/가격 계산
+
+    Args:
+        descriptions, quantities, costs: 품목별 입력값 (같은 길이)
+        margin_rate: 마진율 (0.28 형식)
+        unit_prices: 판매가 직접 입력값 (빈 칸이면 원가 x (1 + 마진율))
+
+    Returns:
+        dict: price_units(단가, 1/10,000 USD), amount_cents, cost_cents, valid(bool), used(입력이 있는 행),
+              errors([(행 번호, 사유)]), total_cost/total_revenue/total_profit(센트), profit_rate(%)
+    """
+    n = len(descriptions)
+    desc = _as_text(descriptions).to_numpy()
+    qty, qty_blank, qty_bad, qty_neg = parse_fixed(quantities, QTY_DIGITS, _QTY_RE)
+    cost, cost_blank, cost_bad, cost_neg = parse_fixed(costs, PRICE_DIGITS)
+    if unit_prices is None:
+        unit_prices = [""] * n
+    manual, manual_blank, manual_bad, manual_neg = parse_fixed(unit_prices, PRICE_DIGITS)
+
+    # 판매가 = 원가 x (1 + 마진율), 마진율은 0.01%(bp) 단위 정수로 계산
+    rate_bp = int(round(float(margin_rate) * 10000))
+    auto = (cost * (10000 + rate_bp) + 5000) // 10000
+    price = np.where(manual_blank, auto, manual)
+
+    used = ~((desc == "") & qty_blank & cost_blank & manual_blank)
+    has_price = ~cost_blank | ~manual_blank
+    overflow = (price.astype(np.float64) * qty.astype(np.float64) >= _MAX_PRODUCT) | \
+               (cost.astype(np.float64) * qty.astype(np.float64) >= _MAX_PRODUCT)
+
+    # 사유별 오류 (먼저 해당하는 사유 1개만 보고)
+    checks = [
+        (np.arange(n) >= MAX_LINE_ITEMS, f"품목 수 상한({MAX_LINE_ITEMS:,}개) 초과"),
+        (desc == "", "품명(Description)이 비어 있습니다"),
+        (qty_blank, "수량이 비어 있습니다"),
+        (qty_bad, "수량 형식 오류 (예: 1,000 PCS)"),
+        (qty_neg | (~qty_blank & ~qty_bad & (qty == 0)), "수량은 0보다 커야 합니다"),
+        (~has_price, "원가 또는 판매가를 입력하세요"),
+        (cost_bad, "원가 형식 오류 (예: 5.00)"),
+        (manual_bad, "판매가 형식 오류 (예: 6.40)"),
+        (cost_neg | manual_neg, "금액은 음수일 수 없습니다"),
+        (overflow, "금액 범위 초과"),
+    ]
+    reason = np.full(n, "", dtype=object)
+    for mask, message in reversed(checks):
+        reason = np.where(mask & used, message, reason)
+    valid = used & (reason == "")
+
+    safe_qty = np.where(valid, qty, 0)
+    amount_cents = (np.where(valid, price, 0) * safe_qty + _TO_CENTS // 2) // _TO_CENTS
+    cost_cents = (np.where(valid, cost, 0) * safe_qty + _TO_CENTS // 2) // _TO_CENTS
+
+    total_cost = int(cost_cents.sum())
+    total_revenue = int(amount_cents.sum())
+    total_profit = total_revenue - total_cost
+    return {
+        "price_units": np.where(valid, price, 0),
+        "amount_cents": amount_cents,
+        "cost_cents": cost_cents,
+        "valid": valid,
+        "used": used,
+        "errors": [(int(i) + 1, reason[i]) for i in np.flatnonzero(used & ~valid)],
+        "total_cost": total_cost,
+        "total_revenue": total_revenue,
+        "total_profit": total_profit,
+        "profit_rate": total_profit / total_cost * 100 if total_cost > 0 else 0.0,
+    }
@@ -3,6 +3,8 @@ import requests
 import pandas as pd
 import datetime
 
+from modules.sales.market_series import get_market_store
+
 def get_market_indices():
     """실시간 지수 (현재가) 가져오기"""
     try:
@@ -23,12 +25,10 @@ def get_market_indices():
         print(f"Data Error: {e}")
         return {"usd_krw": 1380.0, "wti_oil": 75.0}
 
-def get_exchange_rate_history():
-    """[추가] 캔들 차트용 1달치 환율 데이터 가져오기"""
+def get_exchange_rate_history(window='1M'):
+    """[추가] 캔들 차트용 환율 일봉 (로컬 저장소, 새 봉만 다운로드)"""
     try:
-        # 1달치, 1일 간격
-        df = yf.download('KRW=X', period='1mo', interval='1d', progress=False)
-        return df
+        return get_market_store().series('KRW=X', window)
     except Exception:
         return pd.DataFrame()
 
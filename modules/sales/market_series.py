@@ -0,0 +1,191 @@
+"""
+시장 시계열 저장소 (환율/유가 일봉)
+- yfinance 일봉을 SQLite(data/sales/market_series.db)에 영구 저장
+- 동기화 시 마지막 저장일 이후(당일 미확정 봉 포함)만 다운로드 -> 매번 1개월치 재다운로드하지 않음
+- 조회는 디스크에서 기간(1M/3M/1Y 등) 단위로 바로 반환 (네트워크 없음)
+- 데이터가 바뀔 때마다 심볼별 version 증가 -> 차트 등 파생 캐시의 키로 사용
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, timedelta
+import pandas as pd
+import yfinance as yf
+import streamlit as st
+
+# 경로 설정
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+MARKET_DB = os.path.join(root_dir, "data", "sales", "market_series.db")
+
+# 조회 기간 -> 달력 일수
+WINDOWS = {"1M": 31, "3M": 92, "6M": 183, "1Y": 366, "3Y": 1096}
+# 처음 동기화할 때 받아 둘 기간 (이후에는 끝부분만 추가)
+INITIAL_HISTORY_DAYS = 3 * 366
+# 마지막 동기화 후 이 시간 안에는 다시 받지 않음
+SYNC_INTERVAL = 600
+
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    symbol TEXT NOT NULL,
+    day    TEXT NOT NULL,
+    open   REAL,
+    high   REAL,
+    low    REAL,
+    close  REAL,
+    volume REAL,
+    PRIMARY KEY (symbol, day)
+);
+CREATE TABLE IF NOT EXISTS series_meta (
+    symbol    TEXT PRIMARY KEY,
+    synced_at REAL,
+    version   INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def download_daily_bars(symbol, start, timeout=10):
+    """yfinance 일봉 (start 이후, 인덱스는 거래일)"""
+    return yf.Ticker(symbol).history(start=start.isoformat(), interval="1d", timeout=timeout)
+
+
+class MarketSeriesStore:
+    """SQLite 기반 일봉 저장소 (스레드별 커넥션)"""
+
+    def __init__(self, db_path=MARKET_DB, fetch=download_daily_bars):
+        self.db_path = db_path
+        self.fetch = fetch
+        self._local = threading.local()
+        self._sync_lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        with conn:
+            yield conn
+
+    # ---------------------------------------------------------------------
+    # 조회
+    # ---------------------------------------------------------------------
+    def last_day(self, symbol):
+        with self._conn() as conn:
+            row = conn.execute("SELECT MAX(day) FROM bars WHERE symbol = ?", (symbol,)).fetchone()
+        return date.fromisoformat(row[0]) if row[0] else None
+
+    def version(self, symbol):
+        """심볼 데이터 버전 (봉이 추가/수정될 때마다 증가)"""
+        with self._conn() as conn:
+            row = conn.execute("SELECT version FROM series_meta WHERE symbol = ?", (symbol,)).fetchone()
+        return row[0] if row else 0
+
+    def read(self, symbol, window="1M"):
+        """
+        저장된 일봉 조회
+
+        Args:
+            window: WINDOWS 키("1M"/"3M"/"1Y"...) 또는 일수, None이면 전체
+
+        Returns:
+            DataFrame: Open/High/Low/Close/Volume, 날짜 인덱스 (없으면 빈 DataFrame)
+        """
+        # 버전을 먼저 읽어 두면 조회 중 동기화가 끼어도 (버전, 데이터) 짝이 더 최신 쪽으로만 어긋남
+        version = self.version(symbol)
+        query = "SELECT day, open, high, low, close, volume FROM bars WHERE symbol = ?"
+        params = [symbol]
+        if window is not None:
+            days = WINDOWS[window] if isinstance(window, str) else int(window)
+            last = self.last_day(symbol)
+            if last is None:
+                return pd.DataFrame(columns=COLUMNS)
+            query += " AND day >= ?"
+            params.append((last - timedelta(days=days)).isoformat())
+        with self._conn() as conn:
+            rows = conn.execute(query + " ORDER BY day", params).fetchall()
+
+        df = pd.DataFrame(rows, columns=["Date", *COLUMNS])
+        df.index = pd.DatetimeIndex(pd.to_datetime(df.pop("Date")), name="Date")
+        df.attrs.update(symbol=symbol, version=version)
+        return df
+
+    # ---------------------------------------------------------------------
+    # 동기화
+    # ---------------------------------------------------------------------
+    def sync(self, symbol, timeout=10, force=False):
+        """
+        마지막 저장일 이후 일봉만 받아서 저장 (최근 SYNC_INTERVAL 안에 동기화했으면 생략)
+
+        Returns:
+            int: 추가/수정된 봉 수
+        """
+        with self._sync_lock:
+            with self._conn() as conn:
+                row = conn.execute("SELECT synced_at FROM series_meta WHERE symbol = ?", (symbol,)).fetchone()
+            if not force and row and row[0] and time.time() - row[0] < SYNC_INTERVAL:
+                return 0
+
+            # 마지막 봉은 장중 값일 수 있으므로 그날부터 다시 받음
+            last = self.last_day(symbol)
+            start = last if last else date.today() - timedelta(days=INITIAL_HISTORY_DAYS)
+            hist = self.fetch(symbol, start, timeout=timeout)
+            return self._upsert(symbol, hist)
+
+    def _upsert(self, symbol, hist):
+        rows = []
+        if hist is not None and not hist.empty:
+            hist = hist.reindex(columns=COLUMNS)
+            # 거래소 현지 날짜 기준 일봉 (시간대 정보는 버림)
+            days = [ts.date().isoformat() for ts in hist.index]
+            rows = [
+                (symbol, day, *(None if pd.isna(v) else float(v) for v in values))
+                for day, values in zip(days, hist.itertuples(index=False, name=None))
+            ]
+
+        with self._conn() as conn:
+            before = conn.total_changes
+            conn.executemany("""
+                INSERT INTO bars (symbol, day, open, high, low, close, volume)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (symbol, day) DO UPDATE SET
+                    open = excluded.open, high = excluded.high, low = excluded.low,
+                    close = excluded.close, volume = excluded.volume
+                WHERE (open, high, low, close, volume)
+                      IS NOT (excluded.open, excluded.high, excluded.low, excluded.close, excluded.volume)
+            """, rows)
+            changed = conn.total_changes - before
+            conn.execute("""
+                INSERT INTO series_meta (symbol, synced_at, version) VALUES (?, ?, ?)
+                ON CONFLICT (symbol) DO UPDATE SET
+                    synced_at = excluded.synced_at,
+                    version = series_meta.version + excluded.version
+            """, (symbol, time.time(), 1 if changed else 0))
+        return changed
+
+    def series(self, symbol, window="1M", timeout=10):
+        """끝부분 동기화 후 조회 (네트워크 실패 시 디스크 데이터 그대로 반환)"""
+        try:
+            self.sync(symbol, timeout=timeout)
+        except Exception as e:
+            print(f"시세 동기화 실패 ({symbol}): {e}")
+        return self.read(symbol, window)
+
+
+@st.cache_resource
+def get_market_store():
+    """세션 간 공유되는 시계열 저장소"""
+    return MarketSeriesStore()
@@ -0,0 +1,389 @@
+"""
+오퍼 일괄 발송 (캠페인)
+- 바이어별 오퍼시트를 배치 단위로 렌더링 -> 메일 작업 큐에 적재
+- 발송 스레드 여러 개가 큐를 처리, 수신 도메인별 최소 발송 간격 유지 (한 도메인에 몰아서 보내지 않음)
+- 일시적 오류(연결 끊김, 4xx)는 지수 백오프로 재시도, 영구 오류(5xx, 주소 없음)는 바로 실패 처리
+- 발송 결과는 오퍼 원장에 기록 (성공: Sent / 실패: Draft + 메모에 사유), UI는 진행률만 폴링
+- 전송 방식 교체 가능: SMTP 설정이 있으면 SMTPTransport, 없으면 .eml 파일로 저장하는 FileSinkTransport
+"""
+
+import os
+import re
+import sys
+import time
+import heapq
+import random
+import smtplib
+import threading
+from datetime import date, datetime
+from email.message import EmailMessage
+from email.utils import make_msgid, formatdate
+
+# 경로 설정
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from config import get_env
+from modules.sales.offer_export import iter_offer_batches
+
+OUTBOX_DIR = os.path.join(root_dir, "data", "sales", "outbox")
+
+SENDER_THREADS = 4
+# 같은 도메인으로 연속 발송 시 최소 간격 (초)
+DOMAIN_INTERVAL = 2.0
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 5.0
+BACKOFF_MAX = 120.0
+
+DOCX_MIME = ("application", "vnd.openxmlformats-officedocument.wordprocessingml.document")
+_EMAIL_RE = re.compile(r"^[^@\s]+@([^@\s]+\.[^@\s]+)$")
+
+
+class PermanentSendError(Exception):
+    """재시도해도 성공할 수 없는 발송 오류 (잘못된 주소, 5xx 거부 등)"""
+
+
+# ═══════════════════════════════════════════════════════════════
+#  전송 방식 (Transport)
+# ═══════════════════════════════════════════════════════════════
+
+class SMTPTransport:
+    """SMTP 발송 (발송 스레드별로 연결 1개를 유지하며 재사용)"""
+
+    def __init__(self, host, port=587, username=None, password=None, use_tls=True, timeout=30):
+        self.host = host
+        self.port = int(port)
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._local = threading.local()
+
+    @property
+    def description(self):
+        return f"SMTP ({self.host}:{self.port})"
+
+    def _client(self):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.use_tls:
+                client.starttls()
+            if self.username:
+                client.login(self.username, self.password)
+            self._local.client = client
+        return client
+
+    def _reset(self):
+        client = getattr(self._local, "client", None)
+        self._local.client = None
+        if client is not None:
+            try:
+                client.quit()
+            except Exception:
+                pass
+
+    def send(self, message):
+        try:
+            self._client().send_message(message)
+        except smtplib.SMTPRecipientsRefused as e:
+            # 5xx만 영구 거부, 4xx(그레이리스팅 450/451 등)는 일시 오류로 재시도
+            codes = [code for code, _ in e.recipients.values()]
+            if codes and all(500 <= code < 600 for code in codes):
+                raise PermanentSendError(f"수신 거부: {e.recipients}") from e
+            raise
+        except (smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+            if 500 <= e.smtp_code < 600:
+                raise PermanentSendError(f"{e.smtp_code} {e.smtp_error!r}") from e
+            self._reset()
+            raise
+        except (smtplib.SMTPException, OSError):
+            # 연결이 끊겼거나 서버 일시 오류: 다음 시도에서 새로 연결
+            self._reset()
+            raise
+
+    def close(self):
+        self._reset()
+
+
+class FileSinkTransport:
+    """로컬 테스트용: 메일을 보내는 대신 outbox 폴더에 .eml 파일로 저장"""
+
+    def __init__(self, outbox_dir=OUTBOX_DIR):
+        self.outbox_dir = outbox_dir
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    @property
+    def description(self):
+        return f"로컬 저장 ({os.path.relpath(self.outbox_dir, root_dir)})"
+
+    def send(self, message):
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+        folder = os.path.join(self.outbox_dir, date.today().strftime("%Y%m%d"))
+        os.makedirs(folder, exist_ok=True)
+        recipient = re.sub(r"[^\w.@-]", "_", str(message["To"]))
+        path = os.path.join(folder, f"{datetime.now().strftime('%H%M%S')}_{os.getpid()}_{seq:05d}_{recipient}.eml")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(message.as_bytes())
+        os.replace(tmp_path, path)
+
+    def close(self):
+        pass
+
+
+def get_transport():
+    """환경 설정에 맞는 전송 방식 (SMTP_HOST가 없으면 로컬 .eml 저장)"""
+    host = get_env("SMTP_HOST")
+    if not host:
+        return FileSinkTransport()
+    return SMTPTransport(
+        host,
+        port=get_env("SMTP_PORT", "587"),
+        username=get_env("SMTP_USER"),
+        password=get_env("SMTP_PASSWORD"),
+        use_tls=str(get_env("SMTP_TLS", "true")).lower() != "false",
+    )
+
+
+# ═══════════════════════════════════════════════════════════════
+#  발송 스케줄 (도메인별 간격 + 재시도 대기)
+# ═══════════════════════════════════════════════════════════════
+
+class _Schedule:
+    """발송 가능 시각 순 작업 큐 (아직 시각이 안 된 작업은 대기)"""
+
+    def __init__(self):
+        self._heap = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self.outstanding = 0      # 완료(성공/실패)되지 않은 작업 수
+        self.closed = False       # 더 이상 새 작업이 없음 (렌더링 종료)
+
+    def put(self, job, ready_at=0.0, new=False):
+        with self._cond:
+            if new:
+                self.outstanding += 1
+            self._seq += 1
+            heapq.heappush(self._heap, (ready_at, self._seq, job))
+            self._cond.notify()
+
+    def done(self):
+        with self._cond:
+            self.outstanding -= 1
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def get(self):
+        """다음 작업 (모든 작업이 끝나면 None)"""
+        with self._cond:
+            while True:
+                now = time.time()
+                if self._heap and self._heap[0][0] <= now:
+                    return heapq.heappop(self._heap)[2]
+                if self.closed and self.outstanding == 0:
+                    return None
+                self._cond.wait(self._heap[0][0] - now if self._heap else None)
+
+
+class DomainThrottle:
+    """수신 도메인별 다음 발송 가능 시각 예약"""
+
+    def __init__(self, interval=DOMAIN_INTERVAL):
+        self.interval = interval
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, domain):
+        """발송 슬롯 예약 -> 예약된 시각"""
+        with self._lock:
+            slot = max(time.time(), self._next.get(domain, 0.0))
+            self._next[domain] = slot + self.interval
+            return slot
+
+
+# ═══════════════════════════════════════════════════════════════
+#  캠페인
+# ═══════════════════════════════════════════════════════════════
+
+def build_message(sender, recipient, subject, body, attachments):
+    """첨부 파일이 포함된 메일 1통"""
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = recipient
+    message["Subject"] = subject
+    message["Date"] = formatdate(localtime=True)
+    message["Message-ID"] = make_msgid(domain=sender.split("@")[-1] if "@" in sender else None)
+    message.set_content(body)
+    for filename, blob in attachments:
+        message.add_attachment(blob, maintype=DOCX_MIME[0], subtype=DOCX_MIME[1], filename=filename)
+    return message
+
+
+class OfferCampaign:
+    """
+    백그라운드 오퍼 일괄 발송 (세션에 보관, UI에서 진행률 폴링)
+
+    Args:
+        variants: [(파일 접미사, 공통 form_data, 품목, 라벨)] - offer_export와 동일
+        targets: [{"Name", "Email", "Country", ...}]
+        offer: 원장 기록용 {"offer_no", "amount"}
+    """
+
+    def __init__(self, variants, targets, transport, sender, subject, body,
+                 ledger=None, team="Guest", offer=None, throttle=None, sender_threads=SENDER_THREADS,
+                 max_attempts=MAX_ATTEMPTS, backoff_base=BACKOFF_BASE):
+        self.variants = variants
+        self.targets = list(targets)
+        self.transport = transport
+        self.sender = sender
+        self.subject = subject
+        self.body = body
+        self.ledger = ledger
+        self.team = team
+        self.offer = offer or {}
+        self.throttle = throttle or DomainThrottle()
+        self.sender_threads = sender_threads
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+
+        self.total = len(self.targets)
+        self.rendered = 0
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.error = None
+        self.failures = []           # [(바이어명, 사유)]
+        self.offer_ids = []
+        self._schedule = _Schedule()
+        self._lock = threading.Lock()
+        self._threads = []
+
+    # ---------------------------------------------------------------------
+    # 상태
+    # ---------------------------------------------------------------------
+    @property
+    def running(self):
+        return any(t.is_alive() for t in self._threads)
+
+    @property
+    def finished(self):
+        return self.sent + self.failed
+
+    # ---------------------------------------------------------------------
+    # 실행
+    # ---------------------------------------------------------------------
+    def start(self):
+        if self.ledger is not None:
+            # 발송 전 원장에 '대기' 상태로 기록 -> 결과에 따라 행 단위 갱신
+            self.offer_ids = self.ledger.add_many(self.team, [{
+                "offer_no": self.offer.get("offer_no", ""),
+                "buyer": target.get("Name", ""),
+                "email": target.get("Email", ""),
+                "country": target.get("Country", ""),
+                "amount": self.offer.get("amount", 0),
+                "status": "Draft",
+                "date": date.today(),
+                "memo": "발송 대기",
+            } for target in self.targets])
+
+        self._threads = [threading.Thread(target=self._render, daemon=True)]
+        self._threads += [threading.Thread(target=self._send_loop, daemon=True) for _ in range(self.sender_threads)]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def _render(self):
+        """오퍼시트 렌더링 -> 메일 작업 적재 (배치 순서대로)"""
+        n_files = len(self.variants)
+        done = 0
+        try:
+            for batch, files in iter_offer_batches(self.variants, self.targets):
+                self._enqueue(batch, files, done, n_files)
+                done += len(batch)
+        except Exception as e:
+            self.error = str(e)
+            # 렌더링하지 못한 바이어는 실패로 기록
+            for index in range(done, self.total):
+                self._finish({"index": index, "target": self.targets[index]}, f"서류 생성 실패: {e}", queued=False)
+        finally:
+            self._schedule.close()
+
+    def _enqueue(self, batch, files, start, n_files):
+        for offset, target in enumerate(batch):
+            job = {
+                "index": start + offset,
+                "target": target,
+                "attachments": files[offset * n_files:(offset + 1) * n_files],
+                "attempts": 0,
+                "slot": None,
+            }
+            with self._lock:
+                self.rendered += 1
+            self._schedule.put(job, new=True)
+
+    def _send_loop(self):
+        try:
+            while True:
+                job = self._schedule.get()
+                if job is None:
+                    return
+                self._send(job)
+        finally:
+            # 이 스레드가 연 SMTP 연결 정리
+            self.transport.close()
+
+    def _send(self, job):
+        recipient = str(job["target"].get("Email", "")).strip()
+        match = _EMAIL_RE.match(recipient)
+        if not match:
+            return self._finish(job, f"이메일 주소 오류: {recipient or '없음'}")
+
+        # 도메인별 간격: 슬롯이 아직이면 그 시각에 다시 꺼내도록 예약
+        if job["slot"] is None:
+            job["slot"] = self.throttle.reserve(match.group(1).lower())
+        if job["slot"] > time.time():
+            return self._schedule.put(job, ready_at=job["slot"])
+
+        job["attempts"] += 1
+        try:
+            message = build_message(self.sender, recipient, self.subject, self.body, job["attachments"])
+            self.transport.send(message)
+        except PermanentSendError as e:
+            return self._finish(job, str(e))
+        except Exception as e:
+            if job["attempts"] >= self.max_attempts:
+                return self._finish(job, f"재시도 {job['attempts']}회 실패: {e}")
+            # 지수 백오프 (+지터) 후 재시도, 도메인 슬롯은 다시 예약
+            delay = min(self.backoff_base * 2 ** (job["attempts"] - 1), BACKOFF_MAX) * random.uniform(0.8, 1.2)
+            job["slot"] = None
+            with self._lock:
+                self.retries += 1
+            return self._schedule.put(job, ready_at=time.time() + delay)
+        self._finish(job, None)
+
+    def _finish(self, job, failure, queued=True):
+        with self._lock:
+            if failure is None:
+                self.sent += 1
+            else:
+                self.failed += 1
+                self.failures.append((job["target"].get("Name", ""), failure))
+        if self.ledger is not None and self.offer_ids:
+            offer_id = self.offer_ids[job["index"]]
+            values = {"status": "Sent", "memo": ""} if failure is None else {"memo": f"발송 실패: {failure}"}
+            try:
+                self.ledger.update_rows(self.team, {offer_id: values})
+            except Exception as e:
+                print(f"발송 결과 기록 실패 ({offer_id}): {e}")
+        if queued:
+            self._schedule.done()
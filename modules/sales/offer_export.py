@@ -0,0 +1,132 @@
+"""
+오퍼시트 일괄 내보내기 (ZIP)
+- 바이어별 DOCX를 배치 단위로 생성 (양식 채우기는 건당 1ms 미만이라 프로세스 풀 기동 비용이 더 큼)
+- 완료된 배치를 순서대로 임시 파일 위 ZIP에 기록 -> 메모리 상한 유지
+- ExportJob: 백그라운드 스레드에서 실행, UI는 진행률만 폴링
+"""
+
+import os
+import sys
+import threading
+import zipfile
+from tempfile import SpooledTemporaryFile, TemporaryFile
+
+# 경로 설정
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from modules.sales.doc_maker import create_offer_sheet
+
+# 이 크기까지는 메모리, 넘으면 디스크 임시 파일로 전환
+ZIP_SPOOL_SIZE = 32 * 1024 * 1024
+BATCH_SIZE = 25
+
+
+def offer_filename(buyer_name, suffix):
+    return f"OfferSheet_{buyer_name}_{suffix}.docx"
+
+
+def unique_filename(name, used):
+    """같은 이름의 바이어가 여러 명이면 ZIP 항목명 뒤에 _2, _3 ... 을 붙임"""
+    count = used.get(name, 0) + 1
+    used[name] = count
+    if count == 1:
+        return name
+    stem, ext = os.path.splitext(name)
+    return f"{stem}_{count}{ext}"
+
+
+def render_batch(variants, targets):
+    """
+    바이어 묶음의 오퍼시트 생성
+
+    Args:
+        variants: [(파일 접미사, 공통 form_data, 품목, 라벨)] - 영문/번역본
+        targets: [{"Name": ..., "Email": ...}]
+
+    Returns:
+        list: [(파일명, DOCX 바이트)]
+    """
+    files = []
+    for target in targets:
+        for suffix, form_data, items, labels in variants:
+            current_form_data = {
+                **form_data,
+                "buyer_company": target["Name"],
+                "address_attn": target.get("Email", ""),
+            }
+            buf = create_offer_sheet(current_form_data, items, signature_img=None, labels=labels)
+            files.append((offer_filename(target["Name"], suffix), buf.getvalue()))
+    return files
+
+
+def iter_offer_batches(variants, targets):
+    """바이어를 BATCH_SIZE 단위로 나눠 순서대로 생성 (배치마다 진행률 갱신)"""
+    for i in range(0, len(targets), BATCH_SIZE):
+        batch = targets[i:i + BATCH_SIZE]
+        yield batch, render_batch(variants, batch)
+
+
+def build_offer_zip(variants, targets, out=None, on_progress=None):
+    """
+    오퍼시트 ZIP 생성
+
+    Args:
+        out: 기록할 파일 객체 (없으면 SpooledTemporaryFile)
+        on_progress: 콜백 (완료 바이어 수, 전체 바이어 수)
+
+    Returns:
+        파일 객체 (처음 위치로 되감긴 상태)
+    """
+    if out is None:
+        out = SpooledTemporaryFile(max_size=ZIP_SPOOL_SIZE)
+
+    done = 0
+    used = {}
+    # DOCX는 이미 압축된 파일이므로 재압축하지 않음
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_STORED) as zf:
+        for batch, files in iter_offer_batches(variants, targets):
+            for name, blob in files:
+                zf.writestr(unique_filename(name, used), blob)
+            done += len(batch)
+            if on_progress:
+                on_progress(done, len(targets))
+    out.seek(0)
+    return out
+
+
+class ExportJob:
+    """백그라운드 ZIP 생성 작업 (세션에 보관, UI에서 진행률 폴링)"""
+
+    def __init__(self, variants, targets):
+        self.variants = variants
+        self.targets = targets
+        self.total = len(targets)
+        self.done = 0
+        self.error = None
+        self.file = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def _progress(self, done, total):
+        self.done = done
+
+    def _run(self):
+        try:
+            # 다운로드 시 파일 핸들로 넘길 수 있도록 처음부터 디스크 임시 파일에 기록
+            self.file = build_offer_zip(self.variants, self.targets, out=TemporaryFile(), on_progress=self._progress)
+        except Exception as e:
+            self.error = str(e)
+
+    def open(self):
+        """완성된 ZIP 읽기 핸들 (다운로드 클릭 시점에만 호출, 전체를 bytes로 읽지 않음)"""
+        return open(self.file.fileno(), "rb", closefd=False)
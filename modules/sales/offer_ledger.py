@@ -0,0 +1,341 @@
+"""
+오퍼 발송 원장 (SQLite)
+- 발송한 오퍼를 팀별로 data/sales/offer_ledger.db에 영구 저장 (세션이 끝나도 유지)
+- 상태/발송일/바이어/Offer No 색인 -> 필터/검색/페이지 조회를 DB에서 처리 (필요한 페이지만 로드)
+- 편집 내용은 바뀐 행/컬럼만 UPDATE (전체 목록 재저장 없음)
+- 퍼널/상태별 금액/국가별/경과일 집계 테이블은 트리거가 행 변경 시 증분 갱신
+  -> 대시보드는 전체 이력 group-by 없이 작은 집계 테이블만 읽음
+"""
+
+import os
+import re
+import sys
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date
+import pandas as pd
+import streamlit as st
+
+# 경로 설정
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+LEDGER_DB = os.path.join(root_dir, "data", "sales", "offer_ledger.db")
+
+STATUSES = ["Draft", "Sent", "Viewed", "Accepted", "Rejected"]
+# 화면에 보여 주는 컬럼 (id는 편집 결과를 행에 매핑하는 용도)
+COLUMNS = ["id", "offer_no", "buyer", "email", "country", "amount", "status", "date", "memo"]
+EDITABLE = {"buyer", "email", "country", "amount", "status", "date", "memo"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS offers (
+    id          INTEGER PRIMARY KEY,
+    team        TEXT NOT NULL,
+    offer_no    TEXT NOT NULL,
+    buyer       TEXT NOT NULL DEFAULT '',
+    email       TEXT NOT NULL DEFAULT '',
+    country     TEXT NOT NULL DEFAULT '',
+    amount      REAL NOT NULL DEFAULT 0,
+    status      TEXT NOT NULL DEFAULT 'Sent',
+    date        TEXT NOT NULL,
+    memo        TEXT NOT NULL DEFAULT '',
+    created     REAL NOT NULL,
+    status_at   REAL NOT NULL,
+    max_stage   INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_offers_status ON offers (team, status, date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_offers_date ON offers (team, date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_offers_buyer ON offers (team, buyer);
+CREATE INDEX IF NOT EXISTS idx_offers_offer_no ON offers (team, offer_no);
+"""
+
+# 퍼널 단계 (거절은 최소한 발송까지는 도달한 것으로 봄, 도달 단계는 내려가지 않음)
+STAGES = ["Sent", "Viewed", "Accepted"]
+STAGE_RANK = {"Draft": 0, "Sent": 1, "Viewed": 2, "Accepted": 3, "Rejected": 1}
+# 경과일 집계 대상 (진행 중인 오퍼)
+OPEN_STATUSES = ("Sent", "Viewed")
+AGEING_BUCKETS = [("0-7일", 0, 7), ("8-14일", 8, 14), ("15-30일", 15, 30), ("30일 초과", 31, None)]
+
+_OPEN = "('" + "', '".join(OPEN_STATUSES) + "')"
+
+
+def _agg_sql(row):
+    """row(NEW/OLD) 1건을 집계 테이블에 더하는 SQL"""
+    return f"""
+    INSERT INTO offer_stats (team, status, country, n, amount) VALUES ({row}.team, {row}.status, {row}.country, 1, {row}.amount)
+        ON CONFLICT (team, status, country) DO UPDATE SET n = n + 1, amount = amount + excluded.amount;
+    INSERT INTO offer_funnel (team, stage, n) VALUES ({row}.team, {row}.max_stage, 1)
+        ON CONFLICT (team, stage) DO UPDATE SET n = n + 1;
+    INSERT INTO offer_open_days (team, date, n, amount)
+        SELECT {row}.team, {row}.date, 1, {row}.amount WHERE {row}.status IN {_OPEN}
+        ON CONFLICT (team, date) DO UPDATE SET n = n + 1, amount = amount + excluded.amount;"""
+
+
+def _unagg_sql(row):
+    """row(NEW/OLD) 1건을 집계 테이블에서 빼는 SQL (0건이 된 행은 삭제)"""
+    return f"""
+    UPDATE offer_stats SET n = n - 1, amount = amount - {row}.amount
+        WHERE team = {row}.team AND status = {row}.status AND country = {row}.country;
+    DELETE FROM offer_stats WHERE team = {row}.team AND status = {row}.status AND country = {row}.country AND n <= 0;
+    UPDATE offer_funnel SET n = n - 1 WHERE team = {row}.team AND stage = {row}.max_stage;
+    UPDATE offer_open_days SET n = n - 1, amount = amount - {row}.amount
+        WHERE {row}.status IN {_OPEN} AND team = {row}.team AND date = {row}.date;
+    DELETE FROM offer_open_days WHERE team = {row}.team AND date = {row}.date AND n <= 0;"""
+
+
+AGGREGATE_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS offer_stats (
+    team    TEXT NOT NULL,
+    status  TEXT NOT NULL,
+    country TEXT NOT NULL,
+    n       INTEGER NOT NULL,
+    amount  REAL NOT NULL,
+    PRIMARY KEY (team, status, country)
+);
+CREATE TABLE IF NOT EXISTS offer_funnel (
+    team  TEXT NOT NULL,
+    stage INTEGER NOT NULL,
+    n     INTEGER NOT NULL,
+    PRIMARY KEY (team, stage)
+);
+CREATE TABLE IF NOT EXISTS offer_open_days (
+    team   TEXT NOT NULL,
+    date   TEXT NOT NULL,
+    n      INTEGER NOT NULL,
+    amount REAL NOT NULL,
+    PRIMARY KEY (team, date)
+);
+CREATE TRIGGER IF NOT EXISTS trg_offers_insert AFTER INSERT ON offers BEGIN{_agg_sql("NEW")}
+END;
+CREATE TRIGGER IF NOT EXISTS trg_offers_delete AFTER DELETE ON offers BEGIN{_unagg_sql("OLD")}
+END;
+CREATE TRIGGER IF NOT EXISTS trg_offers_update AFTER UPDATE OF team, status, country, amount, date, max_stage ON offers BEGIN{_unagg_sql("OLD")}{_agg_sql("NEW")}
+END;
+"""
+
+_STAGE_CASE = "CASE {col} " + " ".join(f"WHEN '{k}' THEN {v}" for k, v in STAGE_RANK.items()) + " ELSE 0 END"
+
+
+def _clean(column, value):
+    """편집값 -> 저장값 (날짜는 ISO 문자열, 금액은 숫자)"""
+    if column == "amount":
+        try:
+            return float(str(value).replace(",", "")) if value not in (None, "") else 0.0
+        except ValueError:
+            return 0.0
+    if column == "date":
+        if value in (None, "") or pd.isna(value):
+            return date.today().isoformat()
+        return pd.Timestamp(value).date().isoformat()
+    if column == "status" and value not in STATUSES:
+        raise ValueError(f"알 수 없는 상태: {value}")
+    return "" if value is None else str(value)
+
+
+class OfferLedger:
+    """SQLite 기반 오퍼 원장 (스레드별 커넥션)"""
+
+    def __init__(self, db_path=LEDGER_DB):
+        self.db_path = db_path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(offers)")}
+            if "max_stage" not in columns:
+                # 집계 도입 이전 원장: 현재 상태 기준으로 도달 단계 채움
+                conn.execute("ALTER TABLE offers ADD COLUMN max_stage INTEGER NOT NULL DEFAULT 0")
+                conn.execute(f"UPDATE offers SET max_stage = {_STAGE_CASE.format(col='status')}")
+            has_triggers = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_offers_insert'").fetchone()
+            conn.executescript(AGGREGATE_SCHEMA)
+        if not has_triggers:
+            self.rebuild_aggregates()
+
+    @contextmanager
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        with conn:
+            yield conn
+
+    # ---------------------------------------------------------------------
+    # 기록
+    # ---------------------------------------------------------------------
+    def add_many(self, team, records):
+        """오퍼 여러 건 기록 (records: offer_no/buyer/email/country/amount/status/date/memo dict, 입력 순서대로 id 반환)"""
+        now = time.time()
+        rows = [(
+            team,
+            str(rec.get("offer_no", "")),
+            _clean("buyer", rec.get("buyer", "")),
+            _clean("email", rec.get("email", "")),
+            _clean("country", rec.get("country", "")),
+            _clean("amount", rec.get("amount", 0)),
+            _clean("status", rec.get("status", "Sent")),
+            _clean("date", rec.get("date")),
+            _clean("memo", rec.get("memo", "")),
+            now, now,
+            STAGE_RANK[_clean("status", rec.get("status", "Sent"))],
+        ) for rec in records]
+        with self._conn() as conn:
+            ids = [conn.execute("""
+                INSERT INTO offers (team, offer_no, buyer, email, country, amount, status, date, memo, created, status_at, max_stage)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, row).lastrowid for row in rows]
+        return ids
+
+    def add(self, team, record):
+        """오퍼 1건 기록 (새 오퍼 id 반환)"""
+        return self.add_many(team, [record])[0]
+
+    def update_rows(self, team, changes):
+        """
+        행 단위 수정
+
+        Args:
+            changes: {offer id: {컬럼: 값}} - 바뀐 컬럼만 (EDITABLE 외 컬럼은 무시)
+
+        Returns:
+            int: 수정된 행 수
+        """
+        updated = 0
+        with self._conn() as conn:
+            for offer_id, values in changes.items():
+                values = {col: _clean(col, val) for col, val in values.items() if col in EDITABLE}
+                if not values:
+                    continue
+                assignments = ", ".join(f"{col} = ?" for col in values)
+                params = list(values.values())
+                if "status" in values:
+                    # 상태가 실제로 바뀐 경우에만 상태 변경 시각 갱신 (경과일 계산용)
+                    assignments += ", status_at = CASE WHEN status != ? THEN ? ELSE status_at END"
+                    assignments += ", max_stage = MAX(max_stage, ?)"
+                    params += [values["status"], time.time(), STAGE_RANK[values["status"]]]
+                cur = conn.execute(
+                    f"UPDATE offers SET {assignments} WHERE id = ? AND team = ?",
+                    (*params, int(offer_id), team))
+                updated += cur.rowcount
+        return updated
+
+    # ---------------------------------------------------------------------
+    # 조회
+    # ---------------------------------------------------------------------
+    @staticmethod
+    def _where(team, statuses=None, search=None):
+        clauses, params = ["team = ?"], [team]
+        if statuses:
+            clauses.append(f"status IN ({','.join('?' * len(statuses))})")
+            params += list(statuses)
+        if search:
+            # 검색어의 %, _ 는 와일드카드가 아닌 문자로 취급
+            pattern = "%" + re.sub(r"([\\%_])", r"\\\1", search) + "%"
+            clauses.append("(buyer LIKE ? ESCAPE '\\' OR offer_no LIKE ? ESCAPE '\\')")
+            params += [pattern, pattern]
+        return " AND ".join(clauses), params
+
+    def count(self, team, statuses=None, search=None):
+        where, params = self._where(team, statuses, search)
+        with self._conn() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM offers WHERE {where}", params).fetchone()[0]
+
+    def has_offer_no(self, team, offer_no):
+        """이미 원장에 기록된 Offer No인지 (idx_offers_offer_no 사용)"""
+        with self._conn() as conn:
+            row = conn.execute("SELECT 1 FROM offers WHERE team = ? AND offer_no = ? LIMIT 1", (team, offer_no)).fetchone()
+        return row is not None
+
+    def page(self, team, statuses=None, search=None, offset=0, limit=50):
+        """필터에 맞는 오퍼 1페이지 (최근 발송일 순)"""
+        where, params = self._where(team, statuses, search)
+        with self._conn() as conn:
+            rows = conn.execute(f"""
+                SELECT {', '.join(COLUMNS)} FROM offers WHERE {where}
+                ORDER BY date DESC, id DESC LIMIT ? OFFSET ?
+            """, (*params, int(limit), int(offset))).fetchall()
+        df = pd.DataFrame(rows, columns=COLUMNS)
+        df["date"] = pd.to_datetime(df["date"]).dt.date
+        return df
+
+    # ---------------------------------------------------------------------
+    # 집계 (트리거로 유지되는 테이블만 읽음)
+    # ---------------------------------------------------------------------
+    def rebuild_aggregates(self):
+        """집계 테이블 전체 재계산 (집계 도입 전 원장 이관/복구용)"""
+        with self._conn() as conn:
+            conn.execute("DELETE FROM offer_stats")
+            conn.execute("DELETE FROM offer_funnel")
+            conn.execute("DELETE FROM offer_open_days")
+            conn.execute("""
+                INSERT INTO offer_stats (team, status, country, n, amount)
+                SELECT team, status, country, COUNT(*), SUM(amount) FROM offers GROUP BY team, status, country
+            """)
+            conn.execute("""
+                INSERT INTO offer_funnel (team, stage, n)
+                SELECT team, max_stage, COUNT(*) FROM offers GROUP BY team, max_stage
+            """)
+            conn.execute(f"""
+                INSERT INTO offer_open_days (team, date, n, amount)
+                SELECT team, date, COUNT(*), SUM(amount) FROM offers WHERE status IN {_OPEN} GROUP BY team, date
+            """)
+
+    def metrics(self, team, today=None):
+        """
+        퍼널/파이프라인 KPI
+
+        Returns:
+            dict: total, total_amount, funnel(단계별 도달 수), view_rate, accept_rate,
+                  by_status / by_country (DataFrame), ageing(진행 중 오퍼 경과일 구간별 건수/금액)
+        """
+        today = today or date.today()
+        with self._conn() as conn:
+            stats = pd.DataFrame(conn.execute(
+                "SELECT status, country, n, amount FROM offer_stats WHERE team = ?", (team,)).fetchall(),
+                columns=["status", "country", "n", "amount"])
+            stage_counts = dict(conn.execute(
+                "SELECT stage, n FROM offer_funnel WHERE team = ?", (team,)).fetchall())
+            # 날짜별 행 수는 오퍼 수가 아니라 진행 중 오퍼의 발송일 수에 비례
+            open_days = conn.execute(
+                "SELECT date, n, amount FROM offer_open_days WHERE team = ?", (team,)).fetchall()
+
+        funnel = {stage: sum(n for rank, n in stage_counts.items() if rank >= i + 1)
+                  for i, stage in enumerate(STAGES)}
+        sent = funnel["Sent"]
+
+        by_status = stats.groupby("status")[["n", "amount"]].sum().reindex(STATUSES, fill_value=0)
+        by_country = stats.assign(accepted=stats["n"].where(stats["status"] == "Accepted", 0)) \
+            .groupby("country")[["n", "amount", "accepted"]].sum().sort_values("n", ascending=False)
+
+        ageing = {label: {"n": 0, "amount": 0.0} for label, _, _ in AGEING_BUCKETS}
+        for day, n, amount in open_days:
+            # 발송일은 편집 가능하므로 미래 날짜일 수 있음 -> 0일로 취급 (구간/진행 중 금액에서 누락 방지)
+            age = max((today - date.fromisoformat(day)).days, 0)
+            for label, low, high in AGEING_BUCKETS:
+                if age >= low and (high is None or age <= high):
+                    ageing[label]["n"] += n
+                    ageing[label]["amount"] += amount
+                    break
+
+        return {
+            "total": int(stats["n"].sum()),
+            "total_amount": float(stats["amount"].sum()),
+            "funnel": funnel,
+            "view_rate": funnel["Viewed"] / sent * 100 if sent else 0.0,
+            "accept_rate": funnel["Accepted"] / sent * 100 if sent else 0.0,
+            "by_status": by_status,
+            "by_country": by_country,
+            "ageing": ageing,
+        }
+
+
+@st.cache_resource
+def get_offer_ledger():
+    """세션 간 공유되는 오퍼 원장"""
+    return OfferLedger()
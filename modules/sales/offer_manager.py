@@ -1,8 +1,7 @@
 """
 오퍼시트 관리 모듈
 - 오퍼시트 폼 초기화
-- 총액 계산
-- 발송 내역 관리
+- 오퍼 원장 구분 키 (현재 사용자)
 """
 
 import streamlit as st
@@ -44,49 +43,11 @@ def initialize_offer_form(buyer_info: dict = None):
     return form
 
 
-def calculate_totals(items: list, margin_rate: float):
-    """총 원가/판매가/이익 계산"""
-    total_cost = 0.0
-    total_revenue = 0.0
-
-    for item in items:
-        try:
-            cost = float(item.get("cost", 0))
-            quantity = float(item.get("quantity", 0))
-            price = float(item.get("price", 0))
-
-            total_cost += cost * quantity
-            total_revenue += price * quantity
-        except:
-            pass
-
-    total_profit = total_revenue - total_cost
-    profit_rate = (total_profit / total_cost * 100) if total_cost > 0 else 0
-
-    return {
-        "total_cost": total_cost,
-        "total_revenue": total_revenue,
-        "total_profit": total_profit,
-        "profit_rate": profit_rate
-    }
-
-
 def save_offer_draft(offer_data: dict):
     """작성 중인 오퍼시트 세션에 저장"""
     st.session_state.offer_draft = offer_data
 
 
-def get_offer_history():
-    """발송 내역 조회 (session_state 기반)"""
-    if 'sent_offers' not in st.session_state:
-        st.session_state.sent_offers = []
-
-    return st.session_state.sent_offers
-
-
-def add_sent_offer(offer_record: dict):
-    """발송 완료 오퍼 내역 추가"""
-    if 'sent_offers' not in st.session_state:
-        st.session_state.sent_offers = []
-
-    st.session_state.sent_offers.append(offer_record)
+def current_team():
+    """원장 구분 키 (로그인 사용자 기준)"""
+    return st.session_state.get('user_id', 'Guest')
@@ -0,0 +1,86 @@
+"""
+오퍼시트 HTML 미리보기
+- create_offer_sheet와 같은 데이터/라벨/배치를 HTML/CSS로 직접 렌더링
+- DOCX/PDF 변환 없이 입력값이 바뀔 때마다 즉시 갱신 (편집 중 미리보기용)
+"""
+
+from html import escape
+
+from modules.sales.doc_maker import DEFAULT_LABELS
+
+PREVIEW_CSS = """
+<style>
+.offer-preview { background:#fff; color:#111; font-family:Arial, sans-serif; font-size:13px;
+                 max-width:794px; margin:0 auto; padding:48px 60px; border:1px solid #ddd;
+                 box-shadow:2px 2px 10px rgba(0,0,0,0.08); }
+.offer-preview .op-title { text-align:center; font-size:26px; font-weight:bold; }
+.offer-preview .op-company { text-align:center; font-size:18px; font-weight:bold; margin-top:6px; }
+.offer-preview .op-addr { text-align:center; font-size:12px; color:#555; }
+.offer-preview .op-line { border-top:1px dashed #999; margin:12px 0; }
+.offer-preview table { width:100%; border-collapse:collapse; margin:6px 0 12px 0; }
+.offer-preview td, .offer-preview th { padding:3px 6px; vertical-align:top; border:none; }
+.offer-preview .op-right { text-align:right; }
+.offer-preview .op-center { text-align:center; }
+.offer-preview .op-goods th, .offer-preview .op-goods td { border:1px solid #000; }
+.offer-preview .op-goods th { background:#E8E8E8; text-align:center; }
+.offer-preview .op-sign { white-space:pre-line; }
+</style>
+"""
+
+
+def _text(value):
+    """HTML 이스케이프 + 줄바꿈 유지"""
+    return escape(str(value or "")).replace("\n", "<br>")
+
+
+def render_offer_html(form_data: dict, items: list, labels: dict = None) -> str:
+    """오퍼시트 HTML (create_offer_sheet 레이아웃과 동일한 순서/라벨)"""
+    lb = {**DEFAULT_LABELS, **(labels or {})}
+    fd = form_data
+
+    fields = ["origin", "shipment", "loading_port", "destination", "payment", "packing", "insurance", "validity"]
+    terms_rows = "".join(
+        f"<tr><td style='width:30%;'><b>{_text(lb[key])}</b></td><td>: {_text(fd.get(key))}</td></tr>"
+        for key in fields
+    )
+
+    valid_items = [it for it in items if it.get("description")]
+    goods_rows = "".join(
+        f"<tr><td class='op-center'>{_text(it.get('no', i + 1))}</td>"
+        f"<td>{_text(it.get('description'))}</td>"
+        f"<td class='op-center'>{_text(it.get('quantity'))}</td>"
+        f"<td class='op-right'>{_text(it.get('unit_price'))}</td>"
+        f"<td class='op-right'>{_text(it.get('amount'))}</td></tr>"
+        for i, it in enumerate(valid_items)
+    )
+
+    return f"""{PREVIEW_CSS}
+<div class="offer-preview">
+  <div class="op-title">{_text(lb['offer_sheet'])}</div>
+  <div class="op-company">[{_text(fd.get('seller_name', 'Company Name'))}]</div>
+  <div class="op-addr">{_text(fd.get('seller_addr'))}</div>
+  <div class="op-line"></div>
+  <table>
+    <tr><td><b>{_text(lb['messrs'])}</b> {_text(fd.get('buyer_company'))}</td>
+        <td class="op-right"><b>{_text(lb['offer_no'])}</b> {_text(fd.get('offer_no'))}</td></tr>
+    <tr><td><b>Address:</b> {_text(fd.get('address_attn'))}</td>
+        <td class="op-right"><b>{_text(lb['date'])}</b> {_text(fd.get('date'))}</td></tr>
+    <tr><td><b>Attn:</b></td><td></td></tr>
+  </table>
+  <p>We are pleased to offer you the following goods on the terms and conditions set forth below:</p>
+  <table>{terms_rows}</table>
+  <table class="op-goods">
+    <tr><th>{_text(lb['no'])}</th><th>{_text(lb['description_of_goods'])}</th><th>{_text(lb['quantity'])}</th>
+        <th>{_text(lb['unit_price'])}</th><th>{_text(lb['amount'])}</th></tr>
+    {goods_rows}
+    <tr><td colspan="4" class="op-right"><b>{_text(lb['total_amount'])}</b></td>
+        <td class="op-right"><b>USD {_text(fd.get('total_amount'))}</b></td></tr>
+  </table>
+  <p><b>Dispute Resolution</b><br><b>1. Method:</b></p>
+  <table>
+    <tr><td>{_text(lb['accepted_by_buyer'])}</td><td class="op-right">{_text(lb['yours_faithfully'])}</td></tr>
+    <tr><td></td><td class="op-right"><b>[{_text(fd.get('seller_name'))}]</b></td></tr>
+    <tr><td class="op-sign">__________________________<br>{_text(lb['authorized_signature'])}</td>
+        <td class="op-right op-sign">__________________________<br>{_text(lb['authorized_signature'])}</td></tr>
+  </table>
+</div>"""
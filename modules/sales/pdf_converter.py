@@ -0,0 +1,240 @@
+"""
+DOCX -> PDF 변환 워커 (LibreOffice)
+- 전용 프로필(-env:UserInstallation)로 headless 오피스 1개를 띄워 두고 재사용 (기동 비용 1회)
+- 변환 요청은 큐에 쌓이고 워커 스레드 1개가 순서대로 처리 (요청당 여러 문서 가능)
+- 오피스 프로세스가 죽거나 연결이 끊긴 경우에만 재기동 (문서 자체 오류는 해당 문서만 실패 처리)
+- 호출자가 시간 초과로 포기한 요청은 변환하지 않고 건너뜀
+- UNO 바인딩(uno)이 없으면 같은 프로필로 --convert-to 일괄 호출 (프로필 초기화 비용만 절약)
+  venv/Streamlit Cloud 기본 환경에는 uno가 없으므로 변환마다 soffice 프로세스가 뜸
+  상주 인스턴스를 쓰려면 시스템 python3-uno(LibreOffice 번들 파이썬)로 앱을 실행해야 함
+"""
+
+import os
+import sys
+import time
+import queue
+import shutil
+import socket
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+import streamlit as st
+
+# 경로 설정
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    from com.sun.star.lang import DisposedException
+    from com.sun.star.connection import NoConnectException
+    HAS_UNO = True
+except ImportError:
+    HAS_UNO = False
+
+PROFILE_DIR = os.path.join(tempfile.gettempdir(), "nextrade_office_profile")
+STARTUP_TIMEOUT = 30
+CONVERT_TIMEOUT = 60
+
+
+def find_office():
+    return shutil.which('libreoffice') or shutil.which('soffice')
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _props(**kwargs):
+    result = []
+    for name, value in kwargs.items():
+        prop = PropertyValue()
+        prop.Name, prop.Value = name, value
+        result.append(prop)
+    return tuple(result)
+
+
+class OfficeWorker:
+    """상주 LibreOffice 변환 워커 (프로세스 전체에서 1개)"""
+
+    def __init__(self, office_path=None, profile_dir=PROFILE_DIR):
+        self.office_path = office_path or find_office()
+        self.profile_url = Path(profile_dir).resolve().as_uri()
+        self.process = None
+        self.desktop = None
+        self.port = None
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    @property
+    def available(self):
+        return bool(self.office_path)
+
+    # ---------------------------------------------------------------------
+    # 요청 처리
+    # ---------------------------------------------------------------------
+    def convert(self, docx_paths, output_dir, timeout=CONVERT_TIMEOUT):
+        """
+        여러 DOCX를 PDF로 변환 (워커 큐에서 순서대로 처리)
+
+        Returns:
+            list: 입력 순서대로 PDF 경로 (실패한 문서는 None)
+        """
+        if not self.available:
+            return [None] * len(docx_paths)
+        future = Future()
+        self._queue.put((list(docx_paths), output_dir, future))
+        try:
+            return future.result(timeout=timeout + STARTUP_TIMEOUT)
+        except (FutureTimeoutError, subprocess.TimeoutExpired):
+            # 아직 시작 전이면 취소 (호출자가 출력 폴더를 곧 지우므로 변환하지 않음)
+            future.cancel()
+            raise
+
+    def convert_bytes(self, docx_bytes, timeout=CONVERT_TIMEOUT):
+        """DOCX 바이트 -> PDF 바이트 (실패 시 None)"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            docx_path = os.path.join(tmp_dir, "document.docx")
+            with open(docx_path, "wb") as f:
+                f.write(docx_bytes)
+            pdf_path = self.convert([docx_path], tmp_dir, timeout)[0]
+            if not pdf_path:
+                return None
+            with open(pdf_path, "rb") as f:
+                return f.read()
+
+    def _loop(self):
+        while True:
+            docx_paths, output_dir, future = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self._convert(docx_paths, output_dir))
+            except Exception as e:
+                future.set_exception(e)
+
+    def _convert(self, docx_paths, output_dir):
+        if not HAS_UNO:
+            return self._convert_cli(docx_paths, output_dir)
+        try:
+            return self._convert_uno(docx_paths, output_dir)
+        except Exception as e:
+            if not self._office_lost(e):
+                raise
+            # 오피스가 죽었거나 연결이 끊긴 경우에만 재기동 후 1회 재시도
+            print(f"LibreOffice 워커 재시작: {e}")
+            self.shutdown()
+            return self._convert_uno(docx_paths, output_dir)
+
+    def _office_lost(self, error):
+        """오피스 프로세스 종료/UNO 연결 끊김으로 인한 오류인지"""
+        if self.process is None or self.process.poll() is not None:
+            return True
+        return HAS_UNO and isinstance(error, (DisposedException, NoConnectException))
+
+    # ---------------------------------------------------------------------
+    # UNO: 상주 오피스 인스턴스
+    # ---------------------------------------------------------------------
+    def _ensure_office(self):
+        if self.process is not None and self.process.poll() is None and self.desktop is not None:
+            return self.desktop
+
+        self.shutdown()
+        self.port = _free_port()
+        self.process = subprocess.Popen([
+            self.office_path,
+            f"-env:UserInstallation={self.profile_url}",
+            '--headless', '--invisible', '--nologo', '--norestore', '--nodefault',
+            f"--accept=socket,host=127.0.0.1,port={self.port};urp;",
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context)
+        deadline = time.time() + STARTUP_TIMEOUT
+        while True:
+            try:
+                context = resolver.resolve(
+                    f"uno:socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext")
+                break
+            except Exception:
+                if time.time() > deadline or self.process.poll() is not None:
+                    self.shutdown()
+                    raise RuntimeError("LibreOffice를 시작하지 못했습니다.")
+                time.sleep(0.2)
+
+        self.desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context)
+        return self.desktop
+
+    def _convert_uno(self, docx_paths, output_dir):
+        desktop = self._ensure_office()
+        results = []
+        for docx_path in docx_paths:
+            pdf_path = os.path.join(output_dir, os.path.splitext(os.path.basename(docx_path))[0] + ".pdf")
+            try:
+                document = desktop.loadComponentFromURL(
+                    uno.systemPathToFileUrl(os.path.abspath(docx_path)), "_blank", 0, _props(Hidden=True))
+                if document is None:
+                    results.append(None)
+                    continue
+                try:
+                    document.storeToURL(uno.systemPathToFileUrl(os.path.abspath(pdf_path)),
+                                        _props(FilterName="writer_pdf_Export"))
+                finally:
+                    document.close(True)
+            except Exception as e:
+                # 연결 문제는 상위에서 재기동, 문서 오류는 이 문서만 실패 처리
+                if self._office_lost(e):
+                    raise
+                print(f"PDF 변환 실패 ({os.path.basename(docx_path)}): {e}")
+                results.append(None)
+                continue
+            results.append(pdf_path if os.path.exists(pdf_path) else None)
+        return results
+
+    # ---------------------------------------------------------------------
+    # CLI: 전용 프로필 재사용 + 여러 파일 일괄 변환
+    # ---------------------------------------------------------------------
+    def _convert_cli(self, docx_paths, output_dir):
+        subprocess.run([
+            self.office_path,
+            f"-env:UserInstallation={self.profile_url}",
+            '--headless', '--norestore',
+            '--convert-to', 'pdf',
+            '--outdir', output_dir,
+            *docx_paths
+        ], check=True, timeout=CONVERT_TIMEOUT + 10 * len(docx_paths),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        results = []
+        for docx_path in docx_paths:
+            pdf_path = os.path.join(output_dir, os.path.splitext(os.path.basename(docx_path))[0] + ".pdf")
+            results.append(pdf_path if os.path.exists(pdf_path) else None)
+        return results
+
+    def shutdown(self):
+        self.desktop = None
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+
+
+@st.cache_resource
+def get_office_worker():
+    """앱 전체에서 공유되는 변환 워커 (첫 변환 때 오피스 기동)"""
+    if not HAS_UNO:
+        print("uno 모듈 없음: LibreOffice 상주 인스턴스 대신 변환마다 --convert-to 실행")
+    return OfficeWorker()
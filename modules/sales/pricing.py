@@ -1,12 +1,70 @@
-import pandas as pd
+"""
+마진 서비스
+- margin.csv를 1회 로드하여 카테고리 코드/이름 기준 dict로 색인 (조회 O(1))
+- 파일 수정 시각(mtime)이 바뀌면 다음 조회 때 자동 재로드
+"""
+
 import os
+import sys
+import threading
+import pandas as pd
+import streamlit as st
+
+# 경로 설정
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+MARGIN_FILE = os.path.join(root_dir, "data", "sales", "margin.csv")
+DEFAULT_RATE = 0.20
+
+# 비상용 기본 데이터 (파일 못 읽었을 때)
+FALLBACK_MARGINS = pd.DataFrame({
+    "Category_Code": ["GEN", "FUN", "PRE"],
+    "Category_Name": ["General", "Functional", "Premium"],
+    "Margin_Rate": [0.28, 0.45, 0.96],
+    "Logic_Summary": ["기본", "기능성", "프리미엄"],
+    "Benchmark_Company": ["Default", "Default", "Default"],
+})
+
+
+def _to_rate(raw_rate):
+    """마진율 정규화 (0.28 또는 28 -> 0.28)"""
+    raw_rate = float(raw_rate)
+    return raw_rate if raw_rate < 1.0 else raw_rate / 100
+
 
 class MarginCalculator:
-    def __init__(self):
-        # CSV 파일 경로 설정
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        self.csv_path = os.path.join(current_dir, '..', '..', 'data', 'sales', 'margin.csv')
-        self.margins = self.load_margins()
+    """카테고리별 마진율 조회 (프로세스 전체에서 공유)"""
+
+    def __init__(self, csv_path=MARGIN_FILE):
+        self.csv_path = csv_path
+        self._mtime = None
+        self._lock = threading.Lock()
+        self.margins = FALLBACK_MARGINS
+        self.by_code = {}
+        self.by_name = {}
+        self._reload_if_changed()
+
+    def _reload_if_changed(self):
+        try:
+            mtime = os.path.getmtime(self.csv_path)
+        except OSError:
+            mtime = None
+        if mtime == self._mtime and self.by_code:
+            return
+        with self._lock:
+            if mtime == self._mtime and self.by_code:
+                return
+            margins = self.load_margins()
+            records = margins.to_dict("records")
+            for rec in records:
+                rec["rate"] = _to_rate(rec["Margin_Rate"])
+            self.margins = margins
+            self.by_code = {rec["Category_Code"]: rec for rec in records}
+            self.by_name = {rec["Category_Name"]: rec for rec in records}
+            self._mtime = mtime
 
     def load_margins(self):
         try:
@@ -14,35 +72,33 @@ class MarginCalculator:
             # 혹시 모를 공백 제거 (안전장치)
             df.columns = df.columns.str.strip()
             return df
-        except Exception as e:
-            # 비상용 기본 데이터 (파일 못 읽었을 때)
-            return pd.DataFrame({
-                "Category_Code": ["GEN", "FUN", "PRE"],
-                "Margin_Rate": [0.28, 0.45, 0.96],
-                "Logic_Summary": ["기본", "기능성", "프리미엄"],
-                "Benchmark_Company": ["Default", "Default", "Default"],
-                "Category_Name": ["General", "Functional", "Premium"]
-            })
+        except Exception:
+            return FALLBACK_MARGINS
+
+    def categories(self):
+        """카테고리 이름 목록 (파일 순서)"""
+        self._reload_if_changed()
+        return list(self.by_name)
+
+    def get(self, category):
+        """카테고리 코드 또는 이름 -> 마진 정보 dict (없으면 None)"""
+        self._reload_if_changed()
+        return self.by_code.get(category) or self.by_name.get(category)
+
+    def rate(self, category):
+        """카테고리 마진율 (0.28 형식, 없으면 기본 20%)"""
+        row = self.get(category)
+        return row["rate"] if row else DEFAULT_RATE
 
     def calculate_price(self, cost, category_code):
         """원가와 카테고리 코드를 받아 판매가 계산"""
-        # [수정] 실제 CSV 컬럼명인 'Category_Code' 사용
-        row = self.margins[self.margins['Category_Code'] == category_code]
-        
-        if row.empty:
-            return cost * 1.2, 20.0, "기본 마진 (데이터 없음)"
-        
-        # [수정] 'Margin_Rate', 'Logic_Summary' 등 실제 컬럼명 매칭
-        raw_rate = row.iloc[0]['Margin_Rate'] # 예: 0.28
-        desc = row.iloc[0]['Logic_Summary']
-        company = row.iloc[0]['Benchmark_Company']
-        
-        # 마진율 계산 (0.28 -> 28%)
-        if raw_rate < 1.0: 
-            rate_percent = raw_rate * 100
-            sales_price = cost * (1 + raw_rate)
-        else:
-            rate_percent = raw_rate
-            sales_price = cost * (1 + raw_rate / 100)
-            
-        return sales_price, rate_percent, f"{desc} ({company} 기준)"
\ No newline at end of file
+        row = self.get(category_code)
+        if row is None:
+            return cost * (1 + DEFAULT_RATE), DEFAULT_RATE * 100, "기본 마진 (데이터 없음)"
+        return cost * (1 + row["rate"]), row["rate"] * 100, f"{row['Logic_Summary']} ({row['Benchmark_Company']} 기준)"
+
+
+@st.cache_resource
+def get_margin_calculator():
+    """세션 간 공유되는 마진 서비스 (margin.csv 변경 시 자동 재로드)"""
+    return MarginCalculator()
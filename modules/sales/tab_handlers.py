@@ -8,9 +8,10 @@ import os
 import io
 import time
 import random
+import hashlib
 import datetime
-import zipfile
 import streamlit as st
+import numpy as np
 import pandas as pd
 from docx import Document
 import tempfile
@@ -30,39 +31,39 @@ try:
 except ImportError:
     HAS_DOCX2PDF = False
 
-import subprocess
-import shutil
+from modules.sales.pdf_converter import get_office_worker
 
-def convert_docx_to_pdf_libreoffice(docx_path, output_dir):
-    """LibreOffice를 사용한 DOCX -> PDF 변환 (클라우드용)"""
+def _convert_preview_pdf(docx_bytes):
+    """미리보기 PDF 변환 (docx2pdf 또는 LibreOffice 상주 워커 사용, 실패 시 None)"""
     try:
-        libreoffice_path = shutil.which('libreoffice') or shutil.which('soffice')
-        if not libreoffice_path:
-            return None
-
-        subprocess.run([
-            libreoffice_path,
-            '--headless',
-            '--convert-to', 'pdf',
-            '--outdir', output_dir,
-            docx_path
-        ], check=True, timeout=60)
-
-        pdf_filename = os.path.basename(docx_path).replace('.docx', '.pdf')
-        pdf_path = os.path.join(output_dir, pdf_filename)
-
-        if os.path.exists(pdf_path):
-            return pdf_path
-        return None
+        if HAS_DOCX2PDF:
+            # 로컬: docx2pdf 사용
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                docx_path = os.path.join(tmp_dir, "preview.docx")
+                pdf_path = os.path.join(tmp_dir, "preview.pdf")
+                with open(docx_path, 'wb') as f:
+                    f.write(docx_bytes)
+                convert(docx_path, pdf_path)
+                with open(pdf_path, 'rb') as f:
+                    return f.read()
+        # 클라우드: LibreOffice 사용 (uno가 없으면 상주 인스턴스 없이 요청마다 soffice 실행)
+        return get_office_worker().convert_bytes(docx_bytes)
     except Exception as e:
-        print(f"LibreOffice 변환 오류: {e}")
+        print(f"PDF 변환 오류: {e}")
         return None
 
 # 모듈 import
-from modules.sales.dashboard import fetch_dashboard_data, draw_candlestick_chart, generate_analysis
-from modules.sales.buyer_search import fetch_buyer_list, generate_dummy_buyer
-from modules.sales.translator import translate_offer_data, COUNTRIES
-from modules.sales.offer_manager import initialize_offer_form, calculate_totals
+from modules.sales.dashboard import fetch_dashboard_data, candlestick_chart, generate_analysis
+from modules.sales.buyer_search import fetch_buyer_list
+from modules.sales.translator import translate_offer_shared, cached_offer_translation, localize_form_data, localize_items, COUNTRIES
+from modules.sales.offer_preview import render_offer_html
+from modules.sales.offer_manager import initialize_offer_form, current_team
+from modules.sales.offer_ledger import get_offer_ledger, STATUSES
+from modules.sales.offer_export import ExportJob
+from modules.sales.offer_campaign import OfferCampaign, get_transport, DOMAIN_INTERVAL, MAX_ATTEMPTS
+from modules.sales.artifact_cache import get_artifact_cache, artifact_key
+from modules.sales.pricing import get_margin_calculator
+from modules.sales.line_items import price_line_items, format_cents, format_price, MAX_LINE_ITEMS
 
 @st.dialog("📢 [필독] 수출 성공을 위한 바이어 발굴 로드맵", width="large")
 def show_buyer_guide():
@@ -134,6 +135,49 @@ def show_buyer_guide():
     if st.button("확인", type="primary", use_container_width=True):
         st.rerun()
 
+BUYER_PAGE_SIZES = [10, 20, 50]
+LEDGER_PAGE_SIZES = [20, 50, 100]
+LINE_ITEM_COLUMNS = ["Description", "Quantity", "Cost", "Price"]
+
+
+def _filter_buyers(buyers, query):
+    """바이어 리스트 필터 (회사명/업종/설명 부분 일치, 대소문자 무시)"""
+    query = (query or "").strip().lower()
+    if not query:
+        return buyers
+    return [
+        b for b in buyers
+        if query in f"{b.get('Name', '')} {b.get('Business', '')} {b.get('Desc', '')}".lower()
+    ]
+
+
+def _toggle_buyer(buyer_id, check_key):
+    """체크박스 변경 시 선택 집합 갱신 (O(1))"""
+    if st.session_state[check_key]:
+        st.session_state.selected_buyer_ids.add(buyer_id)
+    else:
+        st.session_state.selected_buyer_ids.discard(buyer_id)
+
+
+def _load_line_items(uploaded_file):
+    """업로드한 CSV -> 품목 입력 테이블 (컬럼명은 대소문자/공백 무시)"""
+    df = pd.read_csv(uploaded_file, dtype=str, keep_default_na=False)
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    if not {"description", "quantity", "cost"} <= set(df.columns):
+        raise ValueError("CSV에 Description, Quantity, Cost 컬럼이 필요합니다.")
+    if len(df) > MAX_LINE_ITEMS:
+        raise ValueError(f"품목은 최대 {MAX_LINE_ITEMS:,}개까지 불러올 수 있습니다.")
+    return pd.DataFrame({col: df[col.lower()] if col.lower() in df.columns else "" for col in LINE_ITEM_COLUMNS})
+
+
+def _reset_ledger_page():
+    """원장 필터/검색/페이지 크기 변경 시 첫 페이지로 (편집 중 내용도 폐기)"""
+    st.session_state.ledger_page = 0
+    # edited_rows는 행 위치 기준이므로 결과 집합이 바뀌면 다른 오퍼에 저장될 수 있음
+    for key in [k for k in st.session_state if str(k).startswith("ledger_editor_")]:
+        del st.session_state[key]
+
+
 def run_market_research():
     """Tab 1: 시장조사 & 바이어 발굴 (기존 Step 1-2 통합)"""
 
@@ -160,6 +204,7 @@ def run_market_research():
                     time.sleep(0.5)
                     s.update(label="완료!", state="complete", expanded=False)
                 st.session_state.buyer_list = fetch_buyer_list(product, country)
+                st.session_state.buyer_page = 0
                 st.success(f"{len(st.session_state.buyer_list)}개 바이어 발견! 아래에서 선택하세요.")
                 st.rerun()
             else:
@@ -187,7 +232,7 @@ def run_market_research():
     </div>""", unsafe_allow_html=True)
 
         if not dash['exchange']['history'].empty:
-            st.plotly_chart(draw_candlestick_chart(dash['exchange']['history']),
+            st.plotly_chart(candlestick_chart(dash['exchange']['history']),
                           use_container_width=True, config={'displayModeBar': False})
             st.markdown(f"""<div class="chart-comment">{generate_analysis("exchange", ex_change_pct)}</div>""",
                    unsafe_allow_html=True)
@@ -206,7 +251,7 @@ def run_market_research():
     </div>""", unsafe_allow_html=True)
 
         if not dash['oil']['history'].empty:
-            st.plotly_chart(draw_candlestick_chart(dash['oil']['history']),
+            st.plotly_chart(candlestick_chart(dash['oil']['history']),
                           use_container_width=True, config={'displayModeBar': False})
             st.markdown(f"""<div class="chart-comment">{generate_analysis("oil", oil_change_pct)}</div>""",
                    unsafe_allow_html=True)
@@ -230,68 +275,170 @@ def run_market_research():
         st.markdown(f"### {st.session_state.target_country} 유력 바이어 리스트")
         st.info("오퍼를 발송할 업체들을 왼쪽 체크박스로 선택해 주세요.")
 
-        if 'selected_buyer_ids' not in st.session_state:
-            st.session_state.selected_buyer_ids = []
-
-        for b in st.session_state.buyer_list:
+        if not isinstance(st.session_state.get('selected_buyer_ids'), set):
+            st.session_state.selected_buyer_ids = set(st.session_state.get('selected_buyer_ids', []))
+        selected_ids = st.session_state.selected_buyer_ids
+
+        # 필터 & 페이지 설정 (현재 페이지만 렌더링)
+        f1, f2, f3, f4 = st.columns([3, 1.2, 1.2, 1.2], vertical_alignment="bottom")
+        buyer_filter = f1.text_input("바이어 필터", placeholder="회사명/업종/설명 검색", key="buyer_filter")
+        page_size = f2.selectbox("페이지당", BUYER_PAGE_SIZES, index=1, key="buyer_page_size")
+
+        filtered = _filter_buyers(st.session_state.buyer_list, buyer_filter)
+        filtered_ids = [b['id'] for b in filtered]
+        with f3:
+            if st.button("필터 결과 전체 선택", use_container_width=True):
+                selected_ids.update(filtered_ids)
+        with f4:
+            if st.button("필터 결과 선택 해제", use_container_width=True):
+                selected_ids.difference_update(filtered_ids)
+
+        n_pages = max(1, -(-len(filtered) // page_size))
+        page = min(st.session_state.get('buyer_page', 0), n_pages - 1)
+        page_buyers = filtered[page * page_size:(page + 1) * page_size]
+        st.caption(f"{len(filtered)}개 바이어 중 {page * page_size + 1 if filtered else 0}-{page * page_size + len(page_buyers)} 표시 · {len(selected_ids)}개 선택됨")
+
+        for b in page_buyers:
+            check_key = f"check_{b['id']}"
+            # 위젯 상태를 선택 집합과 동기화 (전체 선택/해제 반영)
+            st.session_state[check_key] = b['id'] in selected_ids
             with st.container():
                 c0, c1 = st.columns([0.3, 5])
 
                 with c0:
                     st.markdown("<div style='height:45px'></div>", unsafe_allow_html=True)
-                    is_checked = st.checkbox("", key=f"check_{b['id']}",
-                                           value=b['id'] in st.session_state.selected_buyer_ids)
-
-                    if is_checked:
-                        if b['id'] not in st.session_state.selected_buyer_ids:
-                            st.session_state.selected_buyer_ids.append(b['id'])
-                    else:
-                        if b['id'] in st.session_state.selected_buyer_ids:
-                            st.session_state.selected_buyer_ids.remove(b['id'])
+                    st.checkbox("선택", key=check_key, label_visibility="collapsed", on_change=_toggle_buyer, args=(b["id"], check_key))
 
                 with c1:
+                    score_badge = f"<span class=\"fin-badge\">관련도 {b['Score']:.2f}</span>" if b.get('Score') else ""
                     st.markdown(f"""
                         <div class="buyer-card">
                             <div class="buyer-title">{b['Name']}</div>
                             <div style="margin-bottom:8px;">
                                 <span class="fin-badge">{b['Business']}</span>
                                 <span class="fin-badge">{b.get('Revenue', 'N/A')}</span>
+                                {score_badge}
                             </div>
                             <div style="font-size:0.95rem; color:#334155; margin-bottom:5px;">{b['Desc']}</div>
                             <div style="color:#2563EB; font-weight:600;">{b['Email']}</div>
                         </div>
                     """, unsafe_allow_html=True)
 
+        # 페이지 이동
+        if n_pages > 1:
+            p1, p2, p3 = st.columns([1, 2, 1], vertical_alignment="center")
+            with p1:
+                if st.button("◀ 이전", use_container_width=True, disabled=page == 0):
+                    st.session_state.buyer_page = page - 1
+                    st.rerun()
+            p2.markdown(f"<div style='text-align:center;'>{page + 1} / {n_pages} 페이지</div>", unsafe_allow_html=True)
+            with p3:
+                if st.button("다음 ▶", use_container_width=True, disabled=page >= n_pages - 1):
+                    st.session_state.buyer_page = page + 1
+                    st.rerun()
+
         st.markdown("---")
 
         col_btn1, col_btn2 = st.columns(2)
         with col_btn1:
             if st.button("추가 바이어 정보 검색하기", use_container_width=True):
                 with st.spinner("탐색 중..."):
-                    time.sleep(1)
-                    new_buyers = []
-                    for i in range(5):
-                        new_buyers.append(generate_dummy_buyer(
-                            st.session_state.target_product,
-                            st.session_state.target_country,
-                            len(st.session_state.buyer_list) + 100 + i
-                        ))
-                    st.session_state.buyer_list.extend(new_buyers)
+                    # 디렉터리의 다음 순위 바이어 (소진되면 더미 보충)
+                    known_ids = {b['id'] for b in st.session_state.buyer_list}
+                    new_buyers = fetch_buyer_list(
+                        st.session_state.target_product,
+                        st.session_state.target_country,
+                        offset=len([i for i in known_ids if not str(i).startswith("D")]),
+                    )
+                    st.session_state.buyer_list.extend(b for b in new_buyers if b['id'] not in known_ids)
                     st.rerun()
 
         with col_btn2:
-            selected_count = len(st.session_state.selected_buyer_ids)
+            selected_count = len(selected_ids)
             if st.button(f"{selected_count}개 업체 선택 완료", type="primary", use_container_width=True):
                 if selected_count > 0:
                     st.session_state.selected_buyers_full = [
                         b for b in st.session_state.buyer_list
-                        if b['id'] in st.session_state.selected_buyer_ids
+                        if b['id'] in selected_ids
                     ]
                     st.success(f"{selected_count}개 업체 선택 완료! '오퍼시트 생성' 탭으로 이동하세요.")
                 else:
                     st.warning("최소 한 개 이상의 업체를 선택해 주세요.")
 
 
+@st.fragment(run_every=1.0)
+def _poll_offer_export():
+    """일괄 생성 진행률 표시 (이 영역만 1초마다 갱신, 완료 시 전체 재실행)"""
+    job = st.session_state.get('offer_export_job')
+    if job is None:
+        return
+    if job.running:
+        st.progress(job.done / max(job.total, 1), text=f"서류 생성 중... ({job.done}/{job.total}개 업체)")
+    else:
+        st.rerun()
+
+
+@st.fragment(run_every=1.0)
+def _poll_offer_campaign():
+    """일괄 발송 진행률 표시 (이 영역만 1초마다 갱신, 완료 시 전체 재실행)"""
+    campaign = st.session_state.get('offer_campaign')
+    if campaign is None:
+        return
+    if campaign.running:
+        st.progress(
+            campaign.finished / max(campaign.total, 1),
+            text=f"발송 중... 서류 {campaign.rendered}/{campaign.total} · 완료 {campaign.sent} · "
+                 f"실패 {campaign.failed} · 재시도 {campaign.retries}"
+        )
+    else:
+        st.rerun()
+
+
+def _new_offer_no():
+    """'새 오퍼' 버튼: 다음 실행에서 Offer No를 새로 발급"""
+    st.session_state.pop('offer_no_key', None)
+
+
+def _current_offer_no(date_val, buyers, items):
+    """
+    현재 오퍼의 Offer No
+    - 날짜/수신 바이어/품목(품명, 수량)이 같으면 같은 번호 (미리보기/다운로드 번호 일치)
+    - 하나라도 바뀌면 원장에 없는 번호를 새로 발급
+    """
+    raw = repr((
+        date_val.isoformat(),
+        [(b.get("Name", ""), b.get("Email", "")) for b in buyers],
+        [(it["description"], it["quantity"]) for it in items],
+    ))
+    offer_key = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    if st.session_state.get('offer_no_key') != offer_key or 'offer_no' not in st.session_state:
+        ledger, team = get_offer_ledger(), current_team()
+        prefix = f"NXT-{date_val.strftime('%Y%m%d')}-"
+        offer_no = f"{prefix}{random.randint(100, 999)}"
+        for _ in range(20):
+            if offer_no != st.session_state.get('offer_no') and not ledger.has_offer_no(team, offer_no):
+                break
+            offer_no = f"{prefix}{random.randint(1000, 9999)}"
+        st.session_state['offer_no'] = offer_no
+        st.session_state['offer_no_key'] = offer_key
+    return st.session_state['offer_no']
+
+
+def _build_offer_variants(base_form_data, items, target_language):
+    """영문 + 번역본 오퍼 구성 (공통 번역은 언어당 1회, 바이어별로는 회사명/주소만 치환)"""
+    variants = [("EN", base_form_data, items, None)]
+    if target_language:
+        translated = translate_offer_shared(base_form_data, items, target_language)
+        if translated:
+            variants.append((
+                target_language,
+                localize_form_data(base_form_data, translated),
+                localize_items(items, translated),
+                translated.get('labels', None),
+            ))
+    return variants
+
+
 def run_offer_generator():
     """Tab 2: 오퍼시트 생성"""
     
@@ -336,17 +483,12 @@ def run_offer_generator():
         # 마진율 카드 (컴팩트)
         st.markdown("#### 마진율 설정")
 
-        # 경로 설정
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        root_dir = os.path.dirname(os.path.dirname(current_dir))
-        margin_file = os.path.join(root_dir, "data", "sales", "margin.csv")
-        df_margin = pd.read_csv(margin_file)
-
-        category_options = df_margin['Category_Name'].tolist()
+        margin_calc = get_margin_calculator()
+        category_options = margin_calc.categories()
         selected_category = st.selectbox("카테고리", category_options, label_visibility="collapsed", key="margin_category_select")
 
-        selected_row = df_margin[df_margin['Category_Name'] == selected_category].iloc[0]
-        margin_rate = selected_row['Margin_Rate']
+        selected_row = margin_calc.get(selected_category)
+        margin_rate = selected_row['rate']
 
         # 컴팩트한 정보 표시
         st.markdown(f"""
@@ -357,19 +499,21 @@ def run_offer_generator():
         </div>
         """, unsafe_allow_html=True)
 
-        # 행 개수 조절 (number_input)
-        st.markdown("#### 상품 행 개수")
-        num_items = st.number_input(
-            "Items",
-            min_value=1,
-            max_value=20,
-            value=st.session_state.num_items,
+        # 품목 일괄 입력 (CSV/엑셀에서 복사한 SKU 목록)
+        st.markdown("#### 상품 목록 불러오기")
+        uploaded_items = st.file_uploader(
+            "CSV (Description, Quantity, Cost[, Price])",
+            type=["csv"],
             label_visibility="collapsed",
-            key="num_items_input"
+            key="line_items_upload"
         )
-        if num_items != st.session_state.num_items:
-            st.session_state.num_items = num_items
-            st.rerun()
+        if uploaded_items is not None and st.session_state.get('line_items_file') != uploaded_items.file_id:
+            try:
+                st.session_state['offer_lines'] = _load_line_items(uploaded_items)
+                st.session_state['line_items_file'] = uploaded_items.file_id
+                st.session_state['offer_lines_version'] = st.session_state.get('offer_lines_version', 0) + 1
+            except ValueError as e:
+                st.error(str(e))
 
     # === 왼쪽 패널 ===
     with col_left:
@@ -384,9 +528,6 @@ def run_offer_generator():
             seller_email = st.text_input("Contact Email", value="sales@jjimdak.co.kr", placeholder="email@company.com")
             date_val = st.date_input("Date", value=datetime.date.today())
 
-        # Offer No는 자동 생성
-        offer_no = f"NXT-{date_val.strftime('%Y%m%d')}-{random.randint(100, 999)}"
-
         # 바이어 정보
         if is_multiple:
             messrs = "Mr./Ms."
@@ -414,62 +555,76 @@ def run_offer_generator():
 
         # 상품 정보
         st.markdown('<div class="section-header">상품 정보</div>', unsafe_allow_html=True)
-        st.caption("상품 개수를 우측 컨트롤에서 조정하세요")
-
-        items = []
-
-        hcols = st.columns([0.5, 3, 1.5, 1.5, 1.5])
-        hcols[0].markdown("**No.**")
-        hcols[1].markdown("**Description**")
-        hcols[2].markdown("**Quantity**")
-        hcols[3].markdown("**원가 (Cost)**")
-        hcols[4].markdown("**판매가 (Price)**")
+        st.caption(f"표 아래쪽에서 행을 추가/삭제할 수 있습니다 (최대 {MAX_LINE_ITEMS:,}개). 판매가를 비워 두면 원가에 마진율을 적용합니다.")
 
-        total_cost = 0.0
-        total_revenue = 0.0
+        if 'offer_lines' not in st.session_state:
+            st.session_state['offer_lines'] = pd.DataFrame([{col: "" for col in LINE_ITEM_COLUMNS}] * st.session_state.num_items)
 
-        for i in range(st.session_state.num_items):
-            cols = st.columns([0.5, 3, 1.5, 1.5, 1.5])
-            no = cols[0].text_input(f"no_{i}", value=str(i + 1), label_visibility="collapsed", key=f"no_{i}")
-            desc = cols[1].text_input(f"desc_{i}", placeholder="Product description", label_visibility="collapsed", key=f"desc_{i}")
-            qty = cols[2].text_input(f"qty_{i}", placeholder="1,000 PCS", label_visibility="collapsed", key=f"qty_{i}")
-
-            cost_price = cols[3].text_input(f"cost_{i}", placeholder="5.00", label_visibility="collapsed", key=f"cost_{i}")
-
-            auto_selling_price = ""
-            item_cost = 0.0
-            item_revenue = 0.0
-
-            try:
-                if cost_price:
-                    cost = float(cost_price.replace(",", ""))
-                    selling = cost * (1 + margin_rate)
-                    auto_selling_price = f"{selling:,.2f}"
-
-                    q = float(qty.replace(",", "")) if qty else 0
-                    if q > 0:
-                        item_cost = cost * q
-                        item_revenue = selling * q
-                        total_cost += item_cost
-                        total_revenue += item_revenue
-            except ValueError:
-                pass
-
-            selling_price = cols[4].text_input(
-                f"sell_{i}",
-                value=auto_selling_price,
-                placeholder="자동 계산",
-                label_visibility="collapsed",
-                key=f"sell_{i}"
+        lines_df = st.data_editor(
+            st.session_state['offer_lines'],
+            column_config={
+                "Description": st.column_config.TextColumn("Description", width="large"),
+                "Quantity": st.column_config.TextColumn("Quantity", help="예: 1,000 PCS"),
+                "Cost": st.column_config.TextColumn("원가 (Cost)", help="예: 5.00"),
+                "Price": st.column_config.TextColumn("판매가 (Price)", help="비워 두면 자동 계산"),
+            },
+            num_rows="dynamic",
+            hide_index=True,
+            use_container_width=True,
+            key=f"offer_lines_editor_{st.session_state.get('offer_lines_version', 0)}"
+        ).fillna("")
+
+        # 전체 행 검증/가격 계산 (1회 벡터 연산, 정수 센트 단위)
+        pricing = price_line_items(
+            lines_df["Description"], lines_df["Quantity"], lines_df["Cost"], margin_rate, lines_df["Price"])
+        total_cost = pricing["total_cost"] / 100
+        total_revenue = pricing["total_revenue"] / 100
+
+        valid = pricing["valid"]
+        price_text = np.where(valid, format_price(pricing["price_units"]), lines_df["Price"])
+        amount_text = np.where(valid, format_cents(pricing["amount_cents"]), "")
+
+        if pricing["errors"]:
+            error_lines = ", ".join(f"{row}행: {reason}" for row, reason in pricing["errors"][:5])
+            more = f" 외 {len(pricing['errors']) - 5}건" if len(pricing["errors"]) > 5 else ""
+            st.warning(f"⚠️ 확인이 필요한 품목 {len(pricing['errors'])}건 — {error_lines}{more}")
+        over_cap = len(lines_df) - MAX_LINE_ITEMS
+        if over_cap > 0:
+            st.error(f"❌ 품목은 최대 {MAX_LINE_ITEMS:,}개까지 반영됩니다. {MAX_LINE_ITEMS + 1:,}행 이후 {over_cap:,}개 행은 계산/서류에서 제외되었습니다.")
+
+        with st.expander(f"💲 품목별 판매가/금액 ({int(valid.sum()):,}개 계산됨)", expanded=bool(valid.any()) and len(lines_df) <= 20):
+            st.dataframe(
+                pd.DataFrame({
+                    "Description": lines_df["Description"],
+                    "Quantity": lines_df["Quantity"],
+                    "판매가 (Price)": price_text,
+                    "금액 (Amount)": amount_text,
+                }),
+                hide_index=True,
+                use_container_width=True
             )
 
-            items.append({
-                "no": no,
+        # 서류용 품목 (품명이 있는 행만, 번호는 순서대로)
+        items = [
+            {
+                "no": str(no),
                 "description": desc,
                 "quantity": qty,
-                "unit_price": selling_price,
-                "amount": f"{item_revenue:,.2f}" if item_revenue > 0 else ""
-            })
+                "unit_price": price,
+                "amount": amount,
+            }
+            for no, (desc, qty, price, amount) in enumerate(
+                ((d, q, p, a) for d, q, p, a in zip(lines_df["Description"].iloc[:MAX_LINE_ITEMS], lines_df["Quantity"],
+                                                    price_text, amount_text)
+                 if str(d).strip()),
+                start=1)
+        ]
+
+        # Offer No (같은 오퍼를 수정하는 동안 유지, 바이어/품목이 바뀌거나 '새 오퍼'를 누르면 새로 발급)
+        offer_no = _current_offer_no(date_val, selected_buyers or [{"Name": buyer_company}], items)
+        c_no, c_new = st.columns([3, 1])
+        c_no.caption(f"Offer No: **{offer_no}**")
+        c_new.button("🆕 새 오퍼", on_click=_new_offer_no, use_container_width=True, key="new_offer_no")
 
         # 분쟁 해결 조항
         st.markdown('<div class="section-header">⚖️ 분쟁 해결 조항 (Dispute Resolution)</div>', unsafe_allow_html=True)
@@ -511,9 +666,9 @@ def run_offer_generator():
 
     # === 우측 패널 - 요약 메트릭 ===
     with col_right:
-        # 이익 계산
-        total_profit = total_revenue - total_cost
-        profit_rate = (total_profit / total_cost * 100) if total_cost > 0 else 0
+        # 이익 계산 (센트 단위 합계 기준)
+        total_profit = pricing["total_profit"] / 100
+        profit_rate = pricing["profit_rate"]
 
         st.markdown("#### 견적 요약")
         st.metric("총 원가", f"${total_cost:,.2f}")
@@ -529,131 +684,100 @@ def run_offer_generator():
     # ★★★ [미리보기 섹션] ★★★
     st.markdown("### 👀 서류 미리보기")
 
-    if st.button("🔍 미리보기 생성", use_container_width=True, type="primary"):
-        with st.spinner("미리보기 생성 중..."):
+    # 미리보기용 데이터 준비
+    preview_target = selected_buyers[0] if selected_buyers else {"Name": buyer_company, "Email": address_attn}
+
+    preview_form_data = {
+        "seller_name": seller_name,
+        "seller_addr": address_attn,
+        "seller_email": seller_email,
+        "buyer_company": preview_target["Name"],
+        "address_attn": preview_target.get("Email", address_attn),
+        "offer_no": offer_no,
+        "date": date_val.strftime("%B %d, %Y"),
+        "origin": origin or "Republic of Korea",
+        "shipment": shipment or "Within 30 days",
+        "loading_port": loading_port or "Busan, Korea",
+        "destination": destination or "TBD",
+        "payment": payment or "L/C at sight",
+        "packing": packing or "Standard export packing",
+        "insurance": insurance or "110% CIF",
+        "validity": validity or "30 days",
+        "dispute_resolution": dispute_full_text,
+        "governing_law": gov_law or "Laws of Republic of Korea",
+        "total_amount": total_amount_input,
+    }
+
+    # 실시간 HTML 미리보기 (입력값 변경 시 즉시 갱신, DOCX/PDF 변환 없음)
+    live_form_data, live_items, live_labels = preview_form_data, items, None
+    if target_language:
+        # 이미 번역된 내용이면 번역본으로 표시 (API 호출 없음)
+        cached_translation = cached_offer_translation(preview_form_data, items, target_language)
+        if cached_translation:
+            live_labels = cached_translation.get('labels', None)
+            live_form_data = localize_form_data(preview_form_data, cached_translation)
+            live_items = localize_items(items, cached_translation)
+        else:
+            st.caption(f"💡 {target_language} 번역본은 아래 'Word/PDF 생성' 후 미리보기에 반영됩니다. (현재 영문)")
+    with st.expander("실시간 미리보기 (HTML)", expanded=True):
+        st.markdown(render_offer_html(live_form_data, live_items, live_labels), unsafe_allow_html=True)
+
+    if st.button("📄 Word/PDF 생성", use_container_width=True, type="primary"):
+        with st.spinner("Word/PDF 생성 중..."):
             try:
-                # 미리보기용 데이터 준비
-                preview_target = selected_buyers[0] if selected_buyers else {"Name": buyer_company, "Email": address_attn}
-                
-                preview_form_data = {
-                    "seller_name": seller_name,
-                    "seller_addr": address_attn,
-                    "seller_email": seller_email,
-                    "buyer_company": preview_target["Name"],
-                    "address_attn": preview_target.get("Email", address_attn),
-                    "offer_no": offer_no,
-                    "date": date_val.strftime("%B %d, %Y"),
-                    "origin": origin or "Republic of Korea",
-                    "shipment": shipment or "Within 30 days",
-                    "loading_port": loading_port or "Busan, Korea",
-                    "destination": destination or "TBD",
-                    "payment": payment or "L/C at sight",
-                    "packing": packing or "Standard export packing",
-                    "insurance": insurance or "110% CIF",
-                    "validity": validity or "30 days",
-                    "dispute_resolution": dispute_full_text,
-                    "governing_law": gov_law or "Laws of Republic of Korea",
-                    "total_amount": total_amount_input,
-                }
-                
                 preview_labels = None
                 preview_items = items
                 
-                # 번역이 필요한 경우 처리
+                # 번역이 필요한 경우 처리 (공통 번역 캐시 사용)
                 if target_language:
-                    translated = translate_offer_data(preview_form_data, items, target_language)
+                    translated = translate_offer_shared(preview_form_data, items, target_language)
                     if translated:
                         preview_labels = translated.get('labels', None)
-                        
-                        # 번역된 form_data로 업데이트
-                        preview_form_data = {
-                            "seller_name": seller_name,
-                            "seller_addr": address_attn,
-                            "seller_email": seller_email,
-                            "buyer_company": translated['values'].get('buyer_company', preview_target['Name']),
-                            "address_attn": translated['values'].get('address_attn', preview_target.get("Email", "")),
-                            "offer_no": translated['values'].get('offer_no', offer_no),
-                            "date": translated['values'].get('date', date_val.strftime("%B %d, %Y")),
-                            "origin": translated['values'].get('origin', origin),
-                            "shipment": translated['values'].get('shipment', shipment),
-                            "loading_port": translated['values'].get('loading_port', loading_port),
-                            "destination": translated['values'].get('destination', destination),
-                            "payment": translated['values'].get('payment', payment),
-                            "packing": translated['values'].get('packing', packing),
-                            "insurance": translated['values'].get('insurance', insurance),
-                            "validity": translated['values'].get('validity', validity),
-                            "dispute_resolution": translated['values'].get('arbitration', dispute_full_text),
-                            "governing_law": translated['values'].get('governing_law', gov_law),
-                            "total_amount": translated['values'].get('total_amount', total_amount_input),
-                        }
-                        
-                        # 번역된 items 생성
-                        preview_items = []
-                        for trans_item in translated.get('items', []):
-                            preview_items.append({
-                                "no": trans_item.get('no', ''),
-                                "description": trans_item.get('description', ''),
-                                "quantity": trans_item.get('quantity', ''),
-                                "unit_price": trans_item.get('unit_price', ''),
-                                "amount": trans_item.get('amount', '')
-                            })
+                        preview_form_data = localize_form_data(preview_form_data, translated)
+                        preview_items = localize_items(items, translated)
                 
-                # Word 문서 생성
-                doc_buf = create_offer_sheet(preview_form_data, preview_items, signature_img=None, labels=preview_labels)
-
-                # 세션에 Word 파일 저장
-                st.session_state['preview_docx'] = doc_buf.getvalue()
+                # 동일 입력이면 캐시된 Word/PDF 재사용 (세션 간 공유)
+                cache = get_artifact_cache()
+                preview_key = artifact_key(preview_form_data, preview_items, preview_labels)
+                docx_bytes = cache.get(preview_key, "docx")
+                if docx_bytes is None:
+                    docx_bytes = create_offer_sheet(preview_form_data, preview_items, signature_img=None, labels=preview_labels).getvalue()
+                    cache.put(preview_key, "docx", docx_bytes)
+
+                if cache.get(preview_key, "pdf") is None:
+                    pdf_bytes = _convert_preview_pdf(docx_bytes)
+                    if pdf_bytes:
+                        cache.put(preview_key, "pdf", pdf_bytes)
+
+                # 세션에는 캐시 키만 저장
+                st.session_state['preview_key'] = preview_key
                 lang_suffix = f"_{target_language}" if target_language else "_EN"
                 st.session_state['preview_filename'] = f"Preview_OfferSheet_{offer_no}{lang_suffix}"
 
-                # PDF 변환 (docx2pdf 또는 LibreOffice 사용)
-                try:
-                    with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp_docx:
-                        tmp_docx.write(doc_buf.getvalue())
-                        docx_path = tmp_docx.name
-
-                    output_dir = os.path.dirname(docx_path)
-
-                    if HAS_DOCX2PDF:
-                        # 로컬: docx2pdf 사용
-                        pdf_path = docx_path.replace('.docx', '.pdf')
-                        convert(docx_path, pdf_path)
-                    else:
-                        # 클라우드: LibreOffice 사용
-                        pdf_path = convert_docx_to_pdf_libreoffice(docx_path, output_dir)
-
-                    if pdf_path and os.path.exists(pdf_path):
-                        with open(pdf_path, 'rb') as f:
-                            st.session_state['preview_pdf'] = f.read()
-                        os.unlink(pdf_path)
-                    else:
-                        st.session_state['preview_pdf'] = None
-
-                    os.unlink(docx_path)
-                except Exception as e:
-                    print(f"PDF 변환 오류: {e}")
-                    st.session_state['preview_pdf'] = None
-
-                st.success("✅ 미리보기 생성 완료!")
+                st.success("✅ Word/PDF 생성 완료!")
                 
             except Exception as e:
                 st.error(f"미리보기 생성 실패: {e}")
                 st.exception(e)
 
     # PDF 미리보기 표시
-    if 'preview_pdf' in st.session_state and st.session_state['preview_pdf']:
+    preview_key = st.session_state.get('preview_key')
+    preview_pdf = get_artifact_cache().get(preview_key, "pdf") if preview_key else None
+    preview_docx = get_artifact_cache().get(preview_key, "docx") if preview_key and not preview_pdf else None
+
+    if preview_pdf:
         st.markdown("---")
         st.markdown("#### 📄 문서 미리보기")
 
         # streamlit-pdf-viewer 사용 (브라우저 보안 문제 없음)
         if HAS_PDF_VIEWER:
-            pdf_viewer(st.session_state['preview_pdf'], height=800)
+            pdf_viewer(preview_pdf, height=800)
         else:
             # fallback: 다운로드 버튼만 표시
             st.info("💡 PDF 뷰어가 설치되지 않았습니다. 파일을 다운로드하세요.")
             st.download_button(
                 label="📥 PDF 다운로드",
-                data=st.session_state['preview_pdf'],
+                data=preview_pdf,
                 file_name=f"{st.session_state.get('preview_filename', 'Preview')}.pdf",
                 mime="application/pdf",
                 use_container_width=True,
@@ -662,14 +786,14 @@ def run_offer_generator():
             )
 
         st.markdown("---")
-    elif 'preview_docx' in st.session_state:
+    elif preview_docx:
         st.markdown("---")
         st.info("💡 PDF 변환이 지원되지 않는 환경입니다. Word 파일을 다운로드하세요.")
 
         # Word 다운로드만 표시
         st.download_button(
             label="📥 Word 다운로드",
-            data=st.session_state['preview_docx'],
+            data=preview_docx,
             file_name=f"{st.session_state.get('preview_filename', 'Preview')}.docx",
             mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
             use_container_width=True,
@@ -699,97 +823,54 @@ def run_offer_generator():
     </div>
     """, unsafe_allow_html=True)
     
+    base_form_data = {
+        "seller_name": seller_name,
+        "seller_addr": address_attn,
+        "seller_email": seller_email,
+        "buyer_company": "",
+        "address_attn": "",
+        "offer_no": offer_no,
+        "date": date_val.strftime("%B %d, %Y"),
+        "origin": origin,
+        "shipment": shipment,
+        "loading_port": loading_port,
+        "destination": destination,
+        "payment": payment,
+        "packing": packing,
+        "insurance": insurance,
+        "validity": validity,
+        "dispute_resolution": dispute_full_text,
+        "governing_law": gov_law,
+        "total_amount": total_amount_input,
+    }
+
     # 작성 Offer Sheet 다운로드 버튼
     if st.button("작성 Offer Sheet 다운로드", use_container_width=True, type="primary"):
-        # ... (기존 코드 그대로, 들여쓰기만 맞춤)
         targets = selected_buyers if selected_buyers else [{"Name": buyer_company, "Email": address_attn}]
-
-        zip_buffer = io.BytesIO()
-
-        with st.spinner("서류 생성 중..."):
-            with zipfile.ZipFile(zip_buffer, "a", zipfile.ZIP_DEFLATED) as zf:
-                for target in targets:
-                    current_form_data = {
-                        "seller_name": seller_name,
-                        "seller_addr": address_attn,
-                        "seller_email": seller_email,
-                        "buyer_company": target["Name"],
-                        "address_attn": target.get("Email", ""),
-                        "offer_no": offer_no,
-                        "date": date_val.strftime("%B %d, %Y"),
-                        "origin": origin,
-                        "shipment": shipment,
-                        "loading_port": loading_port,
-                        "destination": destination,
-                        "payment": payment,
-                        "packing": packing,
-                        "insurance": insurance,
-                        "validity": validity,
-                        "dispute_resolution": dispute_full_text,
-                        "governing_law": gov_law,
-                        "total_amount": total_amount_input,
-                    }
-
-                    # ========== [1] 영어 파일 생성 (항상) ==========
-                    en_buf = create_offer_sheet(current_form_data, items, signature_img=None)
-                    zf.writestr(f"OfferSheet_{target['Name']}_EN.docx", en_buf.getvalue())
-
-                    # ========== [2] 번역 파일 생성 (선택 시) ==========
-                    if target_language:
-                        translated = translate_offer_data(current_form_data, items, target_language)
-                        if translated:
-                            # 번역된 form_data 생성
-                            translated_form_data = {
-                                "seller_name": seller_name,
-                                "seller_addr": address_attn,
-                                "seller_email": seller_email,
-                                "buyer_company": translated['values'].get('buyer_company', target['Name']),
-                                "address_attn": translated['values'].get('address_attn', target.get("Email", "")),
-                                "offer_no": translated['values'].get('offer_no', offer_no),
-                                "date": translated['values'].get('date', date_val.strftime("%B %d, %Y")),
-                                "origin": translated['values'].get('origin', ''),
-                                "shipment": translated['values'].get('shipment', ''),
-                                "loading_port": translated['values'].get('loading_port', ''),
-                                "destination": translated['values'].get('destination', ''),
-                                "payment": translated['values'].get('payment', ''),
-                                "packing": translated['values'].get('packing', ''),
-                                "insurance": translated['values'].get('insurance', ''),
-                                "validity": translated['values'].get('validity', ''),
-                                "dispute_resolution": translated['values'].get('arbitration', dispute_full_text),
-                                "governing_law": translated['values'].get('governing_law', gov_law),
-                                "total_amount": translated['values'].get('total_amount', total_amount_input),
-                            }
-                            
-                            # 번역된 items 생성
-                            translated_items = []
-                            for trans_item in translated.get('items', []):
-                                translated_items.append({
-                                    "no": trans_item.get('no', ''),
-                                    "description": trans_item.get('description', ''),
-                                    "quantity": trans_item.get('quantity', ''),
-                                    "unit_price": trans_item.get('unit_price', ''),
-                                    "amount": trans_item.get('amount', '')
-                                })
-                            
-                            # 번역된 라벨 추출
-                            translated_labels = translated.get('labels', None)
-                            
-                            # 전문 양식으로 번역 파일 생성 (라벨 포함!)
-                            tr_buf = create_offer_sheet(translated_form_data, translated_items, signature_img=None, labels=translated_labels)
-                            zf.writestr(f"OfferSheet_{target['Name']}_{target_language}.docx", tr_buf.getvalue())
-
-        zip_buffer.seek(0)
-        st.download_button(
-            label="📥 Offer Sheet 다운로드 (ZIP)",
-            data=zip_buffer.getvalue(),
-            file_name=f"Offers_{date_val.strftime('%Y%m%d')}.zip",
-            mime="application/zip",
-            use_container_width=True,
-            key="download_offer_zip"
-        )
-        st.success("✅ 서류 생성 완료! 위 버튼을 눌러 다운로드하세요.")
+        variants = _build_offer_variants(base_form_data, items, target_language)
+
+        # 문서 생성/압축은 백그라운드에서 진행 (UI 차단 없음)
+        st.session_state['offer_export_job'] = ExportJob(variants, targets).start()
+        st.session_state['offer_export_name'] = f"Offers_{date_val.strftime('%Y%m%d')}.zip"
+
+    export_job = st.session_state.get('offer_export_job')
+    if export_job is not None:
+        if export_job.running:
+            _poll_offer_export()
+        elif export_job.error:
+            st.error(f"서류 생성 오류: {export_job.error}")
+        else:
+            st.download_button(
+                label="📥 Offer Sheet 다운로드 (ZIP)",
+                data=export_job.open,
+                file_name=st.session_state.get('offer_export_name', "Offers.zip"),
+                mime="application/zip",
+                use_container_width=True,
+                key="download_offer_zip"
+            )
+            st.success(f"✅ 서류 생성 완료! ({export_job.total}개 업체) 위 버튼을 눌러 다운로드하세요.")
     
-    # ★★★★★ [자동 송부 기능 추가] ★★★★★
+    # ★★★★★ [자동 송부 - 일괄 발송 캠페인] ★★★★★
     st.markdown("---")
     st.markdown("### 📧 Offer Sheet 자동 송부")
     
@@ -798,27 +879,48 @@ def run_offer_generator():
     
     if selected_buyers_for_send:
         st.success(f"✅ {len(selected_buyers_for_send)}개 바이어가 선택되었습니다.")
-        
-        for buyer in selected_buyers_for_send:
-            buyer_name = buyer.get('Name', '선택된 바이어')
-            buyer_email = buyer.get('Email', 'N/A')
-            
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.write(f"**{buyer_name}** ({buyer_email})")
-            with col2:
-                if st.button(f"📧 송부", key=f"send_{buyer.get('id', 0)}", type="primary", use_container_width=True):
-                    # 송부 완료 알림
-                    st.success(f"✅ **{buyer_name}** 에 Offer Sheet를 송부하였습니다!")
-                    st.balloons()
-                    
-                    # 상세 정보 표시
-                    with st.expander("📬 송부 상세 정보", expanded=True):
-                        st.write(f"**수신 회사:** {buyer_name}")
-                        st.write(f"**수신 이메일:** {buyer_email}")
-                        st.write(f"**송부 일시:** {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                        st.write(f"**Offer No:** {offer_no}")
-                        st.write(f"**첨부 파일:** OfferSheet_{buyer_name}_{datetime.date.today().strftime('%Y%m%d')}.zip")
+
+        with st.expander(f"📋 수신 바이어 목록 ({len(selected_buyers_for_send)}곳)"):
+            st.dataframe(pd.DataFrame([{
+                "바이어": b.get('Name', ''),
+                "이메일": b.get('Email', ''),
+                "국가": b.get('Country', ''),
+            } for b in selected_buyers_for_send]), hide_index=True, use_container_width=True)
+
+        mail_subject = st.text_input("메일 제목", value=f"[{seller_name}] Offer Sheet {offer_no}", key="campaign_subject")
+        mail_body = st.text_area(
+            "메일 본문",
+            value=f"Dear Sir/Madam,\n\nPlease find attached our offer sheet ({offer_no}).\n\nBest regards,\n{seller_name}\n{seller_email}",
+            key="campaign_body"
+        )
+
+        transport = get_transport()
+        st.caption(f"발송 방식: {transport.description} · 도메인별 간격 {DOMAIN_INTERVAL:.0f}초 · 실패 시 최대 {MAX_ATTEMPTS}회 재시도")
+
+        campaign = st.session_state.get('offer_campaign')
+        if st.button(f"📧 전체 송부 ({len(selected_buyers_for_send)}곳)", type="primary", use_container_width=True,
+                     disabled=campaign is not None and campaign.running, key="start_campaign"):
+            variants = _build_offer_variants(base_form_data, items, target_language)
+            # 렌더링/발송/원장 기록은 백그라운드에서 진행 (UI는 진행률만 폴링)
+            campaign = OfferCampaign(
+                variants, selected_buyers_for_send, transport,
+                sender=seller_email, subject=mail_subject, body=mail_body,
+                ledger=get_offer_ledger(), team=current_team(),
+                offer={"offer_no": offer_no, "amount": total_revenue},
+            ).start()
+            st.session_state['offer_campaign'] = campaign
+
+        if campaign is not None:
+            if campaign.running:
+                _poll_offer_campaign()
+            else:
+                if campaign.sent:
+                    st.success(f"✅ {campaign.sent}곳에 Offer Sheet를 송부하였습니다! (발송 내역은 '서류 작성 & 추적' 탭에서 확인)")
+                if campaign.failed:
+                    st.error(f"❌ {campaign.failed}곳 발송 실패")
+                    with st.expander("실패 상세"):
+                        st.dataframe(pd.DataFrame(campaign.failures, columns=["바이어", "사유"]),
+                                     hide_index=True, use_container_width=True)
     else:
         st.warning("⚠️ 선택된 바이어가 없습니다.")
         st.info("💡 **Tab1 (시장조사 & 바이어)**에서 바이어를 먼저 선택해주세요.")
@@ -852,46 +954,106 @@ def run_document_center():
 
     st.markdown("---")
 
-    # 발송 내역 추적
+    # 발송 내역 추적 (오퍼 원장에서 필터/페이지 단위로 조회)
     st.markdown("### 발송 내역 추적")
 
-    if 'sent_offers' not in st.session_state:
-        st.session_state.sent_offers = []
-
-    if not st.session_state.sent_offers:
-        st.info("아직 발송된 오퍼가 없습니다.")
-    else:
-        df = pd.DataFrame(st.session_state.sent_offers)
-
+    ledger = get_offer_ledger()
+    team = current_team()
+
+    # 퍼널/파이프라인 KPI (트리거로 유지되는 집계 테이블 조회)
+    metrics = ledger.metrics(team)
+    if metrics["total"]:
+        k1, k2, k3, k4 = st.columns(4)
+        k1.metric("발송", f"{metrics['funnel']['Sent']:,}건")
+        k2.metric("열람 전환율", f"{metrics['view_rate']:.1f}%", f"{metrics['funnel']['Viewed']:,}건", delta_color="off")
+        k3.metric("수주 전환율", f"{metrics['accept_rate']:.1f}%", f"{metrics['funnel']['Accepted']:,}건", delta_color="off")
+        open_amount = sum(bucket["amount"] for bucket in metrics["ageing"].values())
+        k4.metric("진행 중 금액", f"${open_amount:,.0f}")
+
+        with st.expander("📊 상태별 금액 · 국가별 · 경과일"):
+            a1, a2, a3 = st.columns(3)
+            with a1:
+                st.dataframe(metrics["by_status"].rename(columns={"n": "건수", "amount": "금액"}),
+                             use_container_width=True)
+            with a2:
+                st.dataframe(metrics["by_country"].rename(columns={"n": "건수", "amount": "금액", "accepted": "수주"}),
+                             use_container_width=True)
+            with a3:
+                st.dataframe(pd.DataFrame(metrics["ageing"]).T.rename(columns={"n": "건수", "amount": "금액"}),
+                             use_container_width=True)
+
+    f1, f2, f3 = st.columns([3, 2, 1])
+    with f1:
         # 상태별 필터
         status_filter = st.multiselect(
             "상태 필터",
-            ["Draft", "Sent", "Viewed", "Accepted", "Rejected"],
-            default=["Sent", "Viewed"]
+            STATUSES,
+            default=["Sent", "Viewed"],
+            on_change=_reset_ledger_page
         )
+    with f2:
+        search = st.text_input("바이어 / Offer No 검색", key="ledger_search", on_change=_reset_ledger_page)
+    with f3:
+        page_size = st.selectbox("페이지당", LEDGER_PAGE_SIZES, index=1, key="ledger_page_size", on_change=_reset_ledger_page)
+
+    notice = st.session_state.pop('ledger_notice', None)
+    if notice:
+        st.success(notice)
+
+    total = ledger.count(team, status_filter, search)
+    if total == 0:
+        st.info("아직 발송된 오퍼가 없습니다." if not ledger.count(team) else "조건에 맞는 오퍼가 없습니다.")
+        return
+
+    n_pages = (total - 1) // page_size + 1
+    page = min(st.session_state.get('ledger_page', 0), n_pages - 1)
+    page_df = ledger.page(team, status_filter, search, offset=page * page_size, limit=page_size)
+
+    # 편집 가능한 데이터프레임 (현재 페이지만)
+    editor_key = f"ledger_editor_{page}_{page_size}"
+    st.data_editor(
+        page_df,
+        column_config={
+            "id": None,
+            "offer_no": st.column_config.TextColumn("Offer No", disabled=True),
+            "status": st.column_config.SelectboxColumn(
+                "상태",
+                options=STATUSES,
+                required=True
+            ),
+            "date": st.column_config.DateColumn("발송일"),
+            "buyer": st.column_config.TextColumn("바이어"),
+            "email": st.column_config.TextColumn("이메일"),
+            "country": st.column_config.TextColumn("국가"),
+            "amount": st.column_config.NumberColumn("금액 (USD)", format="%.2f"),
+            "memo": st.column_config.TextColumn("메모"),
+        },
+        hide_index=True,
+        use_container_width=True,
+        num_rows="fixed",
+        key=editor_key
+    )
+
+    p1, p2, p3, p4 = st.columns([1, 2, 1, 2])
+    if p1.button("◀ 이전", disabled=page == 0, use_container_width=True, key="ledger_prev"):
+        st.session_state.ledger_page = page - 1
+        st.rerun()
+    p2.markdown(f"<div style='text-align:center; padding-top:6px;'>{page + 1} / {n_pages} 페이지 (총 {total:,}건)</div>",
+                unsafe_allow_html=True)
+    if p3.button("다음 ▶", disabled=page >= n_pages - 1, use_container_width=True, key="ledger_next"):
+        st.session_state.ledger_page = page + 1
+        st.rerun()
 
-        if status_filter:
-            filtered_df = df[df['status'].isin(status_filter)]
+    # 변경사항 저장 (바뀐 행/컬럼만 원장에 반영)
+    if p4.button("변경사항 저장", use_container_width=True, key="ledger_save"):
+        edited_rows = st.session_state.get(editor_key, {}).get("edited_rows", {})
+        changes = {int(page_df.iloc[int(pos)]["id"]): values for pos, values in edited_rows.items()}
+        try:
+            updated = ledger.update_rows(team, changes)
+        except ValueError as e:
+            st.error(f"저장 실패: {e}")
         else:
-            filtered_df = df
-
-        # 편집 가능한 데이터프레임
-        edited_df = st.data_editor(
-            filtered_df,
-            column_config={
-                "status": st.column_config.SelectboxColumn(
-                    "상태",
-                    options=["Draft", "Sent", "Viewed", "Accepted", "Rejected"],
-                    required=True
-                ),
-                "date": st.column_config.DateColumn("발송일"),
-                "buyer": st.column_config.TextColumn("바이어"),
-            },
-            hide_index=True,
-            use_container_width=True
-        )
-
-        # 변경사항 저장
-        if st.button("변경사항 저장"):
-            st.session_state.sent_offers = edited_df.to_dict('records')
-            st.success("저장 완료!")
\ No newline at end of file
+            del st.session_state[editor_key]
+            # 재실행 후에 표시 (rerun 직전 메시지는 화면에 남지 않음)
+            st.session_state['ledger_notice'] = f"저장 완료! ({updated}건)"
+            st.rerun()
@@ -0,0 +1,227 @@
+"""
+번역 메모리 & 분할 번역 플래너
+- 문장(품목 설명, 조건 값) 단위 번역 결과를 SQLite에 영구 저장 -> 반복 SKU는 재번역하지 않음
+- 캐시 미스 문장만 토큰 한도 내 청크로 나눠 병렬 번역 후 원래 순서대로 재조립
+- 응답이 잘리거나 JSON이 깨지면 청크를 반으로 나눠 재시도, 끝까지 실패한 문장은 원문 유지
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import streamlit as st
+
+# 경로 설정
+current_dir = os.path.dirname(os.path.abspath(__file__))
+root_dir = os.path.dirname(os.path.dirname(current_dir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from config import get_env
+
+TRANSLATION_DB = os.path.join(root_dir, "data", "sales", "translation_cache.db")
+
+# 청크당 입력 토큰 상한 (출력은 언어에 따라 2~3배까지 늘어나므로 여유 있게)
+CHUNK_TOKENS = 800
+MAX_OUTPUT_TOKENS = 4000
+MAX_WORKERS = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    language    TEXT NOT NULL,
+    source_hash TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    translated  TEXT NOT NULL,
+    created     REAL,
+    PRIMARY KEY (language, source_hash)
+);
+"""
+
+TRANSLATE_RULES = """CRITICAL RULES:
+1. Translate every value completely to {language}
+2. EXCEPTION: Keep the following in English:
+   - Company names
+   - Currency: USD
+   - Trade terms: FOB, CIF, CFR, L/C
+   - Numbers and dates
+3. Return ONLY a JSON object with exactly the same keys"""
+
+
+def _text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def estimate_tokens(text):
+    """대략적인 토큰 수 (UTF-8 바이트 / 4, 한글·CJK는 크게 잡힘)"""
+    return max(1, len(text.encode("utf-8")) // 4)
+
+
+class TranslationMemory:
+    """SQLite 기반 문장 단위 번역 캐시 (스레드별 커넥션)"""
+
+    def __init__(self, db_path=TRANSLATION_DB):
+        self.db_path = db_path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        with conn:
+            yield conn
+
+    def get_many(self, texts, language):
+        """저장된 번역 {원문: 번역문}"""
+        by_hash = {_text_hash(t): t for t in texts}
+        found = {}
+        hashes = list(by_hash)
+        # SQLite 바인딩 변수 한도를 넘지 않도록 나눠서 조회
+        for i in range(0, len(hashes), 500):
+            batch = hashes[i:i + 500]
+            placeholders = ",".join("?" * len(batch))
+            with self._conn() as conn:
+                rows = conn.execute(f"""
+                    SELECT source_hash, translated FROM translations
+                    WHERE language = ? AND source_hash IN ({placeholders})
+                """, (language, *batch)).fetchall()
+            for source_hash, translated in rows:
+                found[by_hash[source_hash]] = translated
+        return found
+
+    def put_many(self, pairs, language):
+        now = time.time()
+        rows = [(language, _text_hash(src), src, dst, now) for src, dst in pairs.items()]
+        with self._conn() as conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO translations (language, source_hash, source, translated, created)
+                VALUES (?, ?, ?, ?, ?)
+            """, rows)
+
+
+@st.cache_resource
+def get_translation_memory():
+    """프로세스 전체에서 공유되는 번역 메모리"""
+    return TranslationMemory()
+
+
+def plan_chunks(texts, max_tokens=CHUNK_TOKENS):
+    """입력 순서를 유지하며 토큰 한도 내 청크로 분할 (한도를 넘는 단일 문장은 단독 청크)"""
+    chunks, current, size = [], [], 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if current and size + tokens > max_tokens:
+            chunks.append(current)
+            current, size = [], 0
+        current.append(text)
+        size += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def translate_chunk(client, chunk, language):
+    """
+    청크 1개 번역 (GPT 1회)
+
+    Raises:
+        ValueError: 응답이 잘렸거나 키가 누락된 경우
+    """
+    payload = {str(i): text for i, text in enumerate(chunk, 1)}
+    prompt = f"""Translate the values of the following JSON from English to {language}.
+
+{TRANSLATE_RULES.format(language=language)}
+
+Data:
+{json.dumps(payload, ensure_ascii=False, indent=2)}
+"""
+    response = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": "You are a professional translator. Return ONLY valid JSON."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.2,
+        max_tokens=MAX_OUTPUT_TOKENS,
+        response_format={"type": "json_object"},
+    )
+    choice = response.choices[0]
+    if getattr(choice, "finish_reason", None) == "length":
+        raise ValueError("응답이 토큰 한도에서 잘렸습니다.")
+
+    result = json.loads(choice.message.content)
+    translated = [result.get(key) for key in payload]
+    if not all(isinstance(t, str) and t.strip() for t in translated):
+        raise ValueError("번역 응답에 누락된 항목이 있습니다.")
+    return translated
+
+
+def _translate_with_split(client, chunk, language):
+    """실패한 청크는 반으로 나눠 재시도 -> {원문: 번역문}, {원문: 오류}"""
+    try:
+        return dict(zip(chunk, translate_chunk(client, chunk, language))), {}
+    except (ValueError, json.JSONDecodeError) as e:
+        if len(chunk) == 1:
+            return {}, {chunk[0]: str(e)}
+        mid = len(chunk) // 2
+        done, errors = {}, {}
+        for half in (chunk[:mid], chunk[mid:]):
+            part_done, part_errors = _translate_with_split(client, half, language)
+            done.update(part_done)
+            errors.update(part_errors)
+        return done, errors
+
+
+def translate_texts(texts, language, client=None, memory=None, max_workers=MAX_WORKERS, max_tokens=CHUNK_TOKENS):
+    """
+    문장 리스트 번역 (번역 메모리 + 분할 병렬 번역)
+
+    Returns:
+        tuple: ({원문: 번역문}, {원문: 오류 메시지})
+               실패한 문장은 결과에 없으므로 호출부에서 원문으로 대체
+    """
+    unique = list(dict.fromkeys(t for t in texts if t and t.strip()))
+    if not unique or not language:
+        return {}, {}
+
+    memory = memory or get_translation_memory()
+    translated = memory.get_many(unique, language)
+    pending = [t for t in unique if t not in translated]
+    if not pending:
+        return translated, {}
+
+    if client is None:
+        api_key = get_env("OPENAI_API_KEY")
+        if not api_key:
+            raise RuntimeError("OPENAI_API_KEY가 설정되지 않았습니다.")
+        from openai import OpenAI
+        client = OpenAI(api_key=api_key)
+
+    errors = {}
+    new = {}
+    chunks = plan_chunks(pending, max_tokens)
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as pool:
+        futures = {pool.submit(_translate_with_split, client, chunk, language): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            try:
+                done, failed = future.result()
+            except Exception as e:
+                # API 오류 등: 해당 청크 전체를 원문 유지
+                done, failed = {}, {text: str(e) for text in futures[future]}
+            new.update(done)
+            errors.update(failed)
+
+    if new:
+        memory.put_many(new, language)
+    translated.update(new)
+    return translated, errors
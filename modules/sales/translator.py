@@ -7,6 +7,8 @@ OpenAI 번역 모듈
 import os
 import sys
 import json
+import hashlib
+import threading
 import streamlit as st
 
 # 경로 설정
@@ -16,6 +18,8 @@ if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
 from config import get_env
+from modules.sales.label_catalog import get_label_catalog
+from modules.sales.translation_memory import translate_texts
 
 # 국가별 언어 정보
 COUNTRIES = {
@@ -41,108 +45,140 @@ COUNTRIES = {
 }
 
 
+# 바이어마다 달라지는 값 / 숫자 값: LLM에 보내지 않고 로컬에서 치환
+PER_BUYER_KEYS = ("buyer_company", "address_attn")
+LOCAL_KEYS = PER_BUYER_KEYS + ("offer_no", "total_amount")
+
+# 번역 대상 공통 값 (모든 바이어에게 동일)
+SHARED_VALUE_KEYS = [
+    "messrs", "date", "origin", "shipment", "loading_port", "destination", "payment",
+    "packing", "insurance", "inspection", "validity", "dispute_resolution",
+    "claim", "force_majeure", "arbitration", "governing_law",
+]
+
+
+@st.cache_resource
+def get_translation_cache():
+    """공통 번역 결과 캐시 (콘텐츠 해시 -> 번역 결과, 세션/클릭 간 공유)"""
+    return {"lock": threading.Lock(), "data": {}}
+
+
+def _content_hash(payload: dict, target_language: str) -> str:
+    raw = json.dumps([target_language, payload], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
 def translate_offer_data(form_data: dict, items: list, target_language: str):
-    """OpenAI API를 사용하여 Offer Sheet 번역"""
-    api_key = get_env("OPENAI_API_KEY")
-    if not api_key:
-        st.error("⚠️ OPENAI_API_KEY가 설정되지 않았습니다.")
+    """
+    OpenAI API를 사용하여 Offer Sheet 번역 (기존 호출부 호환용)
+    - 공통 부분은 translate_offer_shared로 1회 번역 (캐시)
+    - 바이어별 값(buyer_company, address_attn)과 숫자 값은 원문 그대로 덮어씀
+    """
+    translated = translate_offer_shared(form_data, items, target_language)
+    if not translated:
         return None
 
+    values = dict(translated.get("values", {}))
+    values.update({k: form_data.get(k, "") for k in LOCAL_KEYS})
+    return {**translated, "values": values}
+
+
+def _shared_payload(form_data: dict, items: list):
+    """언어 공통 번역 대상 (공통 값, 유효 품목, 캐시 키용 payload)"""
+    values = {k: form_data[k] for k in SHARED_VALUE_KEYS if form_data.get(k)}
+    valid_items = [it for it in items if it["description"].strip()]
+    translate_payload = {
+        "values": values,
+        "items": [it["description"] for it in valid_items],
+    }
+    return values, valid_items, translate_payload
+
+
+def cached_offer_translation(form_data: dict, items: list, target_language: str):
+    """
+    이미 번역된 적이 있는 경우에만 공통 번역 결과 반환 (API 호출 없음, 없으면 None)
+    - 실시간 미리보기용
+    """
+    _, _, translate_payload = _shared_payload(form_data, items)
+    cache = get_translation_cache()
+    with cache["lock"]:
+        cached = cache["data"].get(_content_hash(translate_payload, target_language))
+    if not cached:
+        return None
+    return {**cached, "labels": get_label_catalog().get(target_language, translate_missing=False)}
+
+
+def translate_offer_shared(form_data: dict, items: list, target_language: str):
+    """
+    언어별 공통 번역 (공통 값 + 품목 설명, 라벨은 카탈로그에서)
+    - 바이어별 값은 payload에서 제외하므로 바이어 수와 관계없이 언어당 1회만 호출
+    - 고정 라벨은 label_catalog에 저장된 번역본을 사용 (LLM에 보내지 않음)
+    - 문장 단위로 translation_memory에 영구 캐시, 미번역 문장만 청크 분할 병렬 번역
+    - 수량/단가/금액은 원문 그대로 사용
+    """
+    values, valid_items, translate_payload = _shared_payload(form_data, items)
+
+    cache = get_translation_cache()
+    cache_key = _content_hash(translate_payload, target_language)
+    with cache["lock"]:
+        cached = cache["data"].get(cache_key)
+    if cached:
+        return {**cached, "labels": get_label_catalog().get(target_language)}
+
+    texts = list(values.values()) + translate_payload["items"]
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
+        with st.spinner(f"🌐 {target_language} 번역 중..."):
+            mapping, errors = translate_texts(texts, target_language)
+    except RuntimeError as e:
+        st.error(f"⚠️ {e}")
+        return None
     except ImportError:
         st.error("⚠️ openai 패키지 설치 필요: `pip install openai`")
         return None
 
-    translate_payload = {
-        "company_name": "NexTrade",
-        "company_address": "GangNam-Gu 9 Gil Coex 4th floor",
-        "seller_company": "JIMDAK CORP.",
-        "intro_text": "We are pleased to offer you the following goods on the terms and conditions set forth below.",
-        "labels": {
-            "offer_sheet": "OFFER SHEET",
-            "messrs": "Messrs",
-            "offer_no": "Offer No.",
-            "date": "Date",
-            "origin": "Origin",
-            "shipment": "Shipment",
-            "loading_port": "Loading Port",
-            "destination": "Destination",
-            "payment": "Payment",
-            "packing": "Packing",
-            "insurance": "Insurance",
-            "inspection": "Inspection",
-            "validity": "Validity",
-            "no": "No.",
-            "description_of_goods": "Description of Goods",
-            "quantity": "Quantity",
-            "unit_price": "Unit Price",
-            "amount": "Amount",
-            "total_amount": "TOTAL AMOUNT (FOB/CIF/CFR)",
-            "claim": "Claim",
-            "force_majeure": "Force Majeure",
-            "arbitration": "Arbitration",
-            "governing_law": "Governing Law",
-            "accepted_by_buyer": "ACCEPTED BY (Buyer)",
-            "yours_faithfully": "Yours Faithfully",
-            "authorized_signature": "Authorized Signature",
-        },
-        "values": {k: form_data.get(k, "") for k in [
-            "messrs", "buyer_company", "address_attn", "offer_no", "date",
-            "origin", "shipment", "loading_port", "destination", "payment",
-            "packing", "insurance", "inspection", "validity",
-            "claim", "force_majeure", "arbitration", "governing_law", "total_amount"
-        ]},
+    if errors:
+        st.warning(f"⚠️ {target_language}: {len(errors)}개 문장 번역 실패 (원문 유지) - {next(iter(errors.values()))}")
+
+    translated = {
+        "values": {k: mapping.get(v, v) for k, v in values.items()},
         "items": [
-            {"no": it["no"], "description": it["description"],
+            {"no": it["no"], "description": mapping.get(it["description"], it["description"]),
              "quantity": it["quantity"], "unit_price": it["unit_price"], "amount": it["amount"]}
-            for it in items if it["description"].strip()
+            for it in valid_items
         ],
     }
-
-    prompt = f"""Translate ALL text content in the following Offer Sheet data from English to {target_language}.
-
-CRITICAL RULES:
-1. Translate ALL labels, values, and text content completely to {target_language}
-2. EXCEPTION: Keep the following in English:
-   - Company names: NexTrade, JIMDAK CORP.
-   - Currency: USD
-   - Trade terms: FOB, CIF, CFR, L/C
-   - Numbers and dates
-3. Everything else must be translated to {target_language}
-4. Return ONLY valid JSON with exact same structure
-5. No extra text, no markdown, just pure JSON
-
-Data:
-{json.dumps(translate_payload, ensure_ascii=False, indent=2)}
-"""
-
-    try:
-        with st.spinner(f"🌐 {target_language} 번역 중..."):
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a professional translator. Return ONLY valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.2,
-                max_tokens=4000,
-            )
-
-            result_text = response.choices[0].message.content.strip()
-
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in result_text:
-                result_text = result_text.split("```")[1].split("```")[0].strip()
-
-            translated = json.loads(result_text)
-            return translated
-
-    except json.JSONDecodeError as e:
-        st.error(f"⚠️ JSON 파싱 오류: {e}")
-        return None
-    except Exception as e:
-        st.error(f"⚠️ OpenAI API 오류: {e}")
-        return None
+    # 일부 실패한 결과는 다음 호출에서 재시도하도록 캐시하지 않음
+    if not errors:
+        with cache["lock"]:
+            cache["data"][cache_key] = translated
+    return {**translated, "labels": get_label_catalog().get(target_language)}
+
+
+def localize_form_data(form_data: dict, translated: dict) -> dict:
+    """
+    번역 결과를 바이어별 form_data에 적용
+    - 공통 값은 번역본 (없으면 원문), 판매자/바이어/숫자 값은 원문 유지
+    """
+    values = translated.get("values", {}) if translated else {}
+    localized = dict(form_data)
+    for key in SHARED_VALUE_KEYS:
+        if values.get(key):
+            localized[key] = values[key]
+    return localized
+
+
+def localize_items(items: list, translated: dict) -> list:
+    """번역된 품목 리스트 (번역 결과가 없으면 원본 유효 품목)"""
+    if not translated or not translated.get("items"):
+        return [it for it in items if it.get("description", "").strip()]
+
+    return [
+        {
+            "no": it.get("no", ""),
+            "description": it.get("description", ""),
+            "quantity": it.get("quantity", ""),
+            "unit_price": it.get("unit_price", ""),
+            "amount": it.get("amount", ""),
+        }
+        for it in translated["items"]
+    ]
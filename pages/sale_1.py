@@ -102,7 +102,7 @@ def initialize_session_state():
         'target_product': '',
         'target_country': '',
         'buyer_list': [],
-        'selected_buyer_ids': [],
+        'selected_buyer_ids': set(),
         'selected_buyers_full': [],
 
         # Tab 2: 오퍼시트
@@ -155,7 +155,7 @@ def main():
             st.session_state.target_product = ''
             st.session_state.target_country = ''
             st.session_state.buyer_list = []
-            st.session_state.selected_buyer_ids = []
+            st.session_state.selected_buyer_ids = set()
             st.rerun()
 
         if not st.session_state.is_logged_in:
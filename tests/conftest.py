@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 경로 설정 (프로젝트 루트를 import 경로에 추가)
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
@@ -0,0 +1,30 @@
+"""조달청 납품 단가 인덱스"""
+
+from modules.purchasing.b2g_analytics import ProcurementPriceIndex
+
+CSV = """업체명,제품명,규격,납품수량,납품단가,납품금액,납품요구결재일자
+A음료,포카리스웨트,500ml,100,1000,100000,20260105
+B음료,포카리스웨트,500ml,300,1200,360000,20260210
+C음료,비타파워,100ml,50,900,45000,20260301
+"""
+
+
+def _index(tmp_path):
+    path = tmp_path / "procurement_price.csv"
+    path.write_text(CSV, encoding="utf-8-sig")
+    return ProcurementPriceIndex(str(path))
+
+
+def test_analyze_uses_matched_products_only(tmp_path):
+    result = _index(tmp_path).analyze(["포카리 스웨트"])
+    assert result["matched"] == ["포카리스웨트"]
+    assert result["stats"]["contracts"] == 2
+    assert result["stats"]["weighted_avg"] == 1150.0
+
+
+def test_analyze_without_match_returns_no_stats(tmp_path):
+    result = _index(tmp_path).analyze(["laptop computer"])
+    assert result["matched"] == []
+    assert result["available"] is True
+    assert result["stats"] is None
+    assert result["trend"].empty and result["breakdown"].empty
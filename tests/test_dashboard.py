@@ -0,0 +1,49 @@
+"""대시보드 공유 캐시 재시도"""
+
+import time
+
+from modules.sales.dashboard import DashboardFeed
+
+
+def _wait_refresh(feed):
+    feed.get(max_wait=0)
+    feed._refresh_thread.join(5)
+
+
+def test_failed_refresh_retries_after_short_interval():
+    state = {"fail": True}
+
+    def source(timeout):
+        if state["fail"]:
+            raise RuntimeError("upstream down")
+        return {"rate": 1400.0}
+
+    feed = DashboardFeed(sources={"exchange_rate": source}, ttl=600, retry=0.2)
+    _wait_refresh(feed)
+    assert feed.refreshed_at is None
+    assert feed.next_refresh_at - time.time() < 1
+
+    state["fail"] = False
+    time.sleep(0.25)
+    _wait_refresh(feed)
+    assert feed.refreshed_at is not None
+    assert feed.results == {"exchange_rate": {"rate": 1400.0}}
+    assert feed.next_refresh_at - time.time() > 500
+
+
+def test_cached_candlestick_returns_independent_copies():
+    import numpy as np
+    import pandas as pd
+
+    from modules.sales.dashboard import candlestick_chart
+
+    close = np.linspace(1300, 1400, 40)
+    df = pd.DataFrame({"Open": close, "High": close + 5, "Low": close - 5, "Close": close + 1, "Volume": 0},
+                      index=pd.date_range("2026-01-01", periods=40))
+    df.attrs.update(symbol="KRW=X", version=1)
+
+    first = candlestick_chart(df)
+    first.update_layout(title_text="mutated")
+    second = candlestick_chart(df)
+    assert second is not first
+    assert second.layout.title.text != "mutated"
@@ -0,0 +1,83 @@
+"""컴파일된 오퍼시트 템플릿과 python-docx 직접 생성 결과 비교"""
+
+import io
+import zipfile
+
+import pytest
+
+from modules.sales.doc_maker import (
+    DEFAULT_LABELS, DOCUMENT_PART, _build_document, _prepare_values, create_offer_sheet,
+)
+
+FULL_FORM = {
+    "seller_name": "Next Trade <Co> & Sons",
+    "seller_addr": "  Seoul, Korea  ",
+    "seller_email": "sales@nexttrade.kr",
+    "buyer_company": "Ulaanbaatar Foods",
+    "address_attn": "Line 1\nLine 2\r\nLine 3",
+    "offer_no": "NT-20261019-01",
+    "date": "October 19, 2026",
+    "origin": "Republic of Korea",
+    "shipment": "Within 30 days\tafter L/C",
+    "loading_port": "Busan",
+    "destination": "{{seller_name#0}}",
+    "payment": "T/T 30% in advance",
+    "packing": "Export standard",
+    "insurance": "",
+    "validity": "30 days",
+    "dispute_resolution": "Arbitration",
+    "governing_law": "Korean law",
+    "total_amount": "12,800.00",
+}
+ITEMS = [
+    {"no": "1", "description": "Pocari Sweat 500ml", "quantity": "1,000 PCS", "unit_price": "0.64", "amount": "640.00"},
+    {"description": "Bacchus-D", "quantity": "12,000 PCS", "unit_price": "1.01", "amount": "12,160.00"},
+    {"description": "", "quantity": "", "unit_price": "", "amount": ""},
+]
+CYRILLIC_LABELS = {**DEFAULT_LABELS, "offer_sheet": "КОММЕРЧЕСКОЕ ПРЕДЛОЖЕНИЕ", "messrs": "Кому:"}
+
+
+def _document_xml(buffer):
+    with zipfile.ZipFile(buffer) as zf:
+        return zf.read(DOCUMENT_PART)
+
+
+def _reference_xml(form_data, items, labels):
+    form_data, items = _prepare_values(form_data, items)
+    buffer = io.BytesIO()
+    _build_document(form_data, items, None, labels).save(buffer)
+    return _document_xml(buffer)
+
+
+@pytest.mark.parametrize("labels", [DEFAULT_LABELS, CYRILLIC_LABELS])
+@pytest.mark.parametrize("form_data, items", [
+    pytest.param(FULL_FORM, ITEMS, id="full"),
+    pytest.param({k: v for k, v in FULL_FORM.items() if k not in ("seller_name", "offer_no", "date")},
+                 [{"description": "Only description"}], id="missing-keys"),
+    pytest.param({**FULL_FORM, "seller_name": None, "buyer_company": None, "total_amount": None},
+                 [{"description": "Item", "quantity": None, "unit_price": 1.5, "amount": None}], id="none-values"),
+])
+def test_template_matches_python_docx(form_data, items, labels):
+    rendered = _document_xml(create_offer_sheet(form_data, items, labels=labels))
+    assert rendered == _reference_xml(form_data, items, labels)
+
+
+def test_missing_seller_name_uses_default():
+    form_data = {k: v for k, v in FULL_FORM.items() if k != "seller_name"}
+    rendered = _document_xml(create_offer_sheet(form_data, ITEMS)).decode("utf-8")
+    assert "[Company Name]" in rendered
+    assert "None" not in _document_xml(create_offer_sheet({**FULL_FORM, "seller_name": None}, ITEMS)).decode("utf-8")
+
+
+def test_output_is_deterministic():
+    assert create_offer_sheet(FULL_FORM, ITEMS).getvalue() == create_offer_sheet(FULL_FORM, ITEMS).getvalue()
+
+
+@pytest.mark.parametrize("bad", ["\x00", "Bell\x07", "\x0b", "￾"])
+def test_control_characters_rejected_like_python_docx(bad):
+    with pytest.raises(ValueError):
+        _build_document({**FULL_FORM, "buyer_company": bad}, ITEMS, None, DEFAULT_LABELS)
+    with pytest.raises(ValueError):
+        create_offer_sheet({**FULL_FORM, "buyer_company": bad}, ITEMS)
+    with pytest.raises(ValueError):
+        create_offer_sheet(FULL_FORM, [{"description": bad}])
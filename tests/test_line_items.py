@@ -0,0 +1,22 @@
+"""오퍼 품목 계산 엔진"""
+
+from decimal import Decimal
+
+from modules.sales.line_items import MAX_LINE_ITEMS, price_line_items
+
+
+def test_totals_are_exact_cents():
+    result = price_line_items(["A", "B"], ["3", "1,000 PCS"], ["0.1", "USD 1.005"], 0.28, ["", "1.3333"])
+    # A: 0.128 x 3 = 0.384 -> 0.38 / B: 1.3333 x 1000 = 1,333.30
+    assert result["amount_cents"].tolist() == [38, 133330]
+    assert result["total_revenue"] == 133368
+    assert Decimal(result["total_cost"]) / 100 == Decimal("1005.30")
+    assert result["errors"] == []
+
+
+def test_rows_over_cap_are_reported_not_dropped():
+    n = MAX_LINE_ITEMS + 2
+    result = price_line_items(["Item"] * n, ["1"] * n, ["1.00"] * n, 0.0)
+    assert int(result["valid"].sum()) == MAX_LINE_ITEMS
+    assert [row for row, _ in result["errors"]] == [MAX_LINE_ITEMS + 1, MAX_LINE_ITEMS + 2]
+    assert result["total_revenue"] == MAX_LINE_ITEMS * 100
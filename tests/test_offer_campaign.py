@@ -0,0 +1,77 @@
+"""오퍼 일괄 발송: SMTP 오류 분류 / 재시도 / 연결 정리"""
+
+import smtplib
+import threading
+import time
+
+import pytest
+
+from modules.sales.offer_campaign import DomainThrottle, OfferCampaign, PermanentSendError, SMTPTransport
+
+
+class _FailingClient:
+    def __init__(self, error):
+        self.error = error
+
+    def send_message(self, message):
+        raise self.error
+
+    def quit(self):
+        pass
+
+
+def _transport(error):
+    transport = SMTPTransport("smtp.invalid")
+    transport._local.client = _FailingClient(error)
+    return transport
+
+
+def test_greylisting_is_transient():
+    refused = smtplib.SMTPRecipientsRefused({"a@b.com": (451, b"greylisted")})
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        _transport(refused).send(None)
+
+
+def test_mailbox_rejection_is_permanent():
+    refused = smtplib.SMTPRecipientsRefused({"a@b.com": (550, b"no such user")})
+    with pytest.raises(PermanentSendError):
+        _transport(refused).send(None)
+
+
+class _RecordingTransport:
+    """처음 1회는 4xx로 거부한 뒤 성공, 스레드별 close 호출 기록"""
+
+    def __init__(self):
+        self.sent = []
+        self.closed = set()
+        self._failed = False
+        self._lock = threading.Lock()
+
+    def send(self, message):
+        with self._lock:
+            if not self._failed:
+                self._failed = True
+                raise smtplib.SMTPRecipientsRefused({message["To"]: (450, b"try later")})
+            self.sent.append(message["To"])
+
+    def close(self):
+        with self._lock:
+            self.closed.add(threading.get_ident())
+
+
+def test_campaign_retries_transient_refusal_and_closes_connections():
+    variants = [("EN", {"seller_name": "Seller", "seller_addr": "Seoul", "offer_no": "NXT-1"},
+                 [{"description": "Item", "quantity": "1", "unit_price": "1.00", "amount": "1.00"}], None)]
+    targets = [{"Name": f"Buyer{i}", "Email": f"b{i}@example{i}.com"} for i in range(3)]
+    transport = _RecordingTransport()
+    campaign = OfferCampaign(variants, targets, transport, "sales@seller.com", "Offer", "Body",
+                             throttle=DomainThrottle(0), sender_threads=2, backoff_base=0.01).start()
+
+    deadline = time.time() + 60
+    while campaign.running and time.time() < deadline:
+        time.sleep(0.05)
+
+    assert not campaign.running
+    assert campaign.sent == 3 and campaign.failed == 0
+    assert campaign.retries == 1
+    assert len(transport.closed) == 2
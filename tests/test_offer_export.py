@@ -0,0 +1,29 @@
+"""오퍼시트 ZIP 내보내기: 항목명 중복 / 다운로드 핸들"""
+
+import time
+import zipfile
+
+from modules.sales.offer_export import ExportJob, build_offer_zip
+
+VARIANTS = [("EN", {"seller_name": "Seller", "seller_addr": "Seoul", "offer_no": "NXT-1"},
+             [{"description": "Item", "quantity": "1", "unit_price": "1.00", "amount": "1.00"}], None)]
+
+
+def test_duplicate_buyer_names_get_unique_entries():
+    targets = [{"Name": "Acme"}, {"Name": "Acme"}, {"Name": "Beta"}]
+    with zipfile.ZipFile(build_offer_zip(VARIANTS, targets)) as zf:
+        assert zf.namelist() == ["OfferSheet_Acme_EN.docx", "OfferSheet_Acme_EN_2.docx", "OfferSheet_Beta_EN.docx"]
+
+
+def test_export_job_hands_out_file_handle():
+    job = ExportJob(VARIANTS, [{"Name": f"Buyer{i}"} for i in range(3)]).start()
+    deadline = time.time() + 60
+    while job.running and time.time() < deadline:
+        time.sleep(0.05)
+
+    assert job.error is None and job.done == 3
+    with job.open() as handle, zipfile.ZipFile(handle) as zf:
+        assert len(zf.namelist()) == 3
+    # 핸들을 닫아도 원본 임시 파일은 유지 (다시 다운로드 가능)
+    with job.open() as handle:
+        assert zipfile.is_zipfile(handle)
@@ -0,0 +1,31 @@
+"""오퍼 원장 검색/집계"""
+
+import datetime
+
+from modules.sales.offer_ledger import OfferLedger
+
+
+def _offer(buyer, offer_no, **extra):
+    record = {"offer_no": offer_no, "buyer": buyer, "email": "", "country": "KR", "amount": 100,
+              "status": "Sent", "date": datetime.date(2026, 10, 1), "memo": ""}
+    return {**record, **extra}
+
+
+def test_search_treats_like_wildcards_literally(tmp_path):
+    ledger = OfferLedger(str(tmp_path / "ledger.db"))
+    ledger.add_many("T", [_offer("100% Foods", "A_1"), _offer("1000 Foods", "AB1")])
+    assert ledger.page("T", search="100%")["buyer"].tolist() == ["100% Foods"]
+    assert ledger.page("T", search="A_1")["buyer"].tolist() == ["100% Foods"]
+    assert ledger.count("T", search="_") == 1
+
+
+def test_future_dated_open_offer_counts_in_first_ageing_bucket(tmp_path):
+    ledger = OfferLedger(str(tmp_path / "ledger.db"))
+    today = datetime.date(2026, 10, 19)
+    ledger.add_many("T", [
+        _offer("Past", "P1", date=datetime.date(2026, 10, 1), amount=50),
+        _offer("Future", "F1", date=datetime.date(2026, 11, 30), amount=70),
+    ])
+    ageing = ledger.metrics("T", today=today)["ageing"]
+    assert ageing["0-7일"] == {"n": 1, "amount": 70.0}
+    assert sum(bucket["amount"] for bucket in ageing.values()) == 120.0
@@ -0,0 +1,117 @@
+"""상주 오피스 변환 워커: 인스턴스 재사용 / 재기동 조건 / 포기한 요청 건너뛰기"""
+
+import threading
+
+import pytest
+
+import modules.sales.pdf_converter as pdf_converter
+from modules.sales.pdf_converter import OfficeWorker
+
+
+class _Process:
+    def __init__(self, returncode=None):
+        self.returncode = returncode
+
+    def poll(self):
+        return self.returncode
+
+    def terminate(self):
+        self.returncode = -15
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+
+def _uno_worker(monkeypatch, process, error):
+    # uno 미설치 환경에서도 UNO 경로만 흉내 냄
+    monkeypatch.setattr(pdf_converter, "HAS_UNO", True)
+    monkeypatch.setattr(pdf_converter, "DisposedException", type("DisposedException", (Exception,), {}), raising=False)
+    monkeypatch.setattr(pdf_converter, "NoConnectException", type("NoConnectException", (Exception,), {}), raising=False)
+    worker = OfficeWorker(office_path="soffice")
+    worker.process = process
+    calls = []
+
+    def convert_uno(docx_paths, output_dir):
+        calls.append(docx_paths)
+        if len(calls) == 1:
+            raise error
+        return ["out.pdf"]
+
+    worker._convert_uno = convert_uno
+    return worker, calls
+
+
+class _Document:
+    def __init__(self, loaded):
+        self.loaded = loaded
+
+    def storeToURL(self, url, props):
+        with open(url.replace("file://", ""), "wb") as f:
+            f.write(b"%PDF")
+
+    def close(self, deliver):
+        pass
+
+
+class _Desktop:
+    def __init__(self):
+        self.loaded = []
+
+    def loadComponentFromURL(self, url, frame, flags, props):
+        self.loaded.append(url)
+        return _Document(url)
+
+
+def test_uno_requests_reuse_running_office(monkeypatch, tmp_path):
+    monkeypatch.setattr(pdf_converter, "HAS_UNO", True)
+    monkeypatch.setattr(pdf_converter, "uno", type("uno", (), {"systemPathToFileUrl": staticmethod(lambda p: f"file://{p}")}),
+                        raising=False)
+    monkeypatch.setattr(pdf_converter, "PropertyValue", type("PropertyValue", (), {}), raising=False)
+
+    def popen(*args, **kwargs):
+        raise AssertionError("오피스를 다시 기동함")
+
+    monkeypatch.setattr(pdf_converter.subprocess, "Popen", popen)
+    worker = OfficeWorker(office_path="soffice")
+    worker.process, worker.desktop = _Process(), _Desktop()
+
+    for name in ("a", "b"):
+        assert worker._convert([str(tmp_path / f"{name}.docx")], str(tmp_path)) == [str(tmp_path / f"{name}.pdf")]
+    assert len(worker.desktop.loaded) == 2
+
+
+def test_document_error_does_not_restart_office(monkeypatch):
+    process = _Process()
+    worker, calls = _uno_worker(monkeypatch, process, ValueError("bad document"))
+    with pytest.raises(ValueError):
+        worker._convert(["a.docx"], "out")
+    assert worker.process is process and process.poll() is None
+    assert len(calls) == 1
+
+
+def test_dead_office_is_restarted_once(monkeypatch):
+    worker, calls = _uno_worker(monkeypatch, _Process(returncode=1), RuntimeError("connection lost"))
+    assert worker._convert(["a.docx"], "out") == ["out.pdf"]
+    assert len(calls) == 2
+
+
+def test_abandoned_request_is_skipped(monkeypatch, tmp_path):
+    monkeypatch.setattr(pdf_converter, "STARTUP_TIMEOUT", 0)
+    worker = OfficeWorker(office_path="soffice")
+    gate = threading.Event()
+    converted = []
+
+    def convert(docx_paths, output_dir):
+        converted.append(docx_paths)
+        gate.wait(5)
+        return [None] * len(docx_paths)
+
+    worker._convert = convert
+    first = threading.Thread(target=worker.convert, args=(["first.docx"], str(tmp_path), 5))
+    first.start()
+    with pytest.raises(TimeoutError):
+        worker.convert(["abandoned.docx"], str(tmp_path), timeout=0.2)
+    gate.set()
+    first.join()
+    worker.convert(["last.docx"], str(tmp_path), timeout=5)
+    assert converted == [["first.docx"], ["last.docx"]]
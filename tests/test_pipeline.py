@@ -0,0 +1,70 @@
+"""헤드리스 소싱 파이프라인 입력 CSV 파싱 / 단계 실행"""
+
+import json
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from modules.purchasing import pipeline
+from modules.purchasing.pipeline import load_jobs
+
+
+def _write(tmp_path, text):
+    path = tmp_path / "products.csv"
+    path.write_text(text, encoding="utf-8-sig")
+    return str(path)
+
+
+def test_load_jobs_skips_blank_product_and_country(tmp_path):
+    csv_path = _write(tmp_path, "product,country\n포카리스웨트,몽골\n,몽골\n  ,몽골\n박카스,\n박카스,베트남\n")
+    assert load_jobs(csv_path) == [("포카리스웨트", "몽골"), ("박카스", "베트남")]
+
+
+def test_load_jobs_default_country_and_dedup(tmp_path):
+    csv_path = _write(tmp_path, "품목\n포카리스웨트\n\n포카리스웨트\n")
+    assert load_jobs(csv_path, default_country="몽골") == [("포카리스웨트", "몽골")]
+
+
+def _pipeline(tmp_path, monkeypatch, drafts):
+    calls = {"collect": 0}
+
+    def fake_collect(store, tavily_client, client, product_name, target_count=30):
+        calls["collect"] += 1
+        assert store == "store"
+        return pd.DataFrame([{"회사명": "A사"}, {"회사명": "B사"}]), None
+
+    monkeypatch.setattr(pipeline, "collect_suppliers", fake_collect)
+    monkeypatch.setattr(pipeline, "screen_suppliers", lambda companies, product, **kw: {
+        "results": [{"기업명": c, "점수": 80} for c in companies], "errors": []})
+    monkeypatch.setattr(pipeline, "generate_drafts_bulk", lambda names, my_info, item: drafts(names))
+
+    runner = pipeline.SourcingPipeline.__new__(pipeline.SourcingPipeline)
+    runner.out_dir, runner.my_info, runner.top_n = str(tmp_path), {}, 5
+    runner.tavily_client = runner.client = runner.scorer = None
+    runner.screening_workers = 1
+    runner.store = "store"
+    runner.log, runner._log_lock = (lambda msg: None), threading.Lock()
+
+    # 시장 분석 단계는 체크포인트로 대체
+    job_dir = runner._job_dir("포카리스웨트", "몽골")
+    with open(f"{job_dir}/market.json", "w", encoding="utf-8") as f:
+        json.dump({}, f)
+    return runner, job_dir, calls
+
+
+def test_run_product_uses_supplier_store(tmp_path, monkeypatch):
+    runner, job_dir, calls = _pipeline(tmp_path, monkeypatch, lambda names: [(n, f"Dear {n}") for n in names])
+    result = runner.run_product("포카리스웨트", "몽골")
+    assert calls["collect"] == 1
+    assert result["inquiries"] == 2
+
+
+def test_failed_draft_is_not_checkpointed(tmp_path, monkeypatch):
+    runner, job_dir, _ = _pipeline(
+        tmp_path, monkeypatch,
+        lambda names: [("A사", "Dear A사"), ("B사", "작성 중 오류 발생: timeout")])
+    with pytest.raises(RuntimeError, match="B사"):
+        runner.run_product("포카리스웨트", "몽골")
+    assert not os.path.exists(os.path.join(job_dir, "inquiry.json"))
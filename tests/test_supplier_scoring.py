@@ -0,0 +1,38 @@
+"""공급사 평가: 스코어 캐시 만료 / 점수 파싱"""
+
+import pytest
+
+import modules.purchasing.supplier_scoring as supplier_scoring
+from modules.purchasing.supplier_scoring import ScoreCache, parse_score
+from modules.purchasing.supplier_store import SupplierStore
+
+RESULT = {"기업명": "(주)동아오츠카", "점수": 85, "등급": "A", "이유": "", "전화번호": "", "이메일": ""}
+
+
+@pytest.mark.parametrize("value, expected", [(85, 85), ("85점", 85), ("85/100", 85), (None, 0), ("N/A", 0), (120, 100)])
+def test_parse_score(value, expected):
+    assert parse_score(value) == expected
+
+
+def test_memory_entry_expires_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(supplier_scoring.time, "time", lambda: now[0])
+    cache = ScoreCache(ttl=60)
+    cache.put("동아오츠카", "포카리", RESULT)
+    assert cache.get("(주)동아오츠카", "포카리") == RESULT
+
+    now[0] += 61
+    assert cache.get("동아오츠카", "포카리") is None
+
+
+def test_store_hit_expires_from_verified_time(tmp_path):
+    store = SupplierStore(str(tmp_path / "suppliers.db"))
+    store.put_score("동아오츠카", "포카리", RESULT)
+    with store._conn() as conn:
+        conn.execute("UPDATE suppliers SET score_verified = score_verified - 50")
+
+    cache = ScoreCache(store=store, ttl=60)
+    hit = cache.get("동아오츠카", "포카리")
+    assert hit["점수"] == 85 and "score_verified" not in hit
+    verified, _ = next(iter(cache._data.values()))
+    assert verified < supplier_scoring.time.time() - 49
@@ -0,0 +1,35 @@
+"""공급사 저장소 재검색 계획"""
+
+import pandas as pd
+
+from modules.purchasing.supplier_store import SupplierStore
+
+
+def _candidates(n):
+    return pd.DataFrame([{"회사명": f"(주)회사{i}", "주력제품": "음료", "특이사항": ""} for i in range(n)])
+
+
+def test_recent_search_reuses_fresh_rows_below_target(tmp_path):
+    store = SupplierStore(str(tmp_path / "suppliers.db"))
+    assert store.refresh_plan("포카리", 30)["needs_fetch"] is True
+
+    store.upsert_profiles(_candidates(12), "포카리")
+    store.mark_searched("포카리", 12)
+    plan = store.refresh_plan(" 포카리 ", 30)
+    assert len(plan["fresh"]) == 12
+    assert plan["shortfall"] == 18
+    assert plan["needs_fetch"] is False
+
+
+def test_stale_rows_are_rechecked_after_interval(tmp_path):
+    store = SupplierStore(str(tmp_path / "suppliers.db"))
+    store.upsert_profiles(_candidates(30), "포카리")
+    store.mark_searched("포카리", 30)
+    with store._conn() as conn:
+        conn.execute("UPDATE suppliers SET profile_verified = 0 WHERE name = '(주)회사3'")
+        conn.execute("UPDATE search_log SET searched_at = 0")
+
+    plan = store.refresh_plan("포카리", 30)
+    assert plan["stale"] == ["(주)회사3"]
+    assert plan["shortfall"] == 1
+    assert plan["needs_fetch"] is True